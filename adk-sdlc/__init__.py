@@ -1,3 +1,7 @@
+# Load .env once, before any agent module reads its configuration
+from .settings import get_settings
+get_settings()
+
 # Export the orchestrator agent as the main agent
 from .agent import orchestrator_agent
 
@@ -0,0 +1,166 @@
+import contextvars
+import threading
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional
+from google.adk.models import BaseLlm, LLMRegistry, LlmRequest, LlmResponse
+from pydantic import PrivateAttr
+from .settings import get_settings
+from .sub_agents.tools.deadline import next_before_deadline
+from .sub_agents.tools.latency import LatencyHistory
+from .sub_agents.tools.rate_limiter import observe, throttle_async
+from .sub_agents.tools.recorder import record_model_response, record_session_input, replay_model_response
+
+# Latency history of every model; created on first use with the ROUTER_HISTORY_* settings
+_latency_history = None
+_latency_history_lock = threading.Lock()
+
+def get_latency_history() -> LatencyHistory:
+    """Returns the process-wide latency history of the routed models."""
+    global _latency_history
+    with _latency_history_lock:
+        if _latency_history is None:
+            settings = get_settings()
+            _latency_history = LatencyHistory(
+                settings.router_history_window, settings.router_history_max_age, settings.router_min_samples
+            )
+        return _latency_history
+
+# Model the router chose for the current agent turn; the tool calls of that turn inherit it
+_current_model: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("routed_model", default=None)
+
+def cache_model(tier: str = "large") -> str:
+    """
+    Returns the model a tool's cached result depends on.
+
+    Inside an agent turn this is the model the router chose for it, which may be a fallback
+    tier; outside one (direct calls, benchmarks) it is the preferred model of the given tier.
+    """
+    return _current_model.get() or get_settings().tier_model(tier)
+
+class RoutedLlm(BaseLlm):
+    """
+    Model that picks one of several candidate models per call.
+
+    Candidates are ordered from most to least capable. A call goes to the first candidate
+    whose measured p95 latency is within the SLO; if every candidate breaches it, the one
+    with the lowest p95 is used. While a fallback is active, every ROUTER_PROBE_EVERY-th call
+    still goes to the preferred model so the route recovers once it is fast again.
+    """
+    candidates: List[str]
+    slo_seconds: float
+    agent_name: str = ""
+
+    _calls: int = PrivateAttr(default=0)
+    _routes: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def capabilities(self) -> Any:
+        return LLMRegistry.new_llm(self.candidates[0]).capabilities
+
+    def choose(self) -> str:
+        """Returns the candidate the next call should go to."""
+        probe_every = get_settings().router_probe_every
+        with self._lock:
+            self._calls += 1
+            probe = probe_every > 0 and self._calls % probe_every == 0
+        if probe or len(self.candidates) == 1:
+            return self.candidates[0]
+        history = get_latency_history()
+        for model in self.candidates:
+            if history.p95(model) <= self.slo_seconds:
+                return model
+        return min(self.candidates, key=history.p95)
+
+    def route_stats(self) -> Dict[str, Any]:
+        """Returns how often each candidate was chosen, with the current p95 per candidate."""
+        with self._lock:
+            routes = dict(self._routes)
+        history = get_latency_history()
+        return {
+            "agent": self.agent_name,
+            "slo_seconds": self.slo_seconds,
+            "routes": routes,
+            "p95_seconds": {model: round(history.p95(model), 3) for model in self.candidates}
+        }
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        model = self.choose()
+        with self._lock:
+            self._routes[model] = self._routes.get(model, 0) + 1
+        llm_request.model = model
+        # Not reset: the tool calls this response asks for run after it, in the same context
+        _current_model.set(model)
+        # A fresh client per call, like ADK does for model names, since calls run on different event loops
+        llm = LLMRegistry.new_llm(model)
+        # Queue for the model's shared quota before the call, so waiting does not count as model latency
+        await throttle_async(f"model:{model}")
+        responses = llm.generate_content_async(llm_request, stream=stream)
+        started = time.perf_counter()
+        failed = False
+        try:
+            # Every response has to arrive before the deadline of the run
+            while True:
+                try:
+                    response = await next_before_deadline(responses, f"model {model}")
+                except StopAsyncIteration:
+                    break
+                failed = failed or bool(response.error_code)
+                yield response
+        except Exception as e:
+            # Quota errors (RESOURCE_EXHAUSTED) slow down every caller of this model
+            if getattr(e, "code", None) == 429:
+                observe(f"model:{model}", 429)
+            raise
+        # Only completed calls count: fast failures (errors, 429s, deadline aborts) would pull the p95 down
+        if not failed:
+            get_latency_history().record(model, time.perf_counter() - started)
+
+# Routed model of every agent, by agent name
+routes: Dict[str, RoutedLlm] = {}
+
+# Capability tiers from most to least capable; a tier may fall back to any tier after it
+TIERS = ["large", "fast"]
+
+def routed_model(agent_name: str, tier: str, slo_seconds: float) -> BaseLlm:
+    """
+    Returns the model an agent should use, given its capability tier and latency SLO.
+
+    Args:
+        agent_name: Name of the agent (used in route statistics)
+        tier: Preferred capability tier of the agent ("large" or "fast")
+        slo_seconds: p95 latency above which the agent falls back to a faster tier
+
+    Returns:
+        A RoutedLlm over the models of this tier and every faster tier
+    """
+    settings = get_settings()
+    candidates = list(dict.fromkeys(settings.tier_model(name) for name in TIERS[TIERS.index(tier):]))
+    routed = RoutedLlm(model=candidates[0], candidates=candidates, slo_seconds=slo_seconds, agent_name=agent_name)
+    routes[agent_name] = routed
+    return routed
+
+def routed_agent_kwargs(agent_name: str, tier: str, slo_seconds: float) -> Dict[str, Any]:
+    """
+    Returns the Agent arguments every agent of this package shares.
+
+    - name and model: a RoutedLlm for the agent's capability tier, which falls back to a
+      faster tier while the p95 latency of its calls is above slo_seconds (see routed_model);
+    - before_agent_callback, before_model_callback and after_model_callback: record/replay
+      of model I/O (RECORD_MODE, see recorder). The session input is only recorded for the
+      root agents (recorder.ROOT_AGENTS).
+
+    Usage:
+        Agent(**routed_agent_kwargs("pr_agent", tier="large", slo_seconds=20), instruction=..., tools=[...])
+    """
+    return {
+        "name": agent_name,
+        "model": routed_model(agent_name, tier, slo_seconds),
+        "before_agent_callback": record_session_input,
+        "before_model_callback": replay_model_response,
+        "after_model_callback": record_model_response,
+    }
+
+def route_report() -> List[Dict[str, Any]]:
+    """Returns the route statistics of every agent created so far."""
+    return [routed.route_stats() for routed in routes.values()]
@@ -0,0 +1,187 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+from dotenv import load_dotenv
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Process-wide configuration read from the environment (and .env) once.
+
+    Modules read it through get_settings() when a value is used rather than at import time,
+    so reload_settings() picks up changed environment variables. The GitHub repository
+    settings (GITHUB_*) are not part of it: setup_repository writes them to the environment
+    while the process runs.
+    """
+    vertex_model: Optional[str]
+    google_cloud_project: Optional[str]
+    google_cloud_location: Optional[str]
+    scripted_setup: bool
+    large_model: Optional[str] = None
+    fast_model: Optional[str] = None
+
+    # Model routing: history window and maximum sample age of the latency percentiles, calls a
+    # model needs before its p95 is trusted, and how often a fallback route probes the preferred model
+    router_history_window: int = 50
+    router_history_max_age: float = 300
+    router_min_samples: int = 5
+    router_probe_every: int = 10
+
+    # Orchestrator: ticket pipelines running at once, setup prefetch, scheduler pools
+    max_concurrency: int = 4
+    prefetch_top_n: int = 3
+    scheduler_llm_workers: int = 2
+    scheduler_io_workers: int = 4
+    # Batches skip tickets at least duplicate_threshold similar to a processed or in-flight one
+    skip_duplicate_tickets: bool = True
+    duplicate_threshold: float = 0.7
+    checkpoint_db: Optional[str] = None
+    checkpoint_retention_days: float = 7
+
+    # Deadlines: per run (or orchestrator call), per HTTP request, and hedged idempotent reads
+    run_deadline_seconds: float = 900
+    http_timeout_seconds: float = 30
+    hedge_reads: bool = False
+
+    # Implementation and testing stages
+    implementation_workers: int = 4
+    implementation_max_modules: int = 8
+    implementation_parallel_min_modules: int = 3
+    test_stream_workers: int = 4
+    speculative_tests: bool = False
+
+    # JIRA
+    jira_backend: str = "mock"
+    jira_url: str = ""
+    jira_user: Optional[str] = None
+    jira_api_key: Optional[str] = None
+    jira_project_key: str = ""
+    jira_mirror: bool = False
+    jira_mirror_db: Optional[str] = None
+    jira_mirror_max_age_seconds: float = 300
+    jira_sync_overlap_minutes: float = 60
+    parsed_ticket_entries: int = 2048
+
+    # Local stores and caches (None directories use the defaults under .cache)
+    artifact_store_dir: Optional[str] = None
+    result_cache_dir: Optional[str] = None
+    result_cache_max_bytes: int = 256 * 1024 * 1024
+    result_cache_disabled: bool = False
+    http_cache_dir: Optional[str] = None
+    http_cache_ttl_seconds: float = 30
+    http_cache_memory_entries: int = 512
+    http_cache_max_bytes: int = 64 * 1024 * 1024
+    http_cache_disabled: bool = False
+
+    # Rate limits in requests per second (0 for unlimited)
+    rate_limit_github_rps: float = 5
+    rate_limit_jira_rps: float = 10
+    rate_limit_model_rps: float = 10
+    rate_limiting_disabled: bool = False
+
+    # Tracing and record/replay
+    tracing_disabled: bool = False
+    trace_file: Optional[str] = None
+    trace_max_bytes: int = 64 * 1024 * 1024
+    trace_payload_sizes: bool = False
+    record_mode: str = "off"
+    recording_file: Optional[str] = None
+
+    def model(self, default: str = "gemini-1.5-pro") -> str:
+        """Returns the configured Vertex model, or the given default if VERTEX_MODEL is not set."""
+        return self.vertex_model or default
+
+    def tier_model(self, tier: str) -> str:
+        """
+        Returns the model of a capability tier.
+
+        ROUTER_MODEL_LARGE / ROUTER_MODEL_FAST pick the model of each tier; otherwise
+        VERTEX_MODEL is used for every tier, falling back to the built-in defaults.
+        """
+        if tier == "fast":
+            return self.fast_model or self.model("gemini-2.0-flash")
+        return self.large_model or self.model("gemini-1.5-pro")
+
+def _flag(name: str, default: bool = False) -> bool:
+    value = os.environ.get(name)
+    return default if value is None else value.lower() in ("1", "true", "yes")
+
+def _int(name: str, default: int) -> int:
+    return int(os.environ.get(name) or default)
+
+def _float(name: str, default: float) -> float:
+    return float(os.environ.get(name) or default)
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Loads .env into the environment on first use and returns the cached settings.
+
+    Returns:
+        The process-wide Settings instance
+    """
+    load_dotenv()
+    return Settings(
+        vertex_model=os.environ.get("VERTEX_MODEL"),
+        google_cloud_project=os.environ.get("GOOGLE_CLOUD_PROJECT"),
+        google_cloud_location=os.environ.get("GOOGLE_CLOUD_LOCATION"),
+        scripted_setup=_flag("ORCHESTRATOR_SCRIPTED_SETUP", True),
+        large_model=os.environ.get("ROUTER_MODEL_LARGE"),
+        fast_model=os.environ.get("ROUTER_MODEL_FAST"),
+        router_history_window=_int("ROUTER_HISTORY_WINDOW", 50),
+        router_history_max_age=_float("ROUTER_HISTORY_MAX_AGE", 300),
+        router_min_samples=_int("ROUTER_MIN_SAMPLES", 5),
+        router_probe_every=_int("ROUTER_PROBE_EVERY", 10),
+        max_concurrency=_int("ORCHESTRATOR_MAX_CONCURRENCY", 4),
+        prefetch_top_n=_int("PREFETCH_TOP_N", 3),
+        scheduler_llm_workers=_int("SCHEDULER_LLM_WORKERS", 2),
+        scheduler_io_workers=_int("SCHEDULER_IO_WORKERS", 4),
+        skip_duplicate_tickets=_flag("SKIP_DUPLICATE_TICKETS", True),
+        duplicate_threshold=_float("DUPLICATE_THRESHOLD", 0.7),
+        checkpoint_db=os.environ.get("CHECKPOINT_DB"),
+        checkpoint_retention_days=_float("CHECKPOINT_RETENTION_DAYS", 7),
+        run_deadline_seconds=_float("RUN_DEADLINE_SECONDS", 900),
+        http_timeout_seconds=_float("HTTP_TIMEOUT_SECONDS", 30),
+        hedge_reads=_flag("HEDGE_READS"),
+        implementation_workers=_int("IMPLEMENTATION_WORKERS", 4),
+        # At least one module, so the planner never divides by zero
+        implementation_max_modules=max(1, _int("IMPLEMENTATION_MAX_MODULES", 8)),
+        implementation_parallel_min_modules=_int("IMPLEMENTATION_PARALLEL_MIN_MODULES", 3),
+        test_stream_workers=_int("TEST_STREAM_WORKERS", 4),
+        speculative_tests=_flag("SPECULATIVE_TESTS"),
+        jira_backend=os.environ.get("JIRA_BACKEND", "mock").lower(),
+        jira_url=os.environ.get("JIRA_URL", "").rstrip("/"),
+        jira_user=os.environ.get("JIRA_USER"),
+        jira_api_key=os.environ.get("JIRA_API_KEY"),
+        jira_project_key=os.environ.get("JIRA_PROJECT_KEY", ""),
+        jira_mirror=_flag("JIRA_MIRROR"),
+        jira_mirror_db=os.environ.get("JIRA_MIRROR_DB"),
+        jira_mirror_max_age_seconds=_float("JIRA_MIRROR_MAX_AGE_SECONDS", 300),
+        jira_sync_overlap_minutes=_float("JIRA_SYNC_OVERLAP_MINUTES", 60),
+        parsed_ticket_entries=_int("PARSED_TICKET_ENTRIES", 2048),
+        artifact_store_dir=os.environ.get("ARTIFACT_STORE_DIR"),
+        result_cache_dir=os.environ.get("RESULT_CACHE_DIR"),
+        result_cache_max_bytes=_int("RESULT_CACHE_MAX_BYTES", 256 * 1024 * 1024),
+        result_cache_disabled=_flag("RESULT_CACHE_DISABLED"),
+        http_cache_dir=os.environ.get("HTTP_CACHE_DIR"),
+        http_cache_ttl_seconds=_float("HTTP_CACHE_TTL_SECONDS", 30),
+        http_cache_memory_entries=_int("HTTP_CACHE_MEMORY_ENTRIES", 512),
+        http_cache_max_bytes=_int("HTTP_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+        http_cache_disabled=_flag("HTTP_CACHE_DISABLED"),
+        rate_limit_github_rps=_float("RATE_LIMIT_GITHUB_RPS", 5),
+        rate_limit_jira_rps=_float("RATE_LIMIT_JIRA_RPS", 10),
+        rate_limit_model_rps=_float("RATE_LIMIT_MODEL_RPS", 10),
+        rate_limiting_disabled=_flag("RATE_LIMITING_DISABLED"),
+        tracing_disabled=_flag("TRACING_DISABLED"),
+        trace_file=os.environ.get("TRACE_FILE"),
+        trace_max_bytes=_int("TRACE_MAX_BYTES", 64 * 1024 * 1024),
+        trace_payload_sizes=_flag("TRACE_PAYLOAD_SIZES"),
+        record_mode=os.environ.get("RECORD_MODE", "off").lower(),
+        recording_file=os.environ.get("RECORDING_FILE"),
+    )
+
+def reload_settings() -> Settings:
+    """Re-reads the settings from the environment, e.g. after a test or benchmark changed it."""
+    get_settings.cache_clear()
+    return get_settings()
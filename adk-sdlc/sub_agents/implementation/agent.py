@@ -1,20 +1,17 @@
-import os
 from google.adk.agents import Agent
-from dotenv import load_dotenv
 
 # Import tools
 from .tools.implementation_tool import generate_implementation_tool
 
 # Import prompts
 from .prompt import return_instructions_implementation_agent
-
-load_dotenv()
+from ...model_router import routed_agent_kwargs
+from ..registry import AGENT_SPECS
 
 # Create the implementation agent
 implementation_agent = Agent(
-    model=os.environ.get("VERTEX_MODEL", "gemini-1.5-pro"),
-    name="implementation_agent",
-    description="Agent that generates code implementations based on requirements",
+    **routed_agent_kwargs("implementation_agent", tier="large", slo_seconds=60),
+    description=AGENT_SPECS["implementation"].description,
     instruction=return_instructions_implementation_agent(),
     tools=[
         generate_implementation_tool,
@@ -32,6 +32,11 @@ When generating code:
 - Handle errors gracefully
 - Write testable code
 
+ARTIFACT HANDLES:
+The code generation tools store the generated files in the local artifact store and return an artifact_id with a
+short summary (file paths, languages, line counts). Return the artifact_id and the summary to the caller.
+Do NOT copy file contents into your response; later stages read the files directly from the artifact store.
+
 Always ensure your implementations:
 - Meet the requirements exactly
 - Are well-documented
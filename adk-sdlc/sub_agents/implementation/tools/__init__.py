@@ -1,3 +1,4 @@
-from .implementation_tool import generate_implementation
+from .implementation_tool import generate_implementation, stream_implementation
+from .parallel_generator import generate_implementation_parallel
 
-__all__ = ['generate_implementation']
\ No newline at end of file
+__all__ = ['generate_implementation', 'generate_implementation_parallel', 'stream_implementation']
\ No newline at end of file
@@ -1,7 +1,17 @@
 from google.adk.tools import FunctionTool
 from typing import Dict
+from ..prompt import return_instructions_implementation_agent
+from ....model_router import cache_model
+from ...tools.artifact_store import store_result_files
+from ...tools.file_stream import FileSource, FileStream
+from ...tools.result_cache import ResultCache, cached_call, cached_stream, content_hash, normalize_text, prompt_version
+from ...tools.tracing import traced
 
-def generate_code_func(requirements: str, project_context: str = "") -> dict:
+# Cache of generated code, keyed by requirements, project context, model and prompt version
+code_cache = ResultCache("code_generator")
+PROMPT_VERSION = prompt_version(return_instructions_implementation_agent())
+
+def _generate_code(requirements: str, project_context: str = "") -> dict:
     """
     Generates code implementation based on provided requirements.
     Returns a dictionary containing file paths and their content.
@@ -134,5 +144,59 @@ __all__ = ['image_to_ascii']
 """
     }
 
+def _stream_code(requirements: str, project_context: str = "") -> FileSource:
+    """
+    Yields the generated files one at a time and returns the remaining result fields.
+    A model-backed generator yields each file as soon as its block is complete.
+    """
+    result = _generate_code(requirements, project_context)
+    yield from result["files"].items()
+    return {key: value for key, value in result.items() if key != "files"}
+
+def _cache_key(requirements: str, project_context: str) -> str:
+    return content_hash(
+        normalize_text(requirements),
+        normalize_text(project_context),
+        cache_model("large"),
+        PROMPT_VERSION
+    )
+
+@traced("implementation")
+def generate_code_func(requirements: str, project_context: str = "", bypass_cache: bool = False) -> dict:
+    """
+    Generates code implementation based on provided requirements.
+    Returns a dictionary containing file paths and their content.
+    Identical inputs for the same model and prompt version are served from the result cache.
+    The generated files are written to the artifact store; pass the returned artifact_id to the
+    testing and PR tools instead of the file contents.
+    
+    Args:
+        requirements: The requirements document to implement
+        project_context: Additional context about the project
+        bypass_cache: Regenerate even if a cached implementation exists
+        
+    Returns:
+        A dictionary containing the artifact ID, a summary of the files and setup instructions
+    """
+    key = _cache_key(requirements, project_context)
+    result = cached_call(code_cache, key, lambda: _generate_code(requirements, project_context), bypass_cache)
+    return store_result_files(result, "implementation")
+
+def stream_code_func(requirements: str, project_context: str = "", bypass_cache: bool = False) -> FileStream:
+    """
+    Streaming variant of generate_code_func that hands on each file as soon as it is generated.
+
+    Args:
+        requirements: The requirements document to implement
+        project_context: Additional context about the project
+        bypass_cache: Regenerate even if a cached implementation exists
+
+    Returns:
+        A FileStream of the generated files; its result() is what generate_code_func returns
+    """
+    key = _cache_key(requirements, project_context)
+    source = cached_stream(code_cache, key, lambda: _stream_code(requirements, project_context), bypass_cache=bypass_cache)
+    return FileStream(source, "implementation")
+
 # Create the FunctionTool by passing the function directly
 generate_code = FunctionTool(generate_code_func)
\ No newline at end of file
@@ -1,8 +1,21 @@
 import os
 from typing import Dict, Any
 from google.adk.tools import FunctionTool
+from ..prompt import return_instructions_implementation_agent
+from ....model_router import cache_model
+from ....settings import get_settings
+from ...tools.artifact_store import store_result_files
+from ...tools.file_stream import FileSource, FileStream
+from ...tools.result_cache import ResultCache, cached_call, cached_stream, content_hash, normalize_text, prompt_version
+from ...tools.tracing import traced
+from ...testing.tools.testing_tool import hand_off_tests, start_tests_from_stream
+from .parallel_generator import generate_implementation_parallel, plan_modules
 
-def generate_implementation(requirements: str) -> Dict[str, Any]:
+# Cache of generated implementations, keyed by requirements, model and prompt version
+implementation_cache = ResultCache("implementation")
+PROMPT_VERSION = prompt_version(return_instructions_implementation_agent())
+
+def _generate_implementation(requirements: str) -> Dict[str, Any]:
     """
     Generates code implementation based on the provided requirements.
     
@@ -76,5 +89,73 @@ numpy>=1.21.0
             "message": "Failed to generate code implementation"
         }
 
+def _stream_implementation(requirements: str) -> FileSource:
+    """
+    Yields the generated files one at a time and returns the remaining result fields.
+    A model-backed generator yields each file as soon as its block is complete.
+    """
+    result = _generate_implementation(requirements)
+    yield from (result.get("code") or {}).items()
+    return {key: value for key, value in result.items() if key != "code"}
+
+def _cache_key(requirements: str) -> str:
+    return content_hash(
+        normalize_text(requirements),
+        cache_model("large"),
+        PROMPT_VERSION
+    )
+
+@traced("implementation")
+def generate_implementation(requirements: str, bypass_cache: bool = False) -> Dict[str, Any]:
+    """
+    Generates code implementation based on the provided requirements.
+    Identical requirements for the same model and prompt version are served from the result cache.
+    The generated files are written to the artifact store; pass the returned artifact_id to the
+    testing and PR tools instead of the file contents. Requirements that plan into at least
+    IMPLEMENTATION_PARALLEL_MIN_MODULES modules are generated module by module in parallel
+    (see generate_implementation_parallel). Otherwise, with SPECULATIVE_TESTS, tests are
+    generated while the files stream in and handed to generate_tests for the same requirements.
+    
+    Args:
+        requirements: A string containing the implementation requirements
+        bypass_cache: Regenerate even if a cached implementation exists
+        
+    Returns:
+        A dictionary containing the artifact ID and a summary of the generated code
+    """
+    settings = get_settings()
+    min_modules = settings.implementation_parallel_min_modules
+    if min_modules and len(plan_modules(requirements)["units"]) >= min_modules:
+        return generate_implementation_parallel(requirements, bypass_cache=bypass_cache)
+    if not settings.speculative_tests:
+        key = _cache_key(requirements)
+        result = cached_call(implementation_cache, key, lambda: _generate_implementation(requirements), bypass_cache)
+        return store_result_files(result, "implementation", files_key="code")
+    # Tests are generated on every file as it arrives; generate_tests picks them up by artifact ID
+    # and requirements
+    stream = stream_implementation(requirements, bypass_cache)
+    tests = start_tests_from_stream(stream, requirements)
+    result = stream.result()
+    if result.get("artifact_id"):
+        hand_off_tests(result["artifact_id"], requirements, tests)
+    else:
+        tests.cancel()
+    return result
+
+def stream_implementation(requirements: str, bypass_cache: bool = False) -> FileStream:
+    """
+    Streaming variant of generate_implementation that hands on each file as soon as it is generated.
+
+    Args:
+        requirements: A string containing the implementation requirements
+        bypass_cache: Regenerate even if a cached implementation exists
+
+    Returns:
+        A FileStream of the generated files; its result() is what generate_implementation returns
+    """
+    source = cached_stream(implementation_cache, _cache_key(requirements), lambda: _stream_implementation(requirements),
+                           files_key="code", bypass_cache=bypass_cache)
+    return FileStream(source, "implementation", files_key="code")
+
 # Create the FunctionTool
 generate_implementation_tool = FunctionTool(generate_implementation)
\ No newline at end of file
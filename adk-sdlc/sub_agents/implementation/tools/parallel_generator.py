@@ -0,0 +1,308 @@
+"""
+Parallel per-module implementation generation.
+
+Instead of one generation call that has to emit every file, the requirements are planned
+into per-module units: the items of the Requirements section, grouped by the module their
+leading words name (at most IMPLEMENTATION_MAX_MODULES). Units are generated concurrently on
+a bounded pool (IMPLEMENTATION_WORKERS), each cached on its own, so wall time follows the
+slowest module rather than the sum of all of them, and a changed requirement only
+regenerates its module.
+
+A deterministic merge then reconciles what the units share, independent of the order in
+which they finished:
+
+- files are taken in plan order; a path produced twice with different content keeps the
+  first version and is reported as a conflict;
+- requirements.txt fragments are merged into one file, one line per distribution;
+- package-internal imports (`from .module import name`) that name a module which does not
+  define the name are pointed at the module that does;
+- every package's __init__.py is rebuilt to import and export (`__all__`) the public names of
+  its modules, in the layout of the code_generator example; an __init__.py of a package
+  without generated modules is kept as the first unit wrote it.
+
+Every unit is generated by the code generator (code_generator._generate_code) with the
+unit's items and the module plan as its requirements. generate_implementation takes this
+path for requirements that plan into at least IMPLEMENTATION_PARALLEL_MIN_MODULES modules.
+"""
+import ast
+import contextvars
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from .code_generator import PROMPT_VERSION, _generate_code, code_cache
+from ....model_router import cache_model
+from ....settings import get_settings
+from ...tools.artifact_store import store_result_files
+from ...tools.result_cache import cached_call, content_hash, normalize_text
+from ...tools.tracing import traced
+
+_ITEM = re.compile(r"^\s*(?:[-*]|\d+[.)])\s+(.+?)\s*$")
+_HEADER = re.compile(r"^\s*(?:#+\s*)?([A-Za-z][A-Za-z ]*?)\s*:?\s*$")
+_TICKET_KEY = re.compile(r"^\s*#*\s*(?:[A-Z][A-Z0-9_]*-\d+\s*[:\-]?\s*)?")
+_WORD = re.compile(r"[a-z][a-z0-9]*")
+
+# Leading words that say what to do rather than what the module is about
+_SKIP_WORDS = frozenset("""
+a add allow an and as be build by can create display ensure for from handle implement in is it
+make of on or provide should show support that the to use user want we with
+""".split())
+
+def _slug(text: str, max_words: int = 3, fallback: str = "module") -> str:
+    words = [word for word in _WORD.findall(text.lower()) if word not in _SKIP_WORDS]
+    return "_".join(words[:max_words]) or fallback
+
+def _requirement_items(requirements: str) -> List[str]:
+    """Returns the items of the Requirements section, or every list item outside test sections."""
+    sections: Dict[str, List[str]] = {}
+    section = ""
+    for line in requirements.splitlines():
+        item = _ITEM.match(line)
+        if item:
+            sections.setdefault(section, []).append(item.group(1))
+            continue
+        header = _HEADER.match(line)
+        if header and (line.rstrip().endswith(":") or line.lstrip().startswith("#")):
+            section = header.group(1).lower()
+    requirement_items = [item for name, items in sections.items() if "requirement" in name for item in items]
+    if requirement_items:
+        return requirement_items
+    return [item for name, items in sections.items()
+            if not any(word in name for word in ("acceptance", "criteria", "test")) for item in items]
+
+def plan_modules(requirements: str, package: str = "") -> Dict[str, Any]:
+    """
+    Plans an implementation into per-module units.
+
+    Args:
+        requirements: The requirements document to implement
+        package: Package the modules go into; derived from the first line if not given
+
+    Returns:
+        {"package": name, "units": [{"module": name, "requirements": [items]}, ...]}
+    """
+    first_line = next((line for line in requirements.splitlines() if line.strip()), "")
+    package = _slug(package, max_words=4, fallback="") if package else _slug(_TICKET_KEY.sub("", first_line), fallback="generated")
+
+    modules: Dict[str, List[str]] = {}
+    for item in _requirement_items(requirements):
+        words = _WORD.findall(item.lower())
+        # Tests are written by the testing stage
+        if "test" in words or "tests" in words:
+            continue
+        modules.setdefault(_slug(item), []).append(item)
+    if not modules:
+        modules[package] = [normalize_text(requirements)]
+
+    names = list(modules)
+    # Over the limit, consecutive modules are combined under the first one's name
+    per_unit = -(-len(names) // get_settings().implementation_max_modules)
+    units = []
+    for start in range(0, len(names), per_unit):
+        group = names[start:start + per_unit]
+        units.append({"module": group[0], "requirements": [item for name in group for item in modules[name]]})
+    return {"package": package, "units": units}
+
+def _generate_module(package: str, unit: Dict[str, Any], modules: List[str], project_context: str = "") -> Dict[str, Any]:
+    """
+    Generates one module of a planned implementation.
+
+    Args:
+        package: Package of the implementation
+        unit: The module and the requirement items it implements
+        modules: Every module of the plan, so the unit can import from its siblings
+        project_context: Additional context about the project
+
+    Returns:
+        A dictionary containing the module's files and setup instructions
+    """
+    others = [module for module in modules if module != unit["module"]]
+    requirements = (
+        f"Implement the module {package}/{unit['module']}.py of the package {package}"
+        + (f" (its other modules are {', '.join(others)})" if others else "")
+        + ".\n\nRequirements:\n" + "".join(f"- {item}\n" for item in unit["requirements"])
+    )
+    return _generate_code(requirements, project_context)
+
+def _public_names(content: str) -> Optional[List[str]]:
+    """Returns the names a module exports (its __all__, or its public top-level definitions)."""
+    try:
+        tree = ast.parse(content)
+    except SyntaxError:
+        return None
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == "__all__" for target in node.targets):
+            try:
+                return list(ast.literal_eval(node.value))
+            except ValueError:
+                pass
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.append(node.name)
+        elif isinstance(node, ast.Assign):
+            names.extend(target.id for target in node.targets if isinstance(target, ast.Name))
+    return [name for name in names if not name.startswith("_")]
+
+def _requirement_name(line: str) -> str:
+    return re.split(r"[\s<>=!~\[;]", line.strip(), 1)[0].lower().replace("_", "-")
+
+def _merge_requirements(fragments: List[str]) -> Tuple[str, List[str]]:
+    """Merges requirements.txt fragments; the first specifier of a distribution wins."""
+    lines: Dict[str, str] = {}
+    conflicts = []
+    for fragment in fragments:
+        for line in fragment.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name = _requirement_name(line)
+            if name in lines and lines[name] != line:
+                conflicts.append(f"{lines[name]} / {line}")
+                continue
+            lines.setdefault(name, line)
+    return "".join(f"{line}\n" for line in sorted(lines.values(), key=str.lower)), conflicts
+
+def _fix_imports(path: str, content: str, definitions: Dict[str, Dict[str, List[str]]],
+                 unresolved: List[str]) -> str:
+    """Points relative imports of sibling modules at the module that defines each name."""
+    package, module = os.path.dirname(path), os.path.splitext(os.path.basename(path))[0]
+    siblings = definitions.get(package, {})
+    try:
+        tree = ast.parse(content)
+    except SyntaxError:
+        return content
+    owners: Dict[str, str] = {}
+    for sibling, names in sorted(siblings.items()):
+        for name in names:
+            owners.setdefault(name, sibling)
+
+    lines = content.splitlines(keepends=True)
+    replacements = []
+    for node in tree.body:
+        if not (isinstance(node, ast.ImportFrom) and node.level == 1 and node.module in siblings):
+            continue
+        targets: Dict[str, List[str]] = {}
+        for alias in node.names:
+            target = node.module
+            if alias.name not in siblings[node.module]:
+                target = owners.get(alias.name, node.module)
+                if target == node.module:
+                    unresolved.append(f"{path}: {alias.name} from .{node.module}")
+            if target == module:
+                continue
+            targets.setdefault(target, []).append(alias.name if alias.asname is None else f"{alias.name} as {alias.asname}")
+        if list(targets) != [node.module] or len(targets[node.module]) != len(node.names):
+            indent = re.match(r"\s*", lines[node.lineno - 1]).group(0)
+            statement = "".join(f"{indent}from .{target} import {', '.join(names)}\n" for target, names in sorted(targets.items()))
+            replacements.append((node.lineno - 1, node.end_lineno, statement))
+    for start, end, statement in reversed(replacements):
+        lines[start:end] = [statement]
+    return "".join(lines)
+
+def _package_init(package: str, exports: Dict[str, List[str]]) -> str:
+    title = os.path.basename(package).replace("_", " ").title()
+    imports = "".join(f"from .{module} import {', '.join(names)}\n" for module, names in sorted(exports.items()) if names)
+    names = [name for _, module_names in sorted(exports.items()) for name in module_names]
+    return f"# {title} package\n{imports}\n__all__ = {names!r}\n"
+
+def merge_modules(results: List[Dict[str, str]]) -> Dict[str, Any]:
+    """
+    Merges the files of separately generated units into one implementation.
+
+    Args:
+        results: Files of every unit (path -> content), in plan order
+
+    Returns:
+        {"files": merged files, "conflicts": [...], "unresolved_imports": [...]}
+    """
+    files: Dict[str, str] = {}
+    package_inits: Dict[str, str] = {}
+    requirement_fragments: Dict[str, List[str]] = {}
+    conflicts: List[str] = []
+    for unit_files in results:
+        for path, content in sorted(unit_files.items()):
+            name = os.path.basename(path)
+            if name == "__init__.py":
+                # Rebuilt from the package's modules below
+                package_inits.setdefault(path, content)
+            elif name == "requirements.txt":
+                requirement_fragments.setdefault(path, []).append(content)
+            elif path in files and files[path] != content:
+                conflicts.append(f"{path} was generated by more than one unit; kept the first version")
+            else:
+                files.setdefault(path, content)
+    for path, fragments in requirement_fragments.items():
+        files[path], dependency_conflicts = _merge_requirements(fragments)
+        conflicts.extend(f"{path}: conflicting requirements {conflict}" for conflict in dependency_conflicts)
+
+    # Public names per package directory and module
+    definitions: Dict[str, Dict[str, List[str]]] = {}
+    for path, content in files.items():
+        if path.endswith(".py") and os.path.basename(path) != "__init__.py":
+            names = _public_names(content)
+            if names is not None:
+                definitions.setdefault(os.path.dirname(path), {})[os.path.splitext(os.path.basename(path))[0]] = names
+
+    unresolved: List[str] = []
+    for path in sorted(files):
+        if path.endswith(".py") and os.path.basename(path) != "__init__.py":
+            files[path] = _fix_imports(path, files[path], definitions, unresolved)
+    for package, exports in definitions.items():
+        if package:
+            package_inits[f"{package}/__init__.py"] = _package_init(package, exports)
+    files.update(package_inits)
+    return {"files": dict(sorted(files.items())), "conflicts": conflicts, "unresolved_imports": unresolved}
+
+@traced("implementation")
+def generate_implementation_parallel(requirements: str, project_context: str = "", package: str = "",
+                                     max_workers: int = 0, bypass_cache: bool = False) -> Dict[str, Any]:
+    """
+    Generates an implementation module by module, with the modules generated concurrently.
+    The generated files are written to the artifact store; pass the returned artifact_id to the
+    testing and PR tools instead of the file contents.
+
+    Args:
+        requirements: The requirements document to implement
+        project_context: Additional context about the project
+        package: Package to put the modules in (derived from the requirements if empty)
+        max_workers: Modules generated at the same time (defaults to IMPLEMENTATION_WORKERS)
+        bypass_cache: Regenerate modules even if cached versions exist
+
+    Returns:
+        A dictionary containing the artifact ID, a summary of the files, the module plan and
+        any conflicts the merge found
+    """
+    plan = plan_modules(requirements, package)
+    modules = [unit["module"] for unit in plan["units"]]
+    model = cache_model("large")
+
+    def generate(unit: Dict[str, Any]) -> Dict[str, Any]:
+        key = content_hash(plan["package"], unit, modules, normalize_text(project_context), model, PROMPT_VERSION)
+        return cached_call(code_cache, key, lambda: _generate_module(plan["package"], unit, modules, project_context), bypass_cache)
+
+    workers = max(1, min(max_workers or get_settings().implementation_workers, len(plan["units"])))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="implementation-unit") as executor:
+        # Every unit runs in a copy of this context (run deadline, tracing); results stay in plan order
+        futures = [executor.submit(contextvars.copy_context().run, generate, unit) for unit in plan["units"]]
+        results = [future.result() for future in futures]
+
+    failed = [module for module, result in zip(modules, results) if not result.get("success", True)]
+    if failed:
+        return {
+            "success": False,
+            "error": f"Generation failed for modules: {', '.join(failed)}",
+            "message": "Failed to generate the implementation"
+        }
+    merged = merge_modules([result.get("files") or {} for result in results])
+    result = {
+        "success": True,
+        "files": merged["files"],
+        "setup_instructions": next((result["setup_instructions"] for result in results if result.get("setup_instructions")), ""),
+        "package": plan["package"],
+        "modules": modules,
+        "conflicts": merged["conflicts"],
+        "unresolved_imports": merged["unresolved_imports"],
+        "cache_hit": all(result.get("cache_hit") for result in results),
+        "message": f"Generated {len(modules)} modules with {workers} workers"
+    }
+    return store_result_files(result, "implementation")
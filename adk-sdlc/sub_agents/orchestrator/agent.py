@@ -1,31 +1,38 @@
-import os
 from google.adk.agents import Agent
-from dotenv import load_dotenv
 
 # Import tools
 from .tools.orchestrator_tool import (
-    requirements_agent,
-    implementation_agent,
-    testing_agent,
-    pr_agent
+    requirements_agent_async,
+    implementation_agent_async,
+    testing_agent_async,
+    pr_agent_async
 )
+from .tools.batch_tool import run_ticket_batch_tool
+from .tools.scheduler import run_pipelined_batch_tool
+from .tools.workflow_tool import prepare_workspace_tool
 
 # Import prompts
 from .prompt import return_instructions_orchestrator
+from ...settings import get_settings
+from ...model_router import routed_agent_kwargs
 
-load_dotenv()
+settings = get_settings()
 
 # Create the orchestrator agent
 orchestrator_agent = Agent(
-    model=os.environ.get("VERTEX_MODEL", "gemini-2.0-flash"),
-    name="orchestrator_agent",
+    **routed_agent_kwargs("orchestrator_agent", tier="fast", slo_seconds=5),
     description="Agent that coordinates the workflow between all specialized agents",
-    instruction=return_instructions_orchestrator(),
+    instruction=return_instructions_orchestrator(settings.scripted_setup),
     tools=[
-        requirements_agent,
-        implementation_agent,
-        testing_agent,
-        pr_agent
+        # Scripted setup: MCP server, repository and story list in one call
+        prepare_workspace_tool,
+        # Async wrappers keep the event loop free while a sub-agent runs
+        requirements_agent_async,
+        implementation_agent_async,
+        testing_agent_async,
+        pr_agent_async,
+        run_ticket_batch_tool,
+        run_pipelined_batch_tool
     ]
 )
 
@@ -2,5 +2,12 @@ from .orchestrator_tool import (
     requirements_agent,
     implementation_agent,
     testing_agent,
-    pr_agent
-) 
\ No newline at end of file
+    pr_agent,
+    requirements_agent_async,
+    implementation_agent_async,
+    testing_agent_async,
+    pr_agent_async
+)
+from .batch_tool import run_ticket_batch_tool
+from .scheduler import run_pipelined_batch_tool
+from .workflow_tool import prepare_workspace_tool
@@ -0,0 +1,337 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Dict, Any, Iterator, List, Optional
+from google.adk.tools import FunctionTool
+from .orchestrator_tool import (
+    requirements_agent,
+    implementation_agent,
+    testing_agent,
+    pr_agent
+)
+from ....settings import get_settings
+from .checkpoint_store import get_checkpoint_store
+from ...requirements.tools.jira_tool import MAX_PAGE_SIZE, get_ticket_details_batch, list_open_tickets
+from ...requirements.tools.ticket_similarity import get_duplicate_index
+from ...tools.deadline import deadline_scope
+from ...tools.tracing import traced, trace_context
+
+def _requirements_stage(ticket_id: str, results: Dict[str, Any]) -> Dict[str, Any]:
+    return requirements_agent.func(f"get_ticket_details {ticket_id}")
+
+def _implementation_stage(ticket_id: str, results: Dict[str, Any]) -> Dict[str, Any]:
+    return implementation_agent.func({
+        "ticket_id": ticket_id,
+        "requirements": results["requirements"]["response"]
+    })
+
+def _testing_stage(ticket_id: str, results: Dict[str, Any]) -> Dict[str, Any]:
+    return testing_agent.func(results["implementation"]["code"])
+
+def _pr_stage(ticket_id: str, results: Dict[str, Any]) -> Dict[str, Any]:
+    return pr_agent.func(results["implementation"]["code"], results["testing"]["tests"])
+
+# The SDLC chain for a single ticket, in execution order
+PIPELINE_STAGES = [
+    ("requirements", _requirements_stage),
+    ("implementation", _implementation_stage),
+    ("testing", _testing_stage),
+    ("pr", _pr_stage),
+]
+
+def run_ticket_pipeline(ticket_id: str, run_id: Optional[str] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Runs the full requirements -> implementation -> testing -> PR chain for one ticket.
+
+    When a run ID is given, every completed stage is checkpointed, and stages already
+    completed in an earlier attempt of the same run are restored instead of re-executed.
+
+    Args:
+        ticket_id: The ticket to push through the chain
+        run_id: Checkpointed run this pipeline belongs to (optional)
+        deadline: Absolute deadline of the run as a time.monotonic() value (optional)
+
+    Returns:
+        A per-ticket result record with the outcome and timing of every stage
+    """
+    started = time.perf_counter()
+    record = {
+        "ticket_id": ticket_id,
+        "success": False,
+        "failed_stage": None,
+        "error": None,
+        "stages": {},
+        "pr": None
+    }
+    results = {}
+    store = get_checkpoint_store() if run_id else None
+    checkpoints = store.load_stages(run_id, ticket_id) if store else {}
+
+    with trace_context(run_id=run_id, ticket_id=ticket_id), deadline_scope(until=deadline):
+        for stage_name, stage in PIPELINE_STAGES:
+            if stage_name in checkpoints:
+                results[stage_name] = checkpoints[stage_name]
+                record["stages"][stage_name] = {
+                    "success": True,
+                    "message": "Restored from checkpoint",
+                    "duration_seconds": 0.0,
+                    "resumed": True
+                }
+                continue
+
+            stage_started = time.perf_counter()
+            try:
+                result = stage(ticket_id, results)
+            except Exception as e:
+                result = {"success": False, "error": str(e), "message": f"Stage {stage_name} raised an error"}
+
+            record["stages"][stage_name] = {
+                "success": result.get("success", False),
+                "message": result.get("message", ""),
+                "duration_seconds": round(time.perf_counter() - stage_started, 3)
+            }
+            if not result.get("success", False):
+                record["failed_stage"] = stage_name
+                record["error"] = result.get("error", result.get("message"))
+                break
+            results[stage_name] = result
+            if store:
+                store.save_stage(run_id, ticket_id, stage_name, result)
+        else:
+            record["success"] = True
+            record["pr"] = results["pr"].get("pr")
+
+    record["duration_seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+def resolve_ticket_ids(ticket_ids: Optional[List[str]] = None) -> List[str]:
+    """Returns the given ticket IDs, or the keys of every open ticket if none were given."""
+    if ticket_ids:
+        return list(ticket_ids)
+    keys, cursor = [], ""
+    while True:
+        page = list_open_tickets(cursor=cursor, page_size=MAX_PAGE_SIZE)
+        keys.extend(ticket["key"] for ticket in page.get("tickets", []))
+        cursor = page.get("next_cursor", "")
+        if not cursor:
+            return keys
+
+def open_run(ticket_ids: Optional[List[str]] = None, run_id: str = "") -> Dict[str, Any]:
+    """
+    Starts a checkpointed run, or resumes the run with the given ID.
+
+    Args:
+        ticket_ids: The tickets to process; if empty, every open ticket (new run) or every
+            ticket of the resumed run
+        run_id: ID of an earlier run to resume; if empty, a new run is started
+
+    Returns:
+        A dictionary containing the run ID and the tickets to process, or an error if the run
+        ID is unknown or there are no tickets
+    """
+    store = get_checkpoint_store()
+    if run_id:
+        try:
+            ticket_ids = store.resume_run(run_id, ticket_ids)
+        except KeyError:
+            return {
+                "success": False,
+                "error": f"Unknown run ID: {run_id}",
+                "message": "No checkpointed run with this ID exists; start a new run without a run_id"
+            }
+    else:
+        ticket_ids = resolve_ticket_ids(ticket_ids)
+    if not ticket_ids:
+        return {
+            "success": False,
+            "error": "No tickets to process",
+            "message": "No ticket IDs were given and no open tickets were found"
+        }
+    return {"success": True, "run_id": run_id or store.start_run(ticket_ids), "ticket_ids": ticket_ids}
+
+def claim_tickets(ticket_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Registers the tickets of a batch as in flight in the near-duplicate index.
+
+    A ticket is not registered if it is a near-duplicate of a processed ticket, of one in
+    flight in another batch or of one claimed earlier in this list.
+
+    Returns:
+        The closest match of every near-duplicate ticket, by ticket ID; these tickets are skipped
+    """
+    found = get_ticket_details_batch(ticket_ids, include_markdown=False)
+    index = get_duplicate_index()
+    duplicates = {}
+    for result in found.get("results", []):
+        # Tickets that cannot be fetched still run, so that their pipeline reports the error
+        if result["status"] == "success":
+            match = index.claim(result["ticket"])
+            if match:
+                duplicates[result["ticket_id"]] = match
+    return duplicates
+
+@contextmanager
+def claimed_tickets(ticket_ids: List[str], screen: bool = True) -> Iterator[Dict[str, Dict[str, Any]]]:
+    """
+    Claims the tickets of a batch (see claim_tickets) for the duration of the block.
+
+    Claims the block leaves in flight, because the batch raised before settle_tickets ran, are
+    released on exit, so later near-duplicates are not reported as pending on them forever.
+
+    Yields:
+        The closest match of every near-duplicate ticket (empty when screen is False)
+    """
+    duplicates = claim_tickets(ticket_ids) if screen else {}
+    try:
+        yield duplicates
+    finally:
+        if screen:
+            index = get_duplicate_index()
+            for ticket_id in ticket_ids:
+                state = index.state(ticket_id)
+                if ticket_id not in duplicates and state and state["state"] == "in_flight":
+                    index.finish(ticket_id, False)
+
+def settle_tickets(ticket_ids: List[str], records: List[Dict[str, Any]],
+                   duplicates: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Marks the claimed tickets of a finished batch as processed (or releases the failed ones)
+    and adds a record for every skipped near-duplicate, reusing the PR of its original.
+
+    A near-duplicate whose original is still running in another batch has no PR yet; its
+    record is marked pending and does not count as succeeded.
+
+    Returns:
+        The records of all tickets, in input order
+    """
+    index = get_duplicate_index()
+    by_id = {record["ticket_id"]: record for record in records}
+    for record in records:
+        index.finish(record["ticket_id"], record["success"], record["pr"])
+
+    settled = []
+    for ticket_id in ticket_ids:
+        match = duplicates.get(ticket_id)
+        if match is None:
+            settled.append(by_id[ticket_id])
+            continue
+        original = by_id.get(match["ticket_id"])
+        if original is not None:
+            state = {"state": "processed" if original["success"] else "failed", "pr": original["pr"]}
+        else:
+            # The original belongs to another batch, which may have finished it since the claim
+            state = index.state(match["ticket_id"]) or {"state": "failed", "pr": None}
+        failed = state["state"] == "failed"
+        pending = state["state"] == "in_flight"
+        error = None
+        if failed:
+            error = f"Near-duplicate of {match['ticket_id']}, which failed"
+        elif pending:
+            error = f"Near-duplicate of {match['ticket_id']}, which is still running in another batch"
+        settled.append({
+            "ticket_id": ticket_id,
+            "success": state["state"] == "processed",
+            "pending": pending,
+            "failed_stage": None,
+            "error": error,
+            "stages": {},
+            "pr": state["pr"],
+            "duplicate_of": match["ticket_id"],
+            "similarity": match["similarity"],
+            "duration_seconds": 0.0
+        })
+    return settled
+
+def build_batch_report(records: List[Dict[str, Any]], wall_time: float) -> Dict[str, Any]:
+    """
+    Builds the aggregate summary for a finished batch.
+
+    Args:
+        records: Per-ticket result records, in input order
+        wall_time: Wall-clock duration of the whole batch in seconds
+
+    Returns:
+        A dictionary containing the records, the summary and a formatted summary table
+    """
+    pending = [record["ticket_id"] for record in records if record.get("pending")]
+    failed = [record["ticket_id"] for record in records if not record["success"] and not record.get("pending")]
+    duplicates = [record["ticket_id"] for record in records if record.get("duplicate_of")]
+    summary = {
+        "total": len(records),
+        "succeeded": len(records) - len(failed) - len(pending),
+        "failed": len(failed),
+        "failed_tickets": failed,
+        "pending": len(pending),
+        "pending_tickets": pending,
+        "skipped_duplicates": duplicates,
+        "wall_time_seconds": round(wall_time, 3),
+        "serial_time_seconds": round(sum(record["duration_seconds"] for record in records), 3)
+    }
+
+    # Format the per-ticket outcome as a markdown table
+    table = "| Ticket | Result | Failed Stage | Duration (s) |\n"
+    table += "|--------|--------|--------------|--------------|\n"
+    for record in records:
+        result = "✅" if record["success"] else "⏳" if record.get("pending") else "❌"
+        if record.get("duplicate_of"):
+            result += f" duplicate of {record['duplicate_of']}"
+            if record.get("pending"):
+                result += " (still running)"
+        table += f"| {record['ticket_id']} | {result} | {record['failed_stage'] or '-'} | {record['duration_seconds']} |\n"
+
+    return {
+        "success": not failed,
+        "results": records,
+        "summary": summary,
+        "formatted_summary": table,
+        "message": f"Processed {summary['total']} tickets: {summary['succeeded']} succeeded, {summary['failed']} failed"
+                   + (f", {len(duplicates)} skipped as near-duplicates" if duplicates else "")
+                   + (f" ({len(pending)} pending on tickets still running in another batch)" if pending else "")
+    }
+
+@traced("orchestrator")
+def run_ticket_batch(ticket_ids: Optional[List[str]] = None, max_concurrency: int = 0, run_id: str = "",
+                     deadline_seconds: float = 0, skip_duplicates: bool = True) -> Dict[str, Any]:
+    """
+    Runs the SDLC chain for many tickets at the same time.
+
+    Args:
+        ticket_ids: The tickets to process. If empty, every open ticket is processed
+            (or, when resuming, every ticket of the resumed run).
+        max_concurrency: Maximum number of ticket pipelines running at once
+            (defaults to ORCHESTRATOR_MAX_CONCURRENCY)
+        run_id: ID of an earlier run to resume from its first incomplete stage per ticket.
+            If empty, a new run is started; an unknown ID is reported as an error.
+        deadline_seconds: Time budget of the whole run; stages still running when it passes
+            fail with a deadline error (defaults to RUN_DEADLINE_SECONDS)
+        skip_duplicates: Skip tickets that are near-duplicates of tickets already processed or
+            in flight, reusing their PR (always off with SKIP_DUPLICATE_TICKETS=false)
+
+    Returns:
+        A dictionary containing the run ID, the per-ticket result records and an aggregate summary
+    """
+    run = open_run(ticket_ids, run_id)
+    if not run["success"]:
+        return run
+    run_id, ticket_ids = run["run_id"], run["ticket_ids"]
+    started = time.perf_counter()
+    settings = get_settings()
+    screen = skip_duplicates and settings.skip_duplicate_tickets
+    with claimed_tickets(ticket_ids, screen) as duplicates:
+        pending = [ticket_id for ticket_id in ticket_ids if ticket_id not in duplicates]
+        workers = max(1, min(max_concurrency or settings.max_concurrency, len(pending)))
+        deadline = time.monotonic() + (deadline_seconds or settings.run_deadline_seconds)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ticket-pipeline") as executor:
+            # map() keeps the records in input order
+            records = list(executor.map(partial(run_ticket_pipeline, run_id=run_id, deadline=deadline), pending))
+        if screen:
+            records = settle_tickets(ticket_ids, records, duplicates)
+
+    report = build_batch_report(records, time.perf_counter() - started)
+    report["run_id"] = run_id
+    report["summary"]["max_concurrency"] = workers
+    return report
+
+# Create FunctionTool instances
+run_ticket_batch_tool = FunctionTool(run_ticket_batch)
@@ -0,0 +1,185 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional
+from ....settings import get_settings
+
+# Default location of the checkpoint database
+DEFAULT_CHECKPOINT_DB = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))),
+    ".cache", "checkpoints.sqlite3"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_tickets (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    ticket_id TEXT NOT NULL,
+    PRIMARY KEY (run_id, ticket_id)
+);
+CREATE TABLE IF NOT EXISTS stage_outputs (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    ticket_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    output TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (run_id, ticket_id, stage)
+);
+CREATE INDEX IF NOT EXISTS runs_updated_at ON runs(updated_at);
+"""
+
+class CheckpointStore:
+    """
+    SQLite (WAL) store of completed stage outputs, keyed by run ID, ticket and stage.
+
+    A run that fails half-way can be resumed with the same run ID: stages that already
+    have an output are restored from the store instead of being executed again. The run's
+    ticket list is saved when it starts, so a resume also covers tickets that failed before
+    any of their stages completed.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or get_settings().checkpoint_db or DEFAULT_CHECKPOINT_DB
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+    def start_run(self, ticket_ids: List[str]) -> str:
+        """Registers a new run over the given tickets and returns its ID."""
+        run_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("INSERT INTO runs (run_id, created_at, updated_at) VALUES (?, ?, ?)", (run_id, now, now))
+                self._add_tickets(run_id, ticket_ids)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return run_id
+
+    def resume_run(self, run_id: str, ticket_ids: Optional[List[str]] = None) -> List[str]:
+        """
+        Reopens an earlier run.
+
+        Args:
+            run_id: ID returned by start_run
+            ticket_ids: Tickets to process; added to the run's ticket list. If empty, every
+                ticket of the run is processed.
+
+        Returns:
+            The tickets to process
+
+        Raises:
+            KeyError: If no run with this ID exists (or it was garbage-collected)
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                cursor = self._conn.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (time.time(), run_id))
+                if cursor.rowcount == 0:
+                    raise KeyError(run_id)
+                if ticket_ids:
+                    self._add_tickets(run_id, ticket_ids)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return list(ticket_ids) if ticket_ids else self.list_tickets(run_id)
+
+    def _add_tickets(self, run_id: str, ticket_ids: List[str]) -> None:
+        """Appends tickets to a run's ticket list; the caller holds the lock and a transaction."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM run_tickets WHERE run_id = ?", (run_id,)).fetchone()
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO run_tickets (run_id, position, ticket_id) VALUES (?, ?, ?)",
+            [(run_id, count + position, ticket_id) for position, ticket_id in enumerate(ticket_ids)]
+        )
+
+    def save_stage(self, run_id: str, ticket_id: str, stage: str, output: Dict[str, Any]) -> None:
+        """Persists the output of a completed stage."""
+        now = time.time()
+        payload = json.dumps(output, default=str)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO stage_outputs (run_id, ticket_id, stage, output, completed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (run_id, ticket_id, stage, payload, now)
+                )
+                self._conn.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def load_stages(self, run_id: str, ticket_id: str) -> Dict[str, Dict[str, Any]]:
+        """Returns the saved outputs of a ticket in a run, keyed by stage name."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage, output FROM stage_outputs WHERE run_id = ? AND ticket_id = ?",
+                (run_id, ticket_id)
+            ).fetchall()
+        return {stage: json.loads(output) for stage, output in rows}
+
+    def list_tickets(self, run_id: str) -> List[str]:
+        """Returns the tickets of a run, in the order they were started."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ticket_id FROM run_tickets WHERE run_id = ? ORDER BY position",
+                (run_id,)
+            ).fetchall()
+            if not rows:
+                # Runs saved before the ticket list was recorded only know their checkpointed tickets
+                rows = self._conn.execute(
+                    "SELECT ticket_id FROM stage_outputs WHERE run_id = ? "
+                    "GROUP BY ticket_id ORDER BY MIN(completed_at)",
+                    (run_id,)
+                ).fetchall()
+        return [row[0] for row in rows]
+
+    def gc(self, max_age_days: Optional[float] = None) -> int:
+        """
+        Deletes runs that have not been updated for the given number of days.
+
+        Args:
+            max_age_days: Retention period (defaults to CHECKPOINT_RETENTION_DAYS)
+
+        Returns:
+            The number of deleted runs
+        """
+        if max_age_days is None:
+            max_age_days = get_settings().checkpoint_retention_days
+        cutoff = time.time() - max_age_days * 86400
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM runs WHERE updated_at < ?", (cutoff,))
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Returns the process-wide checkpoint store, opening it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CheckpointStore()
+            _store.gc()
+        return _store
@@ -1,10 +1,12 @@
-from typing import Dict, Any
-from google.adk.tools import FunctionTool
-from ...requirements.agent import requirements_agent as req_agent
-from ...implementation.agent import implementation_agent as impl_agent
-from ...testing.agent import testing_agent as test_agent
-from ...pr.agent import pr_agent as pr_agent_instance
+import time
+from typing import Dict, Any, AsyncIterator, Optional
+from google.adk.tools import FunctionTool, ToolContext
+from ....settings import get_settings
+from ...registry import final_text, run_agent, run_agent_events
+from ...tools.deadline import call_with_deadline, deadline_scope, next_before_deadline
+from ...tools.tracing import traced
 
+@traced("requirements")
 def requirements_agent(task: str) -> Dict[str, Any]:
     """
     Invokes the requirements agent to process mock user stories and requirements.
@@ -16,8 +18,9 @@ def requirements_agent(task: str) -> Dict[str, Any]:
         A dictionary containing the requirements analysis or mock user stories
     """
     try:
-        # Call the requirements agent with the task
-        response = req_agent.run(task)
+        # Call the requirements agent with the task, bounded by the run deadline
+        with deadline_scope(get_settings().run_deadline_seconds):
+            response = call_with_deadline(run_agent, "requirements", task)
         return {
             "success": True,
             "response": response,
@@ -30,6 +33,7 @@ def requirements_agent(task: str) -> Dict[str, Any]:
             "message": "Failed to analyze requirements"
         }
 
+@traced("implementation")
 def implementation_agent(requirements: Dict[str, Any]) -> Dict[str, Any]:
     """
     Invokes the implementation agent to generate code based on requirements.
@@ -41,8 +45,9 @@ def implementation_agent(requirements: Dict[str, Any]) -> Dict[str, Any]:
         A dictionary containing the generated code
     """
     try:
-        # Call the implementation agent with the requirements
-        response = impl_agent.run(requirements)
+        # Call the implementation agent with the requirements, bounded by the run deadline
+        with deadline_scope(get_settings().run_deadline_seconds):
+            response = call_with_deadline(run_agent, "implementation", requirements)
         return {
             "success": True,
             "code": response,
@@ -55,6 +60,7 @@ def implementation_agent(requirements: Dict[str, Any]) -> Dict[str, Any]:
             "message": "Failed to generate implementation"
         }
 
+@traced("testing")
 def testing_agent(implementation: Dict[str, Any]) -> Dict[str, Any]:
     """
     Invokes the testing agent to generate tests for the implementation.
@@ -66,8 +72,9 @@ def testing_agent(implementation: Dict[str, Any]) -> Dict[str, Any]:
         A dictionary containing the generated tests
     """
     try:
-        # Call the testing agent with the implementation
-        response = test_agent.run(implementation)
+        # Call the testing agent with the implementation, bounded by the run deadline
+        with deadline_scope(get_settings().run_deadline_seconds):
+            response = call_with_deadline(run_agent, "testing", implementation)
         return {
             "success": True,
             "tests": response,
@@ -80,6 +87,7 @@ def testing_agent(implementation: Dict[str, Any]) -> Dict[str, Any]:
             "message": "Failed to generate tests"
         }
 
+@traced("pr")
 def pr_agent(implementation: Dict[str, Any], tests: Dict[str, Any]) -> Dict[str, Any]:
     """
     Invokes the PR agent to create a pull request with the implementation and tests.
@@ -92,8 +100,11 @@ def pr_agent(implementation: Dict[str, Any], tests: Dict[str, Any]) -> Dict[str,
         A dictionary containing the PR details
     """
     try:
-        # Call the PR agent with the implementation and tests
-        response = pr_agent_instance.run({"implementation": implementation, "tests": tests})
+        # Call the PR agent with the implementation and tests. Its HTTP and model calls are bounded
+        # by the run deadline, but the call itself is not abandoned at the deadline: it creates
+        # branches and PRs, and an abandoned call could still open a PR after the ticket failed
+        with deadline_scope(get_settings().run_deadline_seconds):
+            response = run_agent("pr", {"implementation": implementation, "tests": tests})
         return {
             "success": True,
             "pr": response,
@@ -110,4 +121,156 @@ def pr_agent(implementation: Dict[str, Any], tests: Dict[str, Any]) -> Dict[str,
 requirements_agent = FunctionTool(requirements_agent)
 implementation_agent = FunctionTool(implementation_agent)
 testing_agent = FunctionTool(testing_agent)
-pr_agent = FunctionTool(pr_agent) 
\ No newline at end of file
+pr_agent = FunctionTool(pr_agent)
+
+# Result key and messages of each stage's wrapper result
+STAGE_RESULTS = {
+    "requirements": ("response", "Requirements analysis completed successfully", "Failed to analyze requirements"),
+    "implementation": ("code", "Code implementation completed successfully", "Failed to generate implementation"),
+    "testing": ("tests", "Test generation completed successfully", "Failed to generate tests"),
+    "pr": ("pr", "Pull request created successfully", "Failed to create pull request"),
+}
+
+def _progress(stage: str, started: float, event: Any = None) -> Dict[str, Any]:
+    progress = {"event": "progress" if event else "started", "stage": stage,
+                "elapsed_seconds": round(time.perf_counter() - started, 3)}
+    if event is not None:
+        calls = [call.name for call in event.get_function_calls()]
+        progress.update(author=event.author, **({"tool_calls": calls} if calls else {}))
+    return progress
+
+async def _stream_stage(stage: str, request: Any) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Runs a sub-agent on the caller's event loop and yields a progress event for each of its events.
+
+    The sub-agent runs through Runner.run_async, so the event loop stays free while it waits on
+    its model and tools, and other sessions served by the same process keep making progress.
+    Every stage but the PR stage stops at the run deadline; the PR stage creates branches and
+    PRs and is not cut off mid-way, but its HTTP and model calls fail at the deadline. The last
+    event is always "completed" and carries the same result as the blocking wrapper.
+    """
+    result_key, success_message, failure_message = STAGE_RESULTS[stage]
+    started = time.perf_counter()
+    yield _progress(stage, started)
+
+    response = ""
+    try:
+        with deadline_scope(get_settings().run_deadline_seconds):
+            events = run_agent_events(stage, request)
+            try:
+                while True:
+                    try:
+                        if stage == "pr":
+                            event = await events.__anext__()
+                        else:
+                            event = await next_before_deadline(events, f"{stage} agent")
+                    except StopAsyncIteration:
+                        break
+                    response = final_text(event) or response
+                    yield _progress(stage, started, event)
+            finally:
+                await events.aclose()
+        result = {"success": True, result_key: response, "message": success_message}
+    except Exception as e:
+        result = {"success": False, "error": str(e), "message": failure_message}
+
+    yield {"event": "completed", "stage": stage, "elapsed_seconds": round(time.perf_counter() - started, 3), "result": result}
+
+async def _run_stage(stage: str, tool_context: Optional[ToolContext], request: Any) -> Dict[str, Any]:
+    """
+    Runs a sub-agent call and returns its result with the progress log.
+
+    Each progress event is also written to the session state as "<stage>_progress", through
+    the tool context, so clients watching the session see how far the stage got.
+    """
+    progress = []
+    result = {}
+    async for event in _stream_stage(stage, request):
+        if event["event"] == "completed":
+            result = event["result"]
+            event = {key: value for key, value in event.items() if key != "result"}
+        progress.append(event)
+        if tool_context is not None:
+            tool_context.state[f"{stage}_progress"] = event
+    return {**result, "progress": progress}
+
+def stream_requirements_agent(task: str) -> AsyncIterator[Dict[str, Any]]:
+    """Yields progress events for a requirements agent call; the final event carries the result."""
+    return _stream_stage("requirements", task)
+
+def stream_implementation_agent(requirements: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    """Yields progress events for an implementation agent call; the final event carries the result."""
+    return _stream_stage("implementation", requirements)
+
+def stream_testing_agent(implementation: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    """Yields progress events for a testing agent call; the final event carries the result."""
+    return _stream_stage("testing", implementation)
+
+def stream_pr_agent(implementation: Dict[str, Any], tests: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    """Yields progress events for a PR agent call; the final event carries the result."""
+    return _stream_stage("pr", {"implementation": implementation, "tests": tests})
+
+@traced("requirements")
+async def requirements_agent_async(task: str, tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
+    """
+    Invokes the requirements agent without blocking the event loop.
+    Progress is written to the session state while the agent runs.
+    
+    Args:
+        task: Command or task to execute with the requirements agent
+        
+    Returns:
+        A dictionary containing the requirements analysis and the progress events of the call
+    """
+    return await _run_stage("requirements", tool_context, task)
+
+@traced("implementation")
+async def implementation_agent_async(requirements: Dict[str, Any], tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
+    """
+    Invokes the implementation agent without blocking the event loop.
+    Progress is written to the session state while the agent runs.
+    
+    Args:
+        requirements: Dictionary containing the requirements analysis
+        
+    Returns:
+        A dictionary containing the generated code and the progress events of the call
+    """
+    return await _run_stage("implementation", tool_context, requirements)
+
+@traced("testing")
+async def testing_agent_async(implementation: Dict[str, Any], tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
+    """
+    Invokes the testing agent without blocking the event loop.
+    Progress is written to the session state while the agent runs.
+    
+    Args:
+        implementation: Dictionary containing the code implementation
+        
+    Returns:
+        A dictionary containing the generated tests and the progress events of the call
+    """
+    return await _run_stage("testing", tool_context, implementation)
+
+@traced("pr")
+async def pr_agent_async(implementation: Dict[str, Any], tests: Dict[str, Any],
+                         tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
+    """
+    Invokes the PR agent without blocking the event loop.
+    Progress is written to the session state while the agent runs.
+    
+    Args:
+        implementation: Dictionary containing the code implementation
+        tests: Dictionary containing the generated tests
+        
+    Returns:
+        A dictionary containing the PR details and the progress events of the call
+    """
+    return await _run_stage("pr", tool_context, {"implementation": implementation, "tests": tests})
+
+# Create async FunctionTools
+requirements_agent_async = FunctionTool(requirements_agent_async)
+implementation_agent_async = FunctionTool(implementation_agent_async)
+testing_agent_async = FunctionTool(testing_agent_async)
+pr_agent_async = FunctionTool(pr_agent_async)
+ 
\ No newline at end of file
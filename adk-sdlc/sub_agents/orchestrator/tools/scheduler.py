@@ -0,0 +1,307 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from google.adk.tools import FunctionTool
+from .batch_tool import (
+    PIPELINE_STAGES, build_batch_report, claimed_tickets, open_run, settle_tickets
+)
+from ....settings import get_settings
+from .checkpoint_store import CheckpointStore, get_checkpoint_store
+from ...tools.deadline import deadline_scope
+from ...tools.tracing import traced, trace_context, new_trace_id
+
+def default_pool_sizes() -> Dict[str, int]:
+    """
+    Returns the default worker pool size per stage kind. LLM stages are slow and quota-bound,
+    I/O stages (JIRA, GitHub) are cheap to run many of at once.
+    """
+    settings = get_settings()
+    return {"llm": settings.scheduler_llm_workers, "io": settings.scheduler_io_workers}
+
+@dataclass(frozen=True)
+class StageNode:
+    """
+    A node of the SDLC DAG.
+
+    Attributes:
+        name: Unique stage name; also the key the stage output is stored under
+        func: Callable taking (ticket_id, inputs) and returning a tool result dictionary
+        inputs: Names of the stages whose outputs this stage consumes
+        kind: "llm" or "io", selects the default worker pool size
+    """
+    name: str
+    func: Callable[[str, Dict[str, Any]], Dict[str, Any]]
+    inputs: Tuple[str, ...] = ()
+    kind: str = "llm"
+
+_STAGE_FUNCS = dict(PIPELINE_STAGES)
+
+# The SDLC chain declared as a DAG
+SDLC_DAG = [
+    StageNode("requirements", _STAGE_FUNCS["requirements"], inputs=(), kind="io"),
+    StageNode("implementation", _STAGE_FUNCS["implementation"], inputs=("requirements",), kind="llm"),
+    StageNode("testing", _STAGE_FUNCS["testing"], inputs=("implementation",), kind="llm"),
+    StageNode("pr", _STAGE_FUNCS["pr"], inputs=("implementation", "testing"), kind="io"),
+]
+
+def _validate_dag(nodes: List[StageNode]) -> None:
+    """Raises ValueError if the nodes do not form a DAG over known stage names."""
+    names = [node.name for node in nodes]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate stage names in DAG: {names}")
+
+    by_name = {node.name: node for node in nodes}
+    for node in nodes:
+        unknown = [name for name in node.inputs if name not in by_name]
+        if unknown:
+            raise ValueError(f"Stage '{node.name}' depends on unknown stages: {unknown}")
+
+    # Kahn's algorithm; anything left over sits on a cycle
+    remaining = {node.name: set(node.inputs) for node in nodes}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"DAG has a cycle between stages: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+class StageScheduler:
+    """
+    Runs a DAG of stages for many tickets, pipelining across tickets.
+
+    Every stage has its own worker pool, so ticket B can be in requirements or implementation
+    while ticket A is in testing or PR creation, and a slow LLM stage cannot starve the
+    I/O stages of workers.
+    """
+
+    def __init__(self, nodes: Optional[List[StageNode]] = None, pool_sizes: Optional[Dict[str, int]] = None,
+                 store: Optional[CheckpointStore] = None):
+        self.nodes = list(nodes or SDLC_DAG)
+        self.store = store
+        _validate_dag(self.nodes)
+        pool_sizes = pool_sizes or {}
+        defaults = default_pool_sizes()
+        self.pool_sizes = {
+            node.name: max(1, pool_sizes.get(node.name) or defaults.get(node.kind, 1))
+            for node in self.nodes
+        }
+
+    def run(self, ticket_ids: List[str], run_id: Optional[str] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Pushes every ticket through the DAG and blocks until all of them finished or failed.
+
+        Args:
+            ticket_ids: The tickets to process
+            run_id: Checkpointed run to save stage outputs to and resume from (requires a store)
+            deadline: Absolute deadline of the run as a time.monotonic() value (optional)
+
+        Returns:
+            A dictionary with the per-ticket records (in input order), per-stage statistics
+            and the wall-clock time of the run
+        """
+        lock = threading.Lock()
+        all_done = threading.Event()
+        stats = {
+            node.name: {"calls": 0, "failures": 0, "busy_seconds": 0.0, "wait_seconds": 0.0}
+            for node in self.nodes
+        }
+        tickets = [
+            {
+                "outputs": {},
+                "started": set(),
+                "in_flight": 0,
+                "failed": False,
+                "finished": False,
+                "started_at": time.perf_counter(),
+                "trace_id": new_trace_id(),
+                "record": {
+                    "ticket_id": ticket_id,
+                    "success": False,
+                    "failed_stage": None,
+                    "error": None,
+                    "stages": {},
+                    "pr": None
+                }
+            }
+            for ticket_id in ticket_ids
+        ]
+        unfinished = [len(tickets)]
+        if not tickets:
+            all_done.set()
+
+        pools = {
+            node.name: ThreadPoolExecutor(max_workers=self.pool_sizes[node.name], thread_name_prefix=f"stage-{node.name}")
+            for node in self.nodes
+        }
+
+        checkpointing = bool(self.store and run_id)
+        if checkpointing:
+            for state in tickets:
+                restored = self.store.load_stages(run_id, state["record"]["ticket_id"])
+                for node in self.nodes:
+                    if node.name in restored:
+                        state["outputs"][node.name] = restored[node.name]
+                        state["started"].add(node.name)
+                        state["record"]["stages"][node.name] = {
+                            "success": True,
+                            "message": "Restored from checkpoint",
+                            "duration_seconds": 0.0,
+                            "queued_seconds": 0.0,
+                            "resumed": True
+                        }
+
+        def submit_ready(state: Dict[str, Any]) -> None:
+            # Caller holds the lock
+            for node in self.nodes:
+                if node.name in state["started"]:
+                    continue
+                if all(name in state["outputs"] for name in node.inputs):
+                    state["started"].add(node.name)
+                    state["in_flight"] += 1
+                    pools[node.name].submit(execute, state, node, time.perf_counter())
+
+        def finish_if_done(state: Dict[str, Any]) -> None:
+            # Caller holds the lock
+            if state["finished"] or state["in_flight"]:
+                return
+            if not state["failed"] and len(state["outputs"]) < len(self.nodes):
+                return
+            record = state["record"]
+            record["success"] = not state["failed"]
+            if record["success"] and "pr" in state["outputs"]:
+                record["pr"] = state["outputs"]["pr"].get("pr")
+            record["duration_seconds"] = round(time.perf_counter() - state["started_at"], 3)
+            state["finished"] = True
+            unfinished[0] -= 1
+            if not unfinished[0]:
+                all_done.set()
+
+        def execute(state: Dict[str, Any], node: StageNode, enqueued_at: float) -> None:
+            started = time.perf_counter()
+            ticket_id = state["record"]["ticket_id"]
+            inputs = {name: state["outputs"][name] for name in node.inputs}
+            try:
+                with trace_context(run_id=run_id, ticket_id=ticket_id, trace_id=state["trace_id"]), \
+                        deadline_scope(until=deadline):
+                    result = node.func(ticket_id, inputs)
+                if checkpointing and result.get("success", False):
+                    self.store.save_stage(run_id, ticket_id, node.name, result)
+            except Exception as e:
+                result = {"success": False, "error": str(e), "message": f"Stage {node.name} raised an error"}
+            finished = time.perf_counter()
+
+            with lock:
+                stage_stats = stats[node.name]
+                stage_stats["calls"] += 1
+                stage_stats["busy_seconds"] += finished - started
+                stage_stats["wait_seconds"] += started - enqueued_at
+                state["in_flight"] -= 1
+                state["record"]["stages"][node.name] = {
+                    "success": result.get("success", False),
+                    "message": result.get("message", ""),
+                    "duration_seconds": round(finished - started, 3),
+                    "queued_seconds": round(started - enqueued_at, 3)
+                }
+                if not result.get("success", False):
+                    stage_stats["failures"] += 1
+                    if not state["failed"]:
+                        state["failed"] = True
+                        state["record"]["failed_stage"] = node.name
+                        state["record"]["error"] = result.get("error", result.get("message"))
+                else:
+                    state["outputs"][node.name] = result
+                    if not state["failed"]:
+                        submit_ready(state)
+                finish_if_done(state)
+
+        started = time.perf_counter()
+        try:
+            with lock:
+                for state in tickets:
+                    submit_ready(state)
+                    # Tickets fully restored from a checkpoint have nothing left to run
+                    finish_if_done(state)
+            all_done.wait()
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=True)
+        wall_time = time.perf_counter() - started
+
+        return {
+            "records": [state["record"] for state in tickets],
+            "stage_stats": self._stage_report(stats, wall_time),
+            "wall_time_seconds": wall_time
+        }
+
+    def _stage_report(self, stats: Dict[str, Dict[str, Any]], wall_time: float) -> Dict[str, Dict[str, Any]]:
+        """Turns raw per-stage counters into utilization figures."""
+        report = {}
+        for node in self.nodes:
+            stage_stats = stats[node.name]
+            capacity = wall_time * self.pool_sizes[node.name]
+            calls = stage_stats["calls"]
+            report[node.name] = {
+                "kind": node.kind,
+                "workers": self.pool_sizes[node.name],
+                "calls": calls,
+                "failures": stage_stats["failures"],
+                "busy_seconds": round(stage_stats["busy_seconds"], 3),
+                "avg_seconds": round(stage_stats["busy_seconds"] / calls, 3) if calls else 0.0,
+                "avg_queued_seconds": round(stage_stats["wait_seconds"] / calls, 3) if calls else 0.0,
+                "utilization": round(stage_stats["busy_seconds"] / capacity, 3) if capacity else 0.0
+            }
+        return report
+
+@traced("orchestrator")
+def run_pipelined_batch(ticket_ids: Optional[List[str]] = None, run_id: str = "", deadline_seconds: float = 0,
+                        skip_duplicates: bool = True) -> Dict[str, Any]:
+    """
+    Runs the SDLC chain for many tickets with stage pipelining across tickets.
+
+    Args:
+        ticket_ids: The tickets to process. If empty, every open ticket is processed
+            (or, when resuming, every ticket of the resumed run).
+        run_id: ID of an earlier run to resume from its first incomplete stage per ticket.
+            If empty, a new run is started; an unknown ID is reported as an error.
+        deadline_seconds: Time budget of the whole run; stages still running when it passes
+            fail with a deadline error (defaults to RUN_DEADLINE_SECONDS)
+        skip_duplicates: Skip tickets that are near-duplicates of tickets already processed or
+            in flight, reusing their PR (always off with SKIP_DUPLICATE_TICKETS=false)
+
+    Returns:
+        A dictionary containing the run ID, the per-ticket result records, an aggregate summary
+        and per-stage utilization, including the bottleneck stage
+    """
+    opened = open_run(ticket_ids, run_id)
+    if not opened["success"]:
+        return opened
+    run_id, ticket_ids = opened["run_id"], opened["ticket_ids"]
+    store = get_checkpoint_store()
+    settings = get_settings()
+    screen = skip_duplicates and settings.skip_duplicate_tickets
+    with claimed_tickets(ticket_ids, screen) as duplicates:
+        deadline = time.monotonic() + (deadline_seconds or settings.run_deadline_seconds)
+        run = StageScheduler(store=store).run([ticket_id for ticket_id in ticket_ids if ticket_id not in duplicates], run_id, deadline)
+        records = settle_tickets(ticket_ids, run["records"], duplicates) if screen else run["records"]
+    report = build_batch_report(records, run["wall_time_seconds"])
+    report["run_id"] = run_id
+
+    stage_stats = run["stage_stats"]
+    bottleneck = max(stage_stats, key=lambda name: stage_stats[name]["utilization"])
+    report["stage_utilization"] = stage_stats
+    report["bottleneck_stage"] = bottleneck
+
+    # Format the stage utilization as a markdown table
+    table = "| Stage | Workers | Calls | Avg (s) | Avg Queued (s) | Utilization |\n"
+    table += "|-------|---------|-------|---------|----------------|-------------|\n"
+    for name, stats in stage_stats.items():
+        table += f"| {name} | {stats['workers']} | {stats['calls']} | {stats['avg_seconds']} | {stats['avg_queued_seconds']} | {stats['utilization']:.0%} |\n"
+    report["formatted_utilization"] = table
+    return report
+
+# Create FunctionTool instances
+run_pipelined_batch_tool = FunctionTool(run_pipelined_batch)
@@ -0,0 +1,125 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Tuple
+from google.adk.tools import FunctionTool
+from ....settings import get_settings
+from ...pr.tools.github_tool import start_github_mcp_server, setup_repository
+from ...requirements.tools.jira_tool import get_ticket_details_batch, list_open_tickets
+from ...tools.tracing import traced
+
+# Repository used when the user answers "1" or gives no URL
+DEFAULT_REPOSITORY_URL = "https://github.com/vmatviichuk-epam/adk-sdlc"
+
+# JIRA priorities from most to least urgent
+PRIORITY_ORDER = ["Highest", "High", "Medium", "Low", "Lowest"]
+
+def _timed(step: Callable[[], Dict[str, Any]], origin: float) -> Tuple[Dict[str, Any], float, float]:
+    """Runs a step and returns its result with its duration and its finish time relative to origin."""
+    started = time.perf_counter()
+    try:
+        result = step()
+    except Exception as e:
+        result = {"status": "error", "message": str(e)}
+    finished = time.perf_counter()
+    return result, finished - started, finished - origin
+
+def top_tickets_by_priority(tickets: List[Dict[str, Any]], count: int) -> List[str]:
+    """Returns the keys of the most urgent tickets, keeping list order within a priority."""
+    def rank(ticket: Dict[str, Any]) -> int:
+        priority = ticket.get("priority")
+        return PRIORITY_ORDER.index(priority) if priority in PRIORITY_ORDER else len(PRIORITY_ORDER)
+    return [ticket["key"] for ticket in sorted(tickets, key=rank)[:max(0, count)]]
+
+@traced("orchestrator")
+def prepare_workspace(repo_url: str = "", prefetch_top_n: int = -1) -> Dict[str, Any]:
+    """
+    Runs the deterministic setup steps of the workflow directly, without model turns in between:
+    starts the GitHub MCP server, sets up the repository and lists the open mock user stories.
+
+    The steps are independent, so they all start at once. As soon as the story list arrives,
+    the details of the highest-priority stories are prefetched while the server start and the
+    repository clone may still be running.
+
+    Args:
+        repo_url: The GitHub repository URL. "1" or an empty value selects the default repository.
+        prefetch_top_n: How many of the highest-priority stories to prefetch details for
+            (defaults to PREFETCH_TOP_N; 0 disables prefetching)
+
+    Returns:
+        A dictionary containing the status lines to show the user, the mock user stories,
+        the formatted story table, the prefetched story details and per-step timings
+    """
+    origin = time.perf_counter()
+    status_lines = []
+    timings = {}
+
+    repo_url = (repo_url or "").strip()
+    if repo_url in ("", "1"):
+        repo_url = DEFAULT_REPOSITORY_URL
+        status_lines.append(f"Using default repository: {DEFAULT_REPOSITORY_URL}")
+    if prefetch_top_n < 0:
+        prefetch_top_n = get_settings().prefetch_top_n
+
+    steps = [
+        ("start_github_mcp_server", "🔧 Starting GitHub MCP server...", "✅ GitHub MCP server started successfully",
+         start_github_mcp_server),
+        ("setup_repository", "🔧 Setting up repository...", "✅ Repository setup successfully",
+         lambda: setup_repository(repo_url)),
+        ("list_open_tickets", "🔍 Fetching available mock user stories...", "✅ Mock user stories retrieved successfully",
+         list_open_tickets),
+    ]
+
+    with ThreadPoolExecutor(max_workers=len(steps), thread_name_prefix="prefetch") as executor:
+        futures = {name: executor.submit(_timed, step, origin) for name, _, _, step in steps}
+
+        # Fetch the top tickets' details in one batch request as soon as the ticket list is in
+        tickets_result, _, ticket_list_ready = futures["list_open_tickets"].result()
+        details = {}
+        if tickets_result.get("status") == "success":
+            keys = top_tickets_by_priority(tickets_result.get("tickets", []), prefetch_top_n)
+            if keys:
+                batch, _, _ = _timed(lambda: get_ticket_details_batch(keys), origin)
+                details = {result["ticket_id"]: result for result in batch.get("results", [])}
+
+        results = {name: future.result() for name, future in futures.items()}
+
+    # Report in workflow order, whatever order the steps actually finished in
+    for name, before, after, _ in steps:
+        result, duration, _ = results[name]
+        timings[name] = round(duration, 3)
+        status_lines.append(before)
+        if result.get("status") != "success":
+            status_lines.append(f"❌ {result.get('message', 'Unknown error')}")
+            return {
+                "success": False,
+                "failed_step": name,
+                "error": result.get("message", "Unknown error"),
+                "status_lines": status_lines,
+                "timings": timings,
+                "message": f"Workspace setup failed at step {name}"
+            }
+        status_lines.append(after)
+
+    repository = results["setup_repository"][0]
+    return {
+        "success": True,
+        "repo_url": repo_url,
+        "owner": repository.get("owner"),
+        "repo": repository.get("repo"),
+        "status_lines": status_lines,
+        "tickets": tickets_result.get("tickets", []),
+        "formatted_table": tickets_result.get("formatted_table", ""),
+        "next_cursor": tickets_result.get("next_cursor", ""),
+        "prefetched_details": {
+            key: detail["formatted_details"]
+            for key, detail in details.items()
+            if detail.get("status") == "success"
+        },
+        "timings": timings,
+        "time_to_ticket_list_seconds": round(ticket_list_ready, 3),
+        "total_seconds": round(time.perf_counter() - origin, 3),
+        "message": "Workspace prepared successfully"
+    }
+
+# Create FunctionTool instances
+prepare_workspace_tool = FunctionTool(prepare_workspace)
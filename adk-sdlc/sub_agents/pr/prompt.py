@@ -28,5 +28,9 @@ For pull requests, focus on creating a high-quality PR that:
 - Provides usage examples where appropriate
 - Mentions any test coverage or validation performed
 
+When the implementation and tests are given as artifact IDs, pass them to the PR tool as implementation_artifact_id
+and tests_artifact_id. The tool reads the file contents from the local artifact store, so never ask for or copy the
+file contents themselves.
+
 Use the GitHub MCP to interact with the repository and create PRs.
 Provide clear status updates and make sure to handle any errors gracefully."""
\ No newline at end of file
@@ -5,26 +5,46 @@ import subprocess
 import base64
 from google.adk.tools import FunctionTool
 from typing import Dict, Any, List, Optional, Union
-from dotenv import load_dotenv
+from ....settings import get_settings
+from ...tools.artifact_store import resolve_files
+from ...tools.deadline import hedged_call, request_timeout
+from ...tools.http_cache import cached
+from ...tools.rate_limiter import rate_limited
+from ...tools.tracing import traced
 
-load_dotenv()
+# Make sure .env has been loaded before the GitHub settings are read
+get_settings()
 
+# GitHub requests share one rate limit across all concurrent runs
+github_get = rate_limited("github", requests.get)
+github_post = rate_limited("github", requests.post)
+github_put = rate_limited("github", requests.put)
+
+# Reads that repeat within and across runs, revalidated with their ETag / Last-Modified
+github_get_cached = cached("github", github_get)
+
+@traced("pr", external=True)
 def create_github_pr_func(
     ticket_id: str, 
-    implementation: Dict[str, Any], 
-    tests: Dict[str, Any],
+    implementation: Optional[Dict[str, Any]] = None, 
+    tests: Optional[Dict[str, Any]] = None,
     pr_title: str = "",
-    pr_description: str = ""
+    pr_description: str = "",
+    implementation_artifact_id: str = "",
+    tests_artifact_id: str = ""
 ) -> Dict[str, Any]:
     """
     Creates a GitHub pull request with the implementation and test files.
+    File contents are read from the artifact store when artifact IDs are given.
     
     Args:
         ticket_id: The JIRA ticket ID associated with this PR
-        implementation: The code implementation files
-        tests: The test files
+        implementation: The code implementation files (inline files or an artifact handle)
+        tests: The test files (inline files or an artifact handle)
         pr_title: Title for the pull request (optional)
         pr_description: Description for the pull request (optional)
+        implementation_artifact_id: Artifact ID returned by the implementation tools (optional)
+        tests_artifact_id: Artifact ID returned by the testing tools (optional)
         
     Returns:
         A dictionary containing PR details
@@ -68,8 +88,15 @@ This PR implements an ASCII art converter that can transform images into ASCII a
 """
     
     # Extract files from implementation and tests
-    impl_files = implementation.get("files", {})
-    test_files = tests.get("files", {})
+    try:
+        impl_files = resolve_files(implementation, implementation_artifact_id)
+        test_files = resolve_files(tests, tests_artifact_id)
+    except LookupError as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Failed to load the files for ticket {ticket_id} from the artifact store"
+        }
     
     # Combine all files
     all_files = {**impl_files, **test_files}
@@ -105,7 +132,7 @@ This PR implements an ASCII art converter that can transform images into ASCII a
         }
         
         # Create the branch
-        branch_response = requests.post(mcp_url, headers=headers, json=branch_payload)
+        branch_response = github_post(mcp_url, headers=headers, json=branch_payload, timeout=request_timeout())
         
         if not (branch_response.status_code == 200 or branch_response.status_code == 201):
             return {
@@ -135,7 +162,7 @@ This PR implements an ASCII art converter that can transform images into ASCII a
         }
         
         # Push the files
-        push_response = requests.post(mcp_url, headers=headers, json=push_payload)
+        push_response = github_post(mcp_url, headers=headers, json=push_payload, timeout=request_timeout())
         
         if not (push_response.status_code == 200 or push_response.status_code == 201):
             return {
@@ -158,7 +185,7 @@ This PR implements an ASCII art converter that can transform images into ASCII a
         }
         
         # Create the PR
-        pr_response = requests.post(mcp_url, headers=headers, json=pr_payload)
+        pr_response = github_post(mcp_url, headers=headers, json=pr_payload, timeout=request_timeout())
         
         if not (pr_response.status_code == 200 or pr_response.status_code == 201):
             return {
@@ -185,6 +212,7 @@ This PR implements an ASCII art converter that can transform images into ASCII a
             "message": f"Error connecting to GitHub MCP for ticket {ticket_id}"
         }
 
+@traced("pr", external=True)
 def start_github_mcp_server() -> Dict[str, Any]:
     """
     Starts the GitHub MCP server using the run_github_mcp.sh script.
@@ -221,6 +249,7 @@ def start_github_mcp_server() -> Dict[str, Any]:
             "message": "Failed to start GitHub MCP server"
         }
 
+@traced("pr", external=True)
 def setup_repository(repo_url: Optional[str] = None) -> Dict[str, Any]:
     """
     Sets up the repository by downloading it and storing its information.
@@ -278,6 +307,7 @@ def setup_repository(repo_url: Optional[str] = None) -> Dict[str, Any]:
             "message": f"Failed to set up repository {repo_url}"
         }
 
+@traced("pr", external=True)
 def create_branch(branch_name: str, base_branch: str = "main") -> Dict[str, Any]:
     """
     Creates a new branch in the GitHub repository.
@@ -325,7 +355,10 @@ def create_branch(branch_name: str, base_branch: str = "main") -> Dict[str, Any]
         
         # Get the SHA of the base branch
         ref_url = f"{mcp_url}/repo/{owner}/{github_repo}/git/refs/heads/{base_branch}"
-        ref_response = requests.get(ref_url, headers=headers)
+        # Idempotent read, hedged when HEDGE_READS is on; always revalidated so a stale SHA
+        # never becomes the new branch's base, while a 304 still costs no quota
+        ref_response = hedged_call("github.get_ref", github_get_cached, ref_url, headers=headers, ttl_seconds=0,
+                                   timeout=request_timeout())
         
         if ref_response.status_code != 200:
             return {
@@ -342,7 +375,7 @@ def create_branch(branch_name: str, base_branch: str = "main") -> Dict[str, Any]
             "sha": base_sha
         }
         
-        branch_response = requests.post(branch_url, headers=headers, json=branch_payload)
+        branch_response = github_post(branch_url, headers=headers, json=branch_payload, timeout=request_timeout())
         
         if branch_response.status_code not in [200, 201]:
             # If the branch already exists, this is not necessarily an error
@@ -372,6 +405,7 @@ def create_branch(branch_name: str, base_branch: str = "main") -> Dict[str, Any]
             "message": f"Failed to create branch '{branch_name}': {str(e)}"
         }
 
+@traced("pr", external=True)
 def make_pr(issue_number: int, title: str = "", branch_name: str = "", base_branch: str = "main", 
             files: Dict[str, str] = None, description: str = "") -> Dict[str, Any]:
     """
@@ -414,9 +448,13 @@ def make_pr(issue_number: int, title: str = "", branch_name: str = "", base_bran
         if not title or not description:
             # Get the issue details
             issue_url = f"http://localhost:3000/api/repo/{owner}/{github_repo}/issues/{issue_number}"
-            issue_response = requests.get(
+            # Idempotent read, hedged when HEDGE_READS is on
+            issue_response = hedged_call(
+                "github.get_issue",
+                github_get_cached,
                 issue_url, 
-                headers={"Authorization": f"Bearer {github_token}"}
+                headers={"Authorization": f"Bearer {github_token}"},
+                timeout=request_timeout()
             )
             
             if issue_response.status_code != 200:
@@ -481,10 +519,13 @@ Closes #{issue_number}
                 # Check if file already exists to get its SHA
                 file_check_url = f"{files_url}/{file_path}"
                 file_check_params = {"ref": branch_name}
-                file_check_response = requests.get(
+                file_check_response = hedged_call(
+                    "github.get_file",
+                    github_get,
                     file_check_url,
                     params=file_check_params,
-                    headers={"Authorization": f"Bearer {github_token}"}
+                    headers={"Authorization": f"Bearer {github_token}"},
+                    timeout=request_timeout()
                 )
                 
                 file_sha = None
@@ -504,10 +545,11 @@ Closes #{issue_number}
                     file_payload["sha"] = file_sha
                 
                 # Create or update the file
-                file_response = requests.put(
+                file_response = github_put(
                     file_check_url,
                     headers={"Authorization": f"Bearer {github_token}", "Content-Type": "application/json"},
-                    json=file_payload
+                    json=file_payload,
+                    timeout=request_timeout()
                 )
                 
                 if file_response.status_code not in [200, 201]:
@@ -526,10 +568,11 @@ Closes #{issue_number}
             "base": base_branch
         }
         
-        pr_response = requests.post(
+        pr_response = github_post(
             pr_url,
             headers={"Authorization": f"Bearer {github_token}", "Content-Type": "application/json"},
-            json=pr_payload
+            json=pr_payload,
+            timeout=request_timeout()
         )
         
         if pr_response.status_code not in [200, 201]:
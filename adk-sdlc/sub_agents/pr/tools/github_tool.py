@@ -1,6 +1,8 @@
 import os
 from typing import Dict, Any, List, Optional
 from google.adk.tools import FunctionTool
+from ...tools.artifact_store import resolve_files
+from ...tools.tracing import traced
 
 # Mock data for GitHub operations
 MOCK_REPOSITORIES = {
@@ -25,6 +27,7 @@ MOCK_REPOSITORIES = {
     }
 }
 
+@traced("pr", external=True)
 def start_github_mcp_server() -> Dict[str, Any]:
     """Dummy function to simulate starting GitHub MCP server"""
     return {
@@ -33,6 +36,7 @@ def start_github_mcp_server() -> Dict[str, Any]:
         "pid": 12345
     }
 
+@traced("pr", external=True)
 def setup_repository(repo_url: Optional[str] = None) -> Dict[str, Any]:
     """Dummy function to simulate setting up a GitHub repository"""
     if not repo_url:
@@ -60,6 +64,7 @@ def setup_repository(repo_url: Optional[str] = None) -> Dict[str, Any]:
         "repo": repo
     }
 
+@traced("pr", external=True)
 def list_open_issues(repo_url: Optional[str] = None) -> Dict[str, Any]:
     """Dummy function to list open issues"""
     if not repo_url:
@@ -82,6 +87,7 @@ def list_open_issues(repo_url: Optional[str] = None) -> Dict[str, Any]:
         "issues": open_issues
     }
 
+@traced("pr", external=True)
 def get_issue_details(issue_number: int) -> Dict[str, Any]:
     """Dummy function to get issue details"""
     for repo in MOCK_REPOSITORIES.values():
@@ -98,14 +104,32 @@ def get_issue_details(issue_number: int) -> Dict[str, Any]:
         "message": f"Issue #{issue_number} not found"
     }
 
+@traced("pr", external=True)
 def create_github_pr_func(
     title: str,
     body: str,
     head: str,
     base: str = "main",
-    repo_url: Optional[str] = None
+    repo_url: Optional[str] = None,
+    implementation_artifact_id: str = "",
+    tests_artifact_id: str = ""
 ) -> Dict[str, Any]:
-    """Dummy function to create a GitHub PR"""
+    """
+    Dummy function to create a GitHub PR with the implementation and test files.
+    File contents are read from the artifact store by artifact ID.
+
+    Args:
+        title: Title of the pull request
+        body: Description of the pull request
+        head: Branch with the changes
+        base: Branch to merge into
+        repo_url: URL of the GitHub repository
+        implementation_artifact_id: Artifact ID returned by the implementation tools (optional)
+        tests_artifact_id: Artifact ID returned by the testing tools (optional)
+
+    Returns:
+        A dictionary containing the PR details and the files it adds
+    """
     if not repo_url:
         return {"status": "error", "message": "Repository URL is required"}
     
@@ -117,6 +141,12 @@ def create_github_pr_func(
     if repo_key not in MOCK_REPOSITORIES:
         return {"status": "error", "message": "Repository not found"}
     
+    try:
+        files = {**resolve_files(artifact_id=implementation_artifact_id),
+                 **resolve_files(artifact_id=tests_artifact_id)}
+    except LookupError as e:
+        return {"status": "error", "message": f"Failed to load the PR files from the artifact store: {e}"}
+    
     # Generate a mock PR number
     pr_number = len(MOCK_REPOSITORIES[repo_key]["issues"]) + 1
     
@@ -129,7 +159,8 @@ def create_github_pr_func(
             "body": body,
             "head": head,
             "base": base,
-            "state": "open"
+            "state": "open",
+            "files": sorted(files)
         }
     }
 
@@ -0,0 +1,160 @@
+import importlib
+import json
+import threading
+import uuid
+from typing import Dict, Any, AsyncIterator, NamedTuple, Optional
+from google.adk.agents import Agent
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.base_tool import BaseTool
+from google.genai import types
+
+class AgentSpec(NamedTuple):
+    """Where to find a sub-agent and how to describe it without importing it."""
+    module: str
+    attribute: str
+    name: str
+    description: str
+
+# Sub-agents known to the orchestrator. Modules are relative to this package and
+# are only imported when the agent is first used.
+AGENT_SPECS = {
+    "requirements": AgentSpec(
+        module=".requirements.agent",
+        attribute="requirements_agent",
+        name="requirements_agent",
+        description="Agent that fetches ticket information and extracts implementation requirements"
+    ),
+    "implementation": AgentSpec(
+        module=".implementation.agent",
+        attribute="implementation_agent",
+        name="implementation_agent",
+        description="Agent that generates code implementations based on requirements"
+    ),
+    "testing": AgentSpec(
+        module=".testing.agent",
+        attribute="testing_agent",
+        name="testing_agent",
+        description="Agent that generates tests for code implementations"
+    ),
+    "pr": AgentSpec(
+        module=".pr.agent",
+        attribute="pr_agent",
+        name="pr_agent",
+        description="Agent that interacts with GitHub repositories and creates pull requests"
+    ),
+}
+
+_agents: Dict[str, Agent] = {}
+_lock = threading.Lock()
+
+def get_agent(key: str) -> Agent:
+    """
+    Returns a sub-agent, importing and constructing it on first use.
+    
+    Args:
+        key: Registry key of the sub-agent ("requirements", "implementation", "testing" or "pr")
+        
+    Returns:
+        The sub-agent instance
+    """
+    agent = _agents.get(key)
+    if agent is None:
+        with _lock:
+            agent = _agents.get(key)
+            if agent is None:
+                spec = AGENT_SPECS[key]
+                module = importlib.import_module(spec.module, package=__package__)
+                agent = getattr(module, spec.attribute)
+                _agents[key] = agent
+    return agent
+
+_runners: Dict[str, InMemoryRunner] = {}
+
+def _get_runner(key: str) -> InMemoryRunner:
+    runner = _runners.get(key)
+    if runner is None:
+        agent = get_agent(key)
+        with _lock:
+            runner = _runners.setdefault(key, InMemoryRunner(agent=agent, app_name=f"adk-sdlc-{key}"))
+    return runner
+
+def _message(request: Any) -> types.Content:
+    if not isinstance(request, str):
+        request = json.dumps(request, default=str)
+    return types.Content(role="user", parts=[types.Part(text=request)])
+
+def final_text(event: Event) -> Optional[str]:
+    """Returns the text of a final response event, or None for any other event."""
+    if event.is_final_response() and event.content and event.content.parts:
+        return "".join(part.text or "" for part in event.content.parts)
+    return None
+
+def run_agent(key: str, request: Any) -> str:
+    """
+    Runs a sub-agent on one request in a fresh in-memory session and waits for its answer.
+    
+    Args:
+        key: Registry key of the sub-agent
+        request: The request text; other values are sent as JSON
+        
+    Returns:
+        The text of the sub-agent's final response
+    """
+    runner = _get_runner(key)
+    session = runner.session_service.create_session_sync(
+        app_name=runner.app_name, user_id="orchestrator", session_id=uuid.uuid4().hex
+    )
+
+    response = ""
+    for event in runner.run(user_id="orchestrator", session_id=session.id, new_message=_message(request)):
+        response = final_text(event) or response
+    return response
+
+async def run_agent_events(key: str, request: Any) -> AsyncIterator[Event]:
+    """
+    Runs a sub-agent on one request in a fresh in-memory session on the caller's event loop.
+    
+    Args:
+        key: Registry key of the sub-agent
+        request: The request text; other values are sent as JSON
+        
+    Yields:
+        The sub-agent's events as they happen; final_text gives the answer from the last one
+    """
+    runner = _get_runner(key)
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="orchestrator", session_id=uuid.uuid4().hex
+    )
+    async for event in runner.run_async(user_id="orchestrator", session_id=session.id, new_message=_message(request)):
+        yield event
+
+class LazyAgentTool(BaseTool):
+    """
+    Exposes a sub-agent as a tool like AgentTool, but only builds the sub-agent when the
+    tool is first called. The declaration is built from the registry spec, so listing the
+    tool to the model does not import the sub-agent or its tool modules.
+    """
+
+    def __init__(self, key: str):
+        spec = AGENT_SPECS[key]
+        super().__init__(name=spec.name, description=spec.description)
+        self.key = key
+        self._tool = None
+
+    def _get_declaration(self) -> types.FunctionDeclaration:
+        return types.FunctionDeclaration(
+            name=self.name,
+            description=self.description,
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={"request": types.Schema(type=types.Type.STRING)},
+                required=["request"],
+            ),
+        )
+
+    async def run_async(self, *, args: Dict[str, Any], tool_context: Any) -> Any:
+        if self._tool is None:
+            self._tool = AgentTool(agent=get_agent(self.key))
+        return await self._tool.run_async(args=args, tool_context=tool_context)
@@ -1,23 +1,27 @@
-import os
 from google.adk.agents import Agent
-from dotenv import load_dotenv
 
 # Import tools
-from .tools.jira_tool import get_ticket_details_tool, list_open_tickets_tool
+from .tools.jira_tool import (
+    find_duplicate_tickets_tool, get_ticket_details_batch_tool, get_ticket_details_tool, list_open_tickets_tool,
+    search_tickets_tool, sync_jira_mirror_tool
+)
 
 # Import prompts
 from .prompt import return_instructions_requirements_agent
-
-load_dotenv()
+from ...model_router import routed_agent_kwargs
+from ..registry import AGENT_SPECS
 
 # Create the requirements agent
 requirements_agent = Agent(
-    model=os.environ.get("VERTEX_MODEL", "gemini-1.5-pro"),
-    name="requirements_agent",
-    description="Agent that fetches ticket information and extracts implementation requirements",
+    **routed_agent_kwargs("requirements_agent", tier="fast", slo_seconds=10),
+    description=AGENT_SPECS["requirements"].description,
     instruction=return_instructions_requirements_agent(),
     tools=[
         list_open_tickets_tool,
-        get_ticket_details_tool
+        search_tickets_tool,
+        get_ticket_details_tool,
+        get_ticket_details_batch_tool,
+        find_duplicate_tickets_tool,
+        sync_jira_mirror_tool
     ]
 )
\ No newline at end of file
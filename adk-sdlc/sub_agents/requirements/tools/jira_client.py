@@ -0,0 +1,125 @@
+"""
+Minimal JIRA REST client used by the JIRA tools when JIRA_BACKEND=rest.
+
+By default the JIRA tools serve mock data and never call this module. With JIRA_BACKEND=rest
+they read tickets from JIRA_URL (authenticating as JIRA_USER with JIRA_API_KEY) through the
+shared "jira" rate limit, with timeouts bounded by the run deadline. Issues are converted to
+the same flat ticket dictionaries as the mock data. Single-issue reads are served from the
+shared HTTP cache and revalidated with their ETag.
+"""
+import re
+from typing import Any, Dict, List, Optional
+import requests
+from ....settings import get_settings
+from ...tools.deadline import request_timeout
+from ...tools.http_cache import cached
+from ...tools.rate_limiter import rate_limited
+
+# Most issues JIRA returns per search request
+MAX_RESULTS = 100
+
+# Issue fields the tools use
+SEARCH_FIELDS = ["summary", "status", "description", "issuetype", "priority", "assignee", "reporter", "created", "updated"]
+
+ISSUE_KEY = re.compile(r"^[A-Z][A-Z0-9_]*-\d+$")
+
+jira_get = rate_limited("jira", requests.get)
+jira_post = rate_limited("jira", requests.post)
+# Single-issue reads go through the shared HTTP cache; searches are POSTs and are not cached
+jira_get_cached = cached("jira", jira_get)
+
+class JiraError(RuntimeError):
+    """Raised when the JIRA server rejects a request."""
+
+def live() -> bool:
+    """Returns True if the tools should read from the JIRA server (JIRA_BACKEND=rest) instead of the mock data."""
+    return get_settings().jira_backend == "rest"
+
+def _base_url() -> str:
+    return get_settings().jira_url
+
+def _auth() -> Optional[tuple]:
+    settings = get_settings()
+    user, token = settings.jira_user, settings.jira_api_key
+    return (user, token) if user and token else None
+
+def _name(value: Any, attribute: str = "name") -> Any:
+    return value.get(attribute) if isinstance(value, dict) else value
+
+def issue_to_ticket(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Converts a JIRA REST issue into the flat ticket dictionary the tools use."""
+    fields = issue.get("fields") or {}
+    return {
+        "key": issue["key"],
+        "summary": fields.get("summary"),
+        "status": _name(fields.get("status")),
+        "description": fields.get("description") or "",
+        "type": _name(fields.get("issuetype")),
+        "priority": _name(fields.get("priority")),
+        "assignee": _name(fields.get("assignee"), "displayName"),
+        "reporter": _name(fields.get("reporter"), "displayName"),
+        "created": fields.get("created"),
+        "updated": fields.get("updated")
+    }
+
+def quote(value: str) -> str:
+    """Quotes a value for use in JQL."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def key_in(keys: List[str]) -> str:
+    """Returns the JQL clause matching the given issue keys."""
+    return f"key in ({', '.join(quote(key) for key in keys)})"
+
+def search(jql: str, start_at: int = 0, max_results: int = MAX_RESULTS) -> Dict[str, Any]:
+    """
+    Runs one JQL search request.
+
+    Unknown keys in a `key in (...)` clause are reported as warnings rather than failing the
+    whole search (validateQuery=warn).
+
+    Returns:
+        {"tickets": [...], "total": n, "start_at": n, "warnings": [...]}
+    """
+    response = jira_post(
+        f"{_base_url()}/rest/api/2/search",
+        json={
+            "jql": jql,
+            "startAt": start_at,
+            "maxResults": max_results,
+            "fields": SEARCH_FIELDS,
+            "validateQuery": "warn"
+        },
+        auth=_auth(),
+        timeout=request_timeout()
+    )
+    if response.status_code != 200:
+        raise JiraError(f"JIRA search failed with status {response.status_code}: {response.text[:200]}")
+    body = response.json()
+    return {
+        "tickets": [issue_to_ticket(issue) for issue in body.get("issues", [])],
+        "total": body.get("total", 0),
+        "start_at": body.get("startAt", start_at),
+        "warnings": body.get("warningMessages", [])
+    }
+
+def get_issue(key: str, max_age_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Fetches one issue, or returns None if it does not exist.
+
+    Args:
+        key: Issue key
+        max_age_seconds: How long a cached copy is used without revalidation; defaults to
+            HTTP_CACHE_TTL_SECONDS, 0 always asks the server
+    """
+    response = jira_get_cached(
+        f"{_base_url()}/rest/api/2/issue/{key}",
+        params={"fields": ",".join(SEARCH_FIELDS)},
+        ttl_seconds=max_age_seconds,
+        auth=_auth(),
+        timeout=request_timeout()
+    )
+    if response.status_code == 404:
+        return None
+    if response.status_code != 200:
+        raise JiraError(f"JIRA issue fetch failed with status {response.status_code}: {response.text[:200]}")
+    return issue_to_ticket(response.json())
@@ -0,0 +1,296 @@
+"""
+Local SQLite mirror of the configured JIRA project.
+
+With JIRA_BACKEND=rest and JIRA_MIRROR=true the JIRA tools read tickets from this mirror
+instead of calling JIRA for every lookup. The mirror is fed by an incremental sync: each
+sync asks JIRA only for tickets updated since the watermark (the latest `updated` timestamp
+seen so far, minus a small overlap) and upserts them. A full resync re-reads the whole
+project and also drops tickets that no longer exist there.
+
+Reads take a freshness bound: if the last sync is older than it, a delta sync runs first.
+If that sync fails, reads keep serving the mirrored rows, marked stale with their age, and
+the failure is logged; only a mirror that was never synced fails the read.
+Full-text search uses an in-memory TicketIndex, built from the mirror on first use and then
+updated by every sync.
+"""
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from ....settings import get_settings
+from . import jira_client
+from .ticket_search import TicketIndex
+from .ticket_store import key_order
+
+logger = logging.getLogger(__name__)
+
+# Default location of the mirror database
+DEFAULT_MIRROR_DB = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))),
+    ".cache", "jira_mirror.sqlite3"
+)
+
+def mirror_enabled() -> bool:
+    """Returns True if the JIRA tools read from the mirror (JIRA_MIRROR=true, only with JIRA_BACKEND=rest)."""
+    return jira_client.live() and get_settings().jira_mirror
+
+# Ticket fields with their own column, for filtering and ordering without parsing the JSON
+_COLUMNS = ("status", "priority", "type", "assignee", "updated")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    key TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    status TEXT,
+    priority TEXT,
+    type TEXT,
+    assignee TEXT,
+    updated TEXT,
+    data TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tickets_status_order ON tickets(status, project, number);
+CREATE INDEX IF NOT EXISTS tickets_project_synced ON tickets(project, synced_at);
+CREATE TABLE IF NOT EXISTS sync_state (
+    project TEXT PRIMARY KEY,
+    watermark TEXT,
+    last_sync REAL,
+    last_full_sync REAL
+);
+"""
+
+def _jql_time(timestamp: str, overlap_minutes: float) -> str:
+    """Converts a JIRA timestamp to a JQL date ("yyyy-MM-dd HH:mm"), moved back by the overlap."""
+    moment = datetime.datetime.strptime(timestamp[:16], "%Y-%m-%dT%H:%M")
+    return (moment - datetime.timedelta(minutes=overlap_minutes)).strftime("%Y-%m-%d %H:%M")
+
+class JiraMirror:
+    """SQLite (WAL) copy of one JIRA project, kept current by delta syncs."""
+
+    def __init__(self, path: Optional[str] = None, project: Optional[str] = None):
+        settings = get_settings()
+        self.path = path or settings.jira_mirror_db or DEFAULT_MIRROR_DB
+        self.project = project or settings.jira_project_key
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        # Held for a whole sync, so concurrent stale reads trigger one sync, not several
+        self._sync_lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._text_index: Optional[TicketIndex] = None
+
+    def _state(self) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark, last_sync, last_full_sync FROM sync_state WHERE project = ?", (self.project,)
+            ).fetchone()
+        return dict(zip(("watermark", "last_sync", "last_full_sync"), row)) if row else {}
+
+    def _upsert(self, tickets: List[Dict[str, Any]], synced_at: float) -> int:
+        rows = []
+        for ticket in tickets:
+            project, number, _ = key_order(ticket["key"])
+            rows.append((ticket["key"], project, number, *(ticket.get(column) for column in _COLUMNS),
+                         json.dumps(ticket), synced_at))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO tickets (key, project, number, status, priority, type, assignee, updated, data, synced_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if self._text_index is not None:
+            self._text_index.bulk_load(tickets)
+        return len(rows)
+
+    def put(self, ticket: Dict[str, Any]) -> None:
+        """Stores a ticket fetched outside a sync. Tickets of other projects are not kept, since syncs would never refresh them."""
+        if key_order(ticket["key"])[0] == self.project:
+            self._upsert([ticket], time.time())
+
+    def sync(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Pulls changed tickets from JIRA into the mirror.
+
+        Args:
+            full: Re-read the whole project and drop tickets JIRA no longer has. A delta sync
+                is used otherwise, unless the mirror has never been synced.
+
+        Returns:
+            A dictionary with the sync mode, the number of tickets fetched and deleted, the
+            number of search requests, the new watermark and the duration
+        """
+        with self._sync_lock:
+            started = time.time()
+            state = self._state()
+            full = full or not state.get("watermark")
+            project = f"project = {jira_client.quote(self.project)}"
+            if full:
+                jql = f"{project} ORDER BY key ASC"
+            else:
+                # JQL dates have minute precision and are read in the JIRA user's time zone,
+                # so re-reading JIRA_SYNC_OVERLAP_MINUTES before the watermark also absorbs clock skew
+                since = _jql_time(state["watermark"], get_settings().jira_sync_overlap_minutes)
+                jql = f"{project} AND updated >= {jira_client.quote(since)} ORDER BY updated ASC"
+
+            fetched, requests, start_at = 0, 0, 0
+            watermark = state.get("watermark") or ""
+            while True:
+                page = jira_client.search(jql, start_at=start_at)
+                requests += 1
+                tickets = page["tickets"]
+                fetched += self._upsert(tickets, started)
+                watermark = max([watermark] + [ticket.get("updated") or "" for ticket in tickets])
+                start_at += len(tickets)
+                if not tickets or start_at >= page["total"]:
+                    break
+
+            removed: List[str] = []
+            with self._lock:
+                if full:
+                    # Every ticket still in the project was just rewritten with this sync's time
+                    removed = [row[0] for row in self._conn.execute(
+                        "SELECT key FROM tickets WHERE project = ? AND synced_at < ?", (self.project, started)
+                    )]
+                    self._conn.execute("DELETE FROM tickets WHERE project = ? AND synced_at < ?", (self.project, started))
+                self._conn.execute(
+                    "INSERT INTO sync_state (project, watermark, last_sync, last_full_sync) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(project) DO UPDATE SET watermark = excluded.watermark, last_sync = excluded.last_sync, "
+                    "last_full_sync = COALESCE(excluded.last_full_sync, sync_state.last_full_sync)",
+                    (self.project, watermark or None, started, started if full else None)
+                )
+            if self._text_index is not None:
+                for key in removed:
+                    self._text_index.remove(key)
+            return {
+                "mode": "full" if full else "delta",
+                "fetched": fetched,
+                "deleted": len(removed),
+                "requests": requests,
+                "watermark": watermark,
+                "seconds": round(time.time() - started, 3)
+            }
+
+    def age(self) -> Optional[float]:
+        """Returns the seconds since the last sync started, or None if it was never synced."""
+        last_sync = self._state().get("last_sync")
+        return None if last_sync is None else time.time() - last_sync
+
+    def ensure_fresh(self, max_age_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Runs a delta sync if the last sync is older than the freshness bound.
+
+        A failed sync is logged and, if an earlier sync succeeded, does not fail the caller:
+        the mirrored rows are still served, reported as stale.
+
+        Returns:
+            The sync result, None if the mirror was fresh enough, or, if the sync failed,
+            a result with stale=True, the age_seconds of the mirrored rows and the error
+        """
+        if max_age_seconds is None:
+            max_age_seconds = get_settings().jira_mirror_max_age_seconds
+        age = self.age()
+        if age is not None and age <= max_age_seconds:
+            return None
+        with self._sync_lock:
+            # Another caller may have synced while this one waited
+            age = self.age()
+            if age is not None and age <= max_age_seconds:
+                return None
+            try:
+                return self.sync()
+            except Exception as e:
+                if age is None:
+                    raise
+                logger.warning("JIRA mirror sync failed, serving rows synced %.0f s ago: %s", age, e)
+                return {"stale": True, "age_seconds": round(age, 1), "error": str(e)}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns a mirrored ticket, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM tickets WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Returns the mirrored tickets among the given keys, by key."""
+        found: Dict[str, Dict[str, Any]] = {}
+        # Stay below SQLite's default limit on bound parameters
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, data FROM tickets WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+            found.update((key, json.loads(data)) for key, data in rows)
+        return found
+
+    def page(self, after: Optional[str] = None, limit: int = 50, updated_since: str = "",
+             **filters: Any) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Returns one page of the mirrored tickets matching the filters, in key order.
+
+        Same contract as TicketStore.page: filters are column values (status, priority, type,
+        assignee), and the second value returned is the key to continue after, or None.
+        """
+        clauses, parameters = ["project = ?"], [self.project]
+        for field, value in filters.items():
+            if field not in _COLUMNS:
+                raise ValueError(f"Cannot filter the mirror by {field}")
+            clauses.append(f"{field} = ?")
+            parameters.append(value)
+        if updated_since:
+            clauses.append("updated >= ?")
+            parameters.append(updated_since)
+        if after:
+            project, number, _ = key_order(after)
+            clauses.append("(project, number) > (?, ?)")
+            parameters.extend([project, number])
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM tickets WHERE {' AND '.join(clauses)} ORDER BY project, number LIMIT ?",
+                (*parameters, limit + 1)
+            ).fetchall()
+        tickets = [json.loads(row[0]) for row in rows[:limit]]
+        return tickets, (tickets[-1]["key"] if len(rows) > limit else None)
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[Dict[str, Any], float]]:
+        """Returns the k mirrored tickets that best match a full-text query, with their BM25 scores."""
+        with self._sync_lock:
+            if self._text_index is None:
+                with self._lock:
+                    rows = self._conn.execute("SELECT data FROM tickets WHERE project = ?", (self.project,)).fetchall()
+                self._text_index = TicketIndex(json.loads(row[0]) for row in rows)
+        ranked = self._text_index.search(query, k)
+        found = self.get_many([key for key, _ in ranked])
+        return [(found[key], score) for key, score in ranked if key in found]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tickets WHERE project = ?", (self.project,)).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_mirror = None
+_mirror_lock = threading.Lock()
+
+def get_jira_mirror() -> JiraMirror:
+    """Returns the process-wide JIRA mirror, opening it on first use."""
+    global _mirror
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = JiraMirror()
+        return _mirror
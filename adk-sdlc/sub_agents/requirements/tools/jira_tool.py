@@ -1,6 +1,16 @@
+import base64
+import json
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from google.adk.tools import FunctionTool
+from ...tools.rate_limiter import throttle
+from ...tools.tracing import traced
+from . import jira_client, jira_mirror
+from .jira_mirror import JiraMirror, get_jira_mirror
+from .ticket_parser import ParsedTicketCache
+from .ticket_search import TicketIndex, tokenize
+from .ticket_similarity import get_duplicate_index
+from .ticket_store import TicketStore
 
 # Mock data for JIRA operations
 MOCK_TICKETS = [
@@ -90,6 +100,22 @@ Acceptance Criteria:
     }
 ]
 
+# Tickets per list_open_tickets page, by default and at most
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Ticket fields returned by list_open_tickets
+LIST_FIELDS = ("key", "summary", "type", "priority", "assignee", "status", "updated")
+
+TABLE_HEADER = "| Key | Summary | Type | Priority | Assignee |\n|-----|---------|------|----------|----------|\n"
+
+# Tickets indexed by key, status, priority and assignee, and by text for search_tickets
+ticket_store = TicketStore(MOCK_TICKETS, text_index=TicketIndex())
+
+# Structured requirements per ticket key and updated timestamp
+parsed_tickets = ParsedTicketCache()
+
+@traced("requirements", external=True)
 def start_jira_mcp_server() -> Dict[str, Any]:
     """Dummy function to simulate starting JIRA MCP server"""
     return {
@@ -98,69 +124,344 @@ def start_jira_mcp_server() -> Dict[str, Any]:
         "pid": 12346
     }
 
-def get_ticket_details(ticket_id: str) -> Dict[str, Any]:
-    """Dummy function to get JIRA ticket details"""
-    for ticket in MOCK_TICKETS:
-        if ticket["key"] == ticket_id:
-            # Extract requirements and acceptance criteria
-            description = ticket["description"]
-            requirements = []
-            acceptance_criteria = []
-            
-            for line in description.split("\n"):
-                if line.strip().startswith("- "):
-                    requirements.append(line.strip()[2:])
-                elif line.strip().startswith(str(len(acceptance_criteria) + 1) + ". "):
-                    acceptance_criteria.append(line.strip()[3:])
-            
-            formatted_details = f"""# {ticket["key"]}: {ticket["summary"]}
-
-**Status:** {ticket["status"]}
-**Type:** {ticket["type"]}
-**Priority:** {ticket["priority"]}
-**Assignee:** {ticket["assignee"]}
-**Reporter:** {ticket["reporter"]}
-
-## Description
-{ticket["description"]}
-
-## Requirements
-{"".join([f"- {req}\\n" for req in requirements])}
-
-## Acceptance Criteria
-{"".join([f"{i+1}. {ac}\\n" for i, ac in enumerate(acceptance_criteria)])}
-"""
-            
-            return {
-                "status": "success",
-                "message": f"Found ticket {ticket_id}",
-                "ticket": ticket,
-                "formatted_details": formatted_details
-            }
-    
+def _ticket_result(ticket: Dict[str, Any], include_markdown: bool) -> Dict[str, Any]:
+    """Builds the tool result for one ticket."""
+    # Requirements and acceptance criteria are parsed once per ticket version
+    parsed = parsed_tickets.get(ticket)
+    result = {
+        "status": "success",
+        "message": f"Found ticket {ticket['key']}",
+        "ticket": ticket,
+        "requirements": list(parsed.requirements),
+        "acceptance_criteria": list(parsed.acceptance_criteria)
+    }
+    if include_markdown:
+        result["formatted_details"] = parsed.markdown
+    return result
+
+def _mirror(max_age_seconds: float) -> Tuple[Optional[JiraMirror], Dict[str, Any]]:
+    """
+    Returns the local JIRA mirror, delta-synced first if its last sync is older than
+    max_age_seconds (negative for JIRA_MIRROR_MAX_AGE_SECONDS), or None when tickets are
+    read from JIRA directly. Also returns the fields to add to the tool result: stale and
+    age_seconds if the sync failed and the mirrored rows are served as they are.
+    """
+    if not jira_mirror.mirror_enabled():
+        return None, {}
+    mirror = get_jira_mirror()
+    synced = mirror.ensure_fresh(None if max_age_seconds < 0 else max_age_seconds)
+    if synced and synced.get("stale"):
+        return mirror, {"stale": True, "age_seconds": synced["age_seconds"]}
+    return mirror, {}
+
+def _fetch_tickets(keys: List[str], mirror: Optional[JiraMirror] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetches tickets by key, from the mirror when given, and otherwise with one JQL
+    `key in (...)` search per MAX_RESULTS keys.
+    """
+    if not jira_client.live():
+        throttle("jira")
+        tickets = (ticket_store.get(key) for key in keys)
+        return {ticket["key"]: ticket for ticket in tickets if ticket is not None}
+    found = mirror.get_many(keys) if mirror is not None else {}
+    # Keys the mirror does not have may belong to another project or be newer than the last sync
+    remaining = [key for key in keys if key not in found]
+    for start in range(0, len(remaining), jira_client.MAX_RESULTS):
+        chunk = remaining[start:start + jira_client.MAX_RESULTS]
+        for ticket in jira_client.search(jira_client.key_in(chunk), max_results=len(chunk))["tickets"]:
+            found[ticket["key"]] = ticket
+            if mirror is not None:
+                mirror.put(ticket)
+    return found
+
+@traced("requirements", external=True)
+def get_ticket_details(ticket_id: str, include_markdown: bool = True, max_age_seconds: float = -1) -> Dict[str, Any]:
+    """
+    Gets the details of a JIRA ticket, with its requirements and acceptance criteria parsed
+    from the description.
+
+    Args:
+        ticket_id: Key of the ticket to fetch (e.g. "TEST-1")
+        include_markdown: Whether to include the formatted_details markdown of the ticket
+        max_age_seconds: How out of date the ticket may be: the age of the local JIRA mirror,
+            if enabled, or of a cached JIRA response; 0 fetches it fresh, -1 uses the
+            configured default
+
+    Returns:
+        A dictionary containing the ticket, its requirements and acceptance criteria, and
+        (if requested) the formatted details. If the JIRA mirror could not be synced, the
+        mirrored ticket is returned with stale=True and the age_seconds of the mirror.
+    """
+    try:
+        mirror, staleness = _mirror(max_age_seconds)
+        if mirror is not None:
+            ticket = mirror.get(ticket_id)
+            if ticket is None:
+                # Another project's ticket, or one created since the last sync
+                ticket = jira_client.get_issue(ticket_id)
+                if ticket is not None:
+                    mirror.put(ticket)
+        elif jira_client.live():
+            ticket = jira_client.get_issue(ticket_id, None if max_age_seconds < 0 else max_age_seconds)
+        else:
+            throttle("jira")
+            ticket = ticket_store.get(ticket_id)
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to fetch ticket {ticket_id}: {str(e)}"
+        }
+    if ticket is None:
+        return {
+            "status": "error",
+            "message": f"Ticket {ticket_id} not found"
+        }
+    return {**_ticket_result(ticket, include_markdown), **staleness}
+
+@traced("requirements", external=True)
+def get_ticket_details_batch(ticket_ids: List[str], include_markdown: bool = True,
+                             max_age_seconds: float = -1) -> Dict[str, Any]:
+    """
+    Gets the details of several JIRA tickets with a single search request.
+
+    Args:
+        ticket_ids: Keys of the tickets to fetch (e.g. ["TEST-1", "TEST-2"])
+        include_markdown: Whether to include the formatted_details markdown of each ticket
+        max_age_seconds: How out of date the local JIRA mirror may be, if enabled; 0 syncs it
+            first, -1 uses the configured default
+
+    Returns:
+        A dictionary with one result per requested key, in the order requested. Each result
+        has the same fields as get_ticket_details plus ticket_id, and a per-key error status
+        and message for keys that are invalid or do not exist. stale and age_seconds are set
+        as in get_ticket_details.
+    """
+    keys = [key.strip() for key in ticket_ids]
+    valid = [key for key in dict.fromkeys(keys) if jira_client.ISSUE_KEY.match(key)]
+    try:
+        mirror, staleness = _mirror(max_age_seconds) if valid else (None, {})
+        found = _fetch_tickets(valid, mirror) if valid else {}
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to fetch tickets: {str(e)}"
+        }
+
+    results = []
+    for key in keys:
+        if key in found:
+            result = _ticket_result(found[key], include_markdown)
+        elif jira_client.ISSUE_KEY.match(key):
+            result = {"status": "error", "message": f"Ticket {key} not found"}
+        else:
+            result = {"status": "error", "message": f"Invalid ticket key {key!r}"}
+        results.append({"ticket_id": key, **result})
+
+    missing = [result["ticket_id"] for result in results if result["status"] != "success"]
+    return {
+        "status": "success",
+        "message": f"Found {len(results) - len(missing)} of {len(results)} tickets",
+        "results": results,
+        "missing": missing,
+        **staleness
+    }
+
+def _cell(value: Any) -> str:
+    """Escapes a value for a markdown table cell."""
+    return str(value if value is not None else "").replace("|", "\\|").replace("\n", " ")
+
+def _table_row(ticket: Dict[str, Any]) -> str:
+    return "| " + " | ".join(_cell(ticket.get(field)) for field in ("key", "summary", "type", "priority", "assignee")) + " |\n"
+
+def _encode_cursor(state: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(state, sort_keys=True).encode()).decode()
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+def _open_tickets_jql(filters: Dict[str, str], updated_since: str) -> str:
+    """Builds the JQL of a filtered open-ticket listing."""
+    clauses = ['status = "Open"']
+    for field, value in filters.items():
+        clauses.append(f"{'issuetype' if field == 'type' else field} = {jira_client.quote(value)}")
+    if updated_since:
+        # JQL dates are "yyyy-MM-dd" or "yyyy-MM-dd HH:mm"
+        clauses.append(f"updated >= {jira_client.quote(updated_since.replace('T', ' ')[:16])}")
+    return " AND ".join(clauses) + " ORDER BY key ASC"
+
+@traced("requirements", external=True)
+def list_open_tickets(priority: str = "", issue_type: str = "", assignee: str = "", updated_since: str = "",
+                      cursor: str = "", page_size: int = DEFAULT_PAGE_SIZE, max_age_seconds: float = -1) -> Dict[str, Any]:
+    """
+    Lists open JIRA tickets one page at a time, in key order.
+
+    Args:
+        priority: Only tickets with this priority (e.g. "High")
+        issue_type: Only tickets of this type (e.g. "Story")
+        assignee: Only tickets assigned to this person
+        updated_since: Only tickets updated at or after this ISO date or time (e.g. "2024-05-07")
+        cursor: The next_cursor of the previous page; empty for the first page
+        page_size: Tickets per page (at most MAX_PAGE_SIZE)
+        max_age_seconds: How out of date the local JIRA mirror may be, if enabled; 0 syncs it
+            first, -1 uses the configured default
+
+    Returns:
+        A dictionary containing the tickets of this page (key, summary, type, priority,
+        assignee, status, updated), a markdown table of the page, and next_cursor to pass
+        for the next page ("" on the last page); stale and age_seconds are set as in
+        get_ticket_details
+    """
+    filters = {field: value for field, value in (("priority", priority), ("type", issue_type), ("assignee", assignee)) if value}
+    query = {"filters": filters, "updated_since": updated_since}
+    page_size = max(1, min(page_size or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+    try:
+        state = _decode_cursor(cursor) if cursor else {}
+        if cursor and state.get("query") != query:
+            raise ValueError("The cursor belongs to a listing with different filters")
+
+        mirror, staleness = _mirror(max_age_seconds)
+        if mirror is not None:
+            tickets, after = mirror.page(after=state.get("after"), limit=page_size, updated_since=updated_since,
+                                         status="Open", **filters)
+            next_state = {"query": query, "after": after} if after else None
+        elif jira_client.live():
+            start_at = state.get("start_at", 0)
+            found = jira_client.search(_open_tickets_jql(filters, updated_since), start_at=start_at, max_results=page_size)
+            tickets = found["tickets"]
+            next_state = {"query": query, "start_at": start_at + len(tickets)} if start_at + len(tickets) < found["total"] else None
+        else:
+            throttle("jira")
+            where = (lambda ticket: (ticket.get("updated") or "") >= updated_since) if updated_since else None
+            tickets, after = ticket_store.page(after=state.get("after"), limit=page_size, where=where, status="Open", **filters)
+            next_state = {"query": query, "after": after} if after else None
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to list open tickets: {str(e)}"
+        }
+
+    # Only this page is rendered, so a page costs the same however many tickets are open
+    table = "".join([TABLE_HEADER] + [_table_row(ticket) for ticket in tickets])
+    next_cursor = _encode_cursor(next_state) if next_state else ""
+    return {
+        "status": "success",
+        "message": f"Found {len(tickets)} open tickets" + (" (more available with next_cursor)" if next_cursor else ""),
+        "tickets": [{field: ticket.get(field) for field in LIST_FIELDS} for ticket in tickets],
+        "formatted_table": table,
+        "next_cursor": next_cursor,
+        "has_more": bool(next_cursor),
+        **staleness
+    }
+
+@traced("requirements", external=True)
+def search_tickets(query: str, k: int = 10, max_age_seconds: float = -1) -> Dict[str, Any]:
+    """
+    Finds tickets by full-text search over their summary, description and acceptance criteria.
+
+    Args:
+        query: Words to look for (e.g. "timezone handling")
+        k: Maximum number of tickets to return (at most MAX_PAGE_SIZE)
+        max_age_seconds: How out of date the local JIRA mirror may be, if enabled; 0 syncs it
+            first, -1 uses the configured default
+
+    Returns:
+        A dictionary containing the best matching tickets first (key, summary, type, priority,
+        assignee, status, updated and BM25 score) and a markdown table of them; stale and
+        age_seconds are set as in get_ticket_details
+    """
+    if not tokenize(query):
+        return {
+            "status": "error",
+            "message": f"No searchable words in {query!r}"
+        }
+    k = max(1, min(k or 10, MAX_PAGE_SIZE))
+    try:
+        mirror, staleness = _mirror(max_age_seconds)
+        if mirror is not None:
+            ranked = mirror.search(query, k)
+        elif jira_client.live():
+            # Without ORDER BY, JIRA returns text search results by its own relevance
+            found = jira_client.search(f"text ~ {jira_client.quote(query)}", max_results=k)
+            ranked = [(ticket, None) for ticket in found["tickets"]]
+        else:
+            throttle("jira")
+            ranked = ticket_store.search(query, k)
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to search tickets: {str(e)}"
+        }
+
     return {
-        "status": "error",
-        "message": f"Ticket {ticket_id} not found"
+        "status": "success",
+        "message": f"Found {len(ranked)} tickets matching {query!r}",
+        "tickets": [{**{field: ticket.get(field) for field in LIST_FIELDS}, "score": score} for ticket, score in ranked],
+        "formatted_table": "".join([TABLE_HEADER] + [_table_row(ticket) for ticket, _ in ranked]),
+        **staleness
     }
 
-def list_open_tickets() -> Dict[str, Any]:
-    """Dummy function to list open JIRA tickets"""
-    open_tickets = [ticket for ticket in MOCK_TICKETS if ticket["status"] == "Open"]
-    
-    # Format tickets as markdown table
-    table = "| Key | Summary | Type | Priority | Assignee |\n"
-    table += "|-----|---------|------|----------|----------|\n"
-    for ticket in open_tickets:
-        table += f"| {ticket['key']} | {ticket['summary']} | {ticket['type']} | {ticket['priority']} | {ticket['assignee']} |\n"
-    
+@traced("requirements", external=True)
+def find_duplicate_tickets(ticket_id: str, threshold: float = -1) -> Dict[str, Any]:
+    """
+    Finds processed or in-flight tickets that are near-duplicates of a ticket.
+
+    Args:
+        ticket_id: The ticket to check (e.g. "TEST-1")
+        threshold: Minimum estimated similarity of the text, from 0 to 1; -1 uses DUPLICATE_THRESHOLD
+
+    Returns:
+        A dictionary containing the near-duplicates, most similar first, each with its ticket_id,
+        similarity, state ("in_flight" or "processed") and pull request, if any
+    """
+    details = get_ticket_details(ticket_id, include_markdown=False)
+    if details["status"] != "success":
+        return details
+    duplicates = get_duplicate_index().find(details["ticket"], None if threshold < 0 else threshold)
+    return {
+        "status": "success",
+        "message": (f"{ticket_id} is a near-duplicate of {', '.join(match['ticket_id'] for match in duplicates)}"
+                    if duplicates else f"No near-duplicates of {ticket_id} were processed or are in flight"),
+        "duplicates": duplicates
+    }
+
+@traced("requirements", external=True)
+def sync_jira_mirror(full: bool = False) -> Dict[str, Any]:
+    """
+    Updates the local JIRA mirror with the tickets changed since its last sync.
+
+    Args:
+        full: Re-read the whole project instead, also dropping tickets deleted in JIRA
+
+    Returns:
+        A dictionary containing the sync mode, the number of tickets fetched and deleted, and
+        the number of JIRA requests made
+    """
+    if not jira_mirror.mirror_enabled():
+        return {
+            "status": "error",
+            "message": "The JIRA mirror is not enabled (JIRA_BACKEND=rest and JIRA_MIRROR=true)"
+        }
+    try:
+        result = get_jira_mirror().sync(full=full)
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to sync the JIRA mirror: {str(e)}"
+        }
     return {
         "status": "success",
-        "message": f"Found {len(open_tickets)} open tickets",
-        "tickets": open_tickets,
-        "formatted_table": table
+        "message": f"{result['mode'].capitalize()} sync fetched {result['fetched']} tickets and deleted {result['deleted']}",
+        **result
     }
 
 # Create FunctionTool instances
 start_jira_mcp_server_tool = FunctionTool(start_jira_mcp_server)
 get_ticket_details_tool = FunctionTool(get_ticket_details)
-list_open_tickets_tool = FunctionTool(list_open_tickets)
\ No newline at end of file
+get_ticket_details_batch_tool = FunctionTool(get_ticket_details_batch)
+list_open_tickets_tool = FunctionTool(list_open_tickets)
+search_tickets_tool = FunctionTool(search_tickets)
+find_duplicate_tickets_tool = FunctionTool(find_duplicate_tickets)
+sync_jira_mirror_tool = FunctionTool(sync_jira_mirror)
\ No newline at end of file
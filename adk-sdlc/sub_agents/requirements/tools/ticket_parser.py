@@ -0,0 +1,175 @@
+"""
+Parse-once structured form of JIRA tickets.
+
+A ticket description is parsed into its user story, requirements and acceptance criteria the
+first time the ticket is read, and the result is memoized by ticket key and `updated`
+timestamp, so an edited ticket is parsed again and an unchanged one never is. The markdown
+shown to users is rendered from the parsed form only when a caller asks for it, and at most
+once per ticket version.
+"""
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
+from ....settings import get_settings
+
+# Section headers, with or without markdown decoration: "Requirements:", "## Acceptance Criteria"
+_SECTION = re.compile(
+    r"^\s*(?:#+\s*)?(?:\*\*)?\s*(requirements|acceptance criteria)\s*:?\s*(?:\*\*)?\s*:?\s*$",
+    re.IGNORECASE
+)
+# List items: "- item", "* item", "1. item", "1) item"
+_ITEM = re.compile(r"^\s*(?:[-*+•]|\d+[.)])\s+(.*\S)\s*$")
+_BULLET = re.compile(r"^\s*[-*+•]\s+")
+_NUMBERED = re.compile(r"^\s*\d+[.)]\s+")
+
+# Ticket fields kept in the parsed form
+METADATA_FIELDS = ("key", "summary", "status", "type", "priority", "assignee", "reporter", "created", "updated")
+
+@dataclass(frozen=True)
+class ParsedTicket:
+    """
+    Structured content of one version of a ticket.
+
+    Attributes:
+        metadata: The ticket's METADATA_FIELDS
+        description: The raw description
+        story: Description text before the first section (the user story)
+        requirements: Items of the Requirements section
+        acceptance_criteria: Items of the Acceptance Criteria section
+    """
+    metadata: Tuple[Tuple[str, Any], ...]
+    description: str
+    story: str
+    requirements: Tuple[str, ...]
+    acceptance_criteria: Tuple[str, ...]
+
+    def field(self, name: str) -> Any:
+        return dict(self.metadata).get(name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the structured form without the raw description."""
+        return {
+            **dict(self.metadata),
+            "story": self.story,
+            "requirements": list(self.requirements),
+            "acceptance_criteria": list(self.acceptance_criteria)
+        }
+
+    @cached_property
+    def markdown(self) -> str:
+        """The ticket rendered as markdown, built on first access."""
+        requirements_md = "".join(f"- {requirement}\n" for requirement in self.requirements)
+        acceptance_md = "".join(f"{i + 1}. {criterion}\n" for i, criterion in enumerate(self.acceptance_criteria))
+        return f"""# {self.field("key")}: {self.field("summary")}
+
+**Status:** {self.field("status")}
+**Type:** {self.field("type")}
+**Priority:** {self.field("priority")}
+**Assignee:** {self.field("assignee")}
+**Reporter:** {self.field("reporter")}
+
+## Description
+{self.description}
+
+## Requirements
+{requirements_md}
+
+## Acceptance Criteria
+{acceptance_md}
+"""
+
+def _items(lines: List[str]) -> List[str]:
+    """Collects list items, joining wrapped continuation lines onto the item before them."""
+    items: List[str] = []
+    for line in lines:
+        match = _ITEM.match(line)
+        if match:
+            items.append(match.group(1))
+        elif line.strip() and items:
+            items[-1] = f"{items[-1]} {line.strip()}"
+    return items
+
+def parse_ticket(ticket: Dict[str, Any]) -> ParsedTicket:
+    """
+    Parses a ticket description into user story, requirements and acceptance criteria.
+
+    Sections are found by their headers ("Requirements:", "Acceptance Criteria:", also as
+    markdown headings), and any bullet or numbered item inside them counts, whatever its
+    numbering. Descriptions without section headers fall back to bullets as requirements and
+    numbered items as acceptance criteria.
+    """
+    description = ticket.get("description") or ""
+    sections: Dict[str, List[str]] = {"story": []}
+    current = "story"
+    for line in description.split("\n"):
+        header = _SECTION.match(line)
+        if header:
+            current = header.group(1).lower()
+            sections.setdefault(current, [])
+        else:
+            sections[current].append(line)
+
+    if "requirements" in sections or "acceptance criteria" in sections:
+        requirements = _items(sections.get("requirements", []))
+        acceptance_criteria = _items(sections.get("acceptance criteria", []))
+        story_lines = sections["story"]
+    else:
+        lines = sections["story"]
+        requirements = _items([line for line in lines if _BULLET.match(line)])
+        acceptance_criteria = _items([line for line in lines if _NUMBERED.match(line)])
+        story_lines = [line for line in lines if not _ITEM.match(line)]
+
+    return ParsedTicket(
+        metadata=tuple((name, ticket.get(name)) for name in METADATA_FIELDS),
+        description=description,
+        story="\n".join(story_lines).strip(),
+        requirements=tuple(requirements),
+        acceptance_criteria=tuple(acceptance_criteria)
+    )
+
+class ParsedTicketCache:
+    """
+    Parsed tickets by key, each valid for one `updated` timestamp, in an LRU of max_entries
+    (defaults to PARSED_TICKET_ENTRIES, read when the cache is trimmed).
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Optional[str], ParsedTicket]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_entries(self) -> int:
+        return max(1, self._max_entries or get_settings().parsed_ticket_entries)
+
+    def get(self, ticket: Dict[str, Any]) -> ParsedTicket:
+        """Returns the parsed form of a ticket, parsing it only if this version is new."""
+        key, updated = ticket["key"], ticket.get("updated")
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == updated:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        parsed = parse_ticket(ticket)
+        with self._lock:
+            self._entries[key] = (updated, parsed)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return parsed
+
+    def invalidate(self, key: str) -> None:
+        """Drops the parsed form of a ticket."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
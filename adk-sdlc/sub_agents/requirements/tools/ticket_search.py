@@ -0,0 +1,190 @@
+"""
+In-process full-text search over tickets: an inverted index with BM25 ranking.
+
+Each ticket is indexed as its summary, its description (user story and requirements) and its
+acceptance criteria, as split by ticket_parser. Summary terms count double. Terms are
+lowercased words without stopwords, with plural "s" folded ("timezones" finds "timezone").
+
+Postings are append-only arrays of (document, term frequency). Replacing or removing a ticket
+retires its document number instead of rewriting every posting it appears in. Postings of
+retired documents are skipped at query time and dropped once they outnumber the live ones.
+"""
+import heapq
+import math
+import re
+import threading
+from array import array
+from collections import Counter
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .ticket_parser import parse_ticket
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Weight of a term occurrence per ticket field
+FIELD_WEIGHTS = {"summary": 2.0, "description": 1.0, "acceptance_criteria": 1.0}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be by can for from has have i in is it its of on or our should so that the
+their them they this to want was we when which will with
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    """Splits text into index terms."""
+    terms = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+def ticket_fields(ticket: Dict[str, Any]) -> Dict[str, str]:
+    """Returns the searchable text of a ticket per FIELD_WEIGHTS field."""
+    parsed = parse_ticket(ticket)
+    return {
+        "summary": ticket.get("summary") or "",
+        "description": "\n".join((parsed.story, *parsed.requirements)),
+        "acceptance_criteria": "\n".join(parsed.acceptance_criteria)
+    }
+
+class TicketIndex:
+    """BM25-ranked inverted index of tickets, updated one ticket at a time."""
+
+    def __init__(self, tickets: Optional[Iterable[Dict[str, Any]]] = None):
+        # Live document number per ticket key
+        self._ids: Dict[str, int] = {}
+        # Per document number: ticket key (None once retired), weighted length and distinct terms
+        self._keys: List[Optional[str]] = []
+        self._lengths = array("d")
+        self._terms: List[Tuple[str, ...]] = []
+        # term -> (document numbers, weighted term frequencies)
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        # Live documents per term
+        self._df: Counter = Counter()
+        self._total_length = 0.0
+        self._live_postings = 0
+        self._dead_postings = 0
+        self._lock = threading.RLock()
+        if tickets is not None:
+            self.bulk_load(tickets)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _retire(self, key: str) -> None:
+        doc = self._ids.pop(key, None)
+        if doc is None:
+            return
+        self._keys[doc] = None
+        self._total_length -= self._lengths[doc]
+        self._df.subtract(self._terms[doc])
+        self._live_postings -= len(self._terms[doc])
+        self._dead_postings += len(self._terms[doc])
+        self._terms[doc] = ()
+
+    def put(self, ticket: Dict[str, Any]) -> None:
+        """Indexes a ticket, replacing the indexed version with the same key."""
+        self.bulk_load([ticket])
+
+    def bulk_load(self, tickets: Iterable[Dict[str, Any]]) -> int:
+        """
+        Indexes many tickets, replacing indexed versions with the same keys.
+
+        Returns:
+            Number of tickets indexed
+        """
+        count = 0
+        # Tokenize outside the lock; only the index update needs it
+        documents = []
+        for ticket in tickets:
+            frequencies: Counter = Counter()
+            for field, text in ticket_fields(ticket).items():
+                weight = FIELD_WEIGHTS[field]
+                for term in tokenize(text):
+                    frequencies[term] += weight
+            documents.append((ticket["key"], frequencies))
+        with self._lock:
+            for key, frequencies in documents:
+                self._retire(key)
+                doc = len(self._keys)
+                length = sum(frequencies.values())
+                self._ids[key] = doc
+                self._keys.append(key)
+                self._lengths.append(length)
+                self._terms.append(tuple(frequencies))
+                self._total_length += length
+                for term, frequency in frequencies.items():
+                    posting = self._postings.get(term)
+                    if posting is None:
+                        posting = self._postings[term] = (array("l"), array("d"))
+                    posting[0].append(doc)
+                    posting[1].append(frequency)
+                self._df.update(frequencies.keys())
+                self._live_postings += len(frequencies)
+                count += 1
+            if self._dead_postings > max(self._live_postings, 10000):
+                self._compact()
+        return count
+
+    def remove(self, key: str) -> None:
+        """Removes a ticket from the index."""
+        with self._lock:
+            self._retire(key)
+
+    def _compact(self) -> None:
+        """Drops the postings of retired documents."""
+        keys = self._keys
+        for term in list(self._postings):
+            docs, frequencies = self._postings[term]
+            live = [(doc, frequency) for doc, frequency in zip(docs, frequencies) if keys[doc] is not None]
+            if live:
+                self._postings[term] = (array("l", (doc for doc, _ in live)), array("d", (f for _, f in live)))
+            else:
+                del self._postings[term]
+                del self._df[term]
+        self._dead_postings = 0
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Returns the keys of the k tickets that best match the query, with their BM25 scores.
+
+        Every query term found in a ticket adds to its score, so tickets need not contain all
+        the terms; rarer terms weigh more.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            count = len(self._ids)
+            if not count or not terms:
+                return []
+            average = self._total_length / count or 1.0
+            keys, lengths = self._keys, self._lengths
+            base, slope = BM25_K1 * (1 - BM25_B), BM25_K1 * BM25_B / average
+            scores: Dict[int, float] = {}
+            for term in terms:
+                posting = self._postings.get(term)
+                df = self._df.get(term, 0)
+                if posting is None or df <= 0:
+                    continue
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                saturation = idf * (BM25_K1 + 1)
+                get = scores.get
+                for doc, frequency in zip(*posting):
+                    if keys[doc] is not None:
+                        scores[doc] = get(doc, 0.0) + saturation * frequency / (frequency + base + slope * lengths[doc])
+            best = heapq.nlargest(k, scores.items(), key=itemgetter(1))
+            return [(keys[doc], round(score, 4)) for doc, score in best]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "tickets": len(self._ids),
+                "terms": sum(1 for df in self._df.values() if df > 0),
+                "postings": self._live_postings,
+                "retired_postings": self._dead_postings
+            }
@@ -0,0 +1,189 @@
+"""
+Near-duplicate ticket detection with MinHash and locality-sensitive hashing (LSH).
+
+A ticket is reduced to the set of word 3-grams (shingles) of its summary, description and
+acceptance criteria, and that set to a MinHash signature of NUM_PERMUTATIONS values. The
+share of equal signature values estimates the Jaccard similarity of two tickets' shingle sets.
+
+Signatures are split into LSH_BANDS bands, and every band is a hash bucket. Only tickets that
+share a bucket with the query are compared, so a lookup costs about the same however many
+tickets are indexed. With 32 bands of 4 values, tickets with a Jaccard similarity of 0.7 share
+a bucket with probability 0.9998, tickets at 0.3 with probability 0.23 and at 0.1 with 0.003;
+candidates are then checked against the threshold on their whole signatures.
+
+The orchestrator registers tickets while they are in flight and once they are processed, so
+batches can skip near-duplicates of work already done or under way.
+"""
+import hashlib
+import random
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+from ....settings import get_settings
+from .ticket_search import ticket_fields, tokenize
+
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 32
+SHINGLE_SIZE = 3
+
+_MASK = (1 << 64) - 1
+# Multiply-shift hash functions, fixed so signatures are the same in every process
+_PERMUTATIONS = [(random.Random(seed).getrandbits(64) | 1, random.Random(-seed).getrandbits(64))
+                 for seed in range(1, NUM_PERMUTATIONS + 1)]
+
+def shingles(ticket: Dict[str, Any]) -> Set[str]:
+    """Returns the word 3-grams of a ticket's summary, description and acceptance criteria."""
+    words = tokenize("\n".join(ticket_fields(ticket).values()))
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+def minhash(items: Set[str]) -> Tuple[int, ...]:
+    """Returns the MinHash signature of a set of strings."""
+    if not items:
+        return (_MASK,) * NUM_PERMUTATIONS
+    hashes = [int.from_bytes(hashlib.blake2b(item.encode(), digest_size=8).digest(), "little") for item in items]
+    return tuple(
+        min(((a * h + b) & _MASK) >> 32 for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Estimates the Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(first, second) if x == y) / NUM_PERMUTATIONS
+
+class DuplicateIndex:
+    """
+    LSH index of the MinHash signatures of processed and in-flight tickets.
+
+    Tickets count as near-duplicates from an estimated Jaccard similarity of threshold
+    (defaults to DUPLICATE_THRESHOLD).
+    """
+
+    def __init__(self, threshold: Optional[float] = None):
+        self.threshold = get_settings().duplicate_threshold if threshold is None else threshold
+        self._rows = NUM_PERMUTATIONS // LSH_BANDS
+        # key -> {"signature", "state" ("in_flight" or "processed"), "pr"}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # One bucket table per band: band values -> keys
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [{} for _ in range(LSH_BANDS)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _bands(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        return [signature[band * self._rows:(band + 1) * self._rows] for band in range(LSH_BANDS)]
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for buckets, band in zip(self._buckets, self._bands(entry["signature"])):
+            keys = buckets.get(band)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del buckets[band]
+
+    def _add(self, key: str, signature: Tuple[int, ...], state: str, pr: Any = None) -> None:
+        self._remove(key)
+        self._entries[key] = {"signature": signature, "state": state, "pr": pr}
+        for buckets, band in zip(self._buckets, self._bands(signature)):
+            buckets.setdefault(band, set()).add(key)
+
+    def _matches(self, key: str, signature: Tuple[int, ...], threshold: float) -> List[Dict[str, Any]]:
+        candidates: Set[str] = set()
+        for buckets, band in zip(self._buckets, self._bands(signature)):
+            candidates.update(buckets.get(band, ()))
+        candidates.discard(key)
+        matches = []
+        for candidate in candidates:
+            entry = self._entries[candidate]
+            score = similarity(signature, entry["signature"])
+            if score >= threshold:
+                matches.append({"ticket_id": candidate, "similarity": round(score, 3), "state": entry["state"], "pr": entry["pr"]})
+        return sorted(matches, key=lambda match: (-match["similarity"], match["ticket_id"]))
+
+    def add(self, ticket: Dict[str, Any], state: str = "processed", pr: Any = None) -> None:
+        """Registers a ticket, replacing its earlier registration."""
+        signature = minhash(shingles(ticket))
+        with self._lock:
+            self._add(ticket["key"], signature, state, pr)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def find(self, ticket: Dict[str, Any], threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the registered near-duplicates of a ticket, most similar first.
+
+        Args:
+            ticket: The ticket to look up; its own registration is never a match
+            threshold: Minimum estimated Jaccard similarity (defaults to the index threshold)
+
+        Returns:
+            One dictionary per match with its ticket_id, similarity, state and pr
+        """
+        signature = minhash(shingles(ticket))
+        with self._lock:
+            return self._matches(ticket["key"], signature, self.threshold if threshold is None else threshold)
+
+    def claim(self, ticket: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Registers a ticket as in flight unless it is a near-duplicate of a registered one.
+
+        The check and the registration are atomic, so of two near-duplicates claimed at the
+        same time exactly one goes ahead.
+
+        Returns:
+            The closest match if the ticket is a near-duplicate, otherwise None
+        """
+        signature = minhash(shingles(ticket))
+        with self._lock:
+            matches = self._matches(ticket["key"], signature, self.threshold)
+            if matches:
+                return matches[0]
+            self._add(ticket["key"], signature, "in_flight")
+            return None
+
+    def state(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the state ("in_flight" or "processed") and pr of a registered ticket, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else {"state": entry["state"], "pr": entry["pr"]}
+
+    def finish(self, key: str, success: bool, pr: Any = None) -> None:
+        """
+        Marks an in-flight ticket as processed, or drops it if it failed so that a near-duplicate
+        can be processed instead.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            if success:
+                entry.update(state="processed", pr=pr)
+            else:
+                self._remove(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            states = [entry["state"] for entry in self._entries.values()]
+            return {
+                "tickets": len(states),
+                "in_flight": states.count("in_flight"),
+                "processed": states.count("processed"),
+                "buckets": sum(len(buckets) for buckets in self._buckets)
+            }
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_duplicate_index() -> DuplicateIndex:
+    """Returns the process-wide index of processed and in-flight tickets."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = DuplicateIndex()
+        return _index
@@ -0,0 +1,182 @@
+"""
+In-memory ticket store with a hash index on the ticket key and secondary indexes on the
+fields tickets are filtered by (status, priority, assignee).
+
+Lookups by key are O(1). Filtering on indexed fields intersects the matching index buckets,
+starting from the smallest, so it costs O(matches) instead of O(tickets). Tickets are
+returned in the order they were last added or replaced.
+
+An optional TicketIndex (ticket_search.py) is kept in step with the store for full-text search.
+
+Pages are served in key order ("PROJ-2" before "PROJ-10") from a sorted copy of the smallest
+matching index bucket, built once after each change. A page starts with a binary search for
+the cursor, so its cost does not depend on how many tickets come before it.
+"""
+import bisect
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from .ticket_search import TicketIndex
+
+# Fields with a secondary index
+INDEXED_FIELDS = ("status", "priority", "assignee")
+
+def key_order(key: str) -> Tuple[str, int, str]:
+    """Sort key of a ticket key: by project, then numerically by issue number."""
+    project, _, number = key.rpartition("-")
+    return (project, int(number), "") if number.isdigit() else (key, -1, key)
+
+class TicketStore:
+    """Tickets by key, with secondary indexes on INDEXED_FIELDS."""
+
+    def __init__(self, tickets: Optional[Iterable[Dict[str, Any]]] = None,
+                 text_index: Optional[TicketIndex] = None):
+        self._tickets: Dict[str, Dict[str, Any]] = {}
+        # field -> value -> keys (a dict used as an ordered set)
+        self._indexes: Dict[str, Dict[Any, Dict[str, None]]] = {field: {} for field in INDEXED_FIELDS}
+        self._lock = threading.RLock()
+        # Sorted keys per (field, value) bucket (None for all tickets), dropped on every change
+        self._sorted: Dict[Any, List[Tuple[Tuple[str, int, str], str]]] = {}
+        # Full-text index updated with every change, if any
+        self.text_index = text_index
+        if tickets is not None:
+            self.bulk_load(tickets)
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._tickets
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            return iter(list(self._tickets.values()))
+
+    def _unindex(self, ticket: Dict[str, Any]) -> None:
+        for field, index in self._indexes.items():
+            keys = index.get(ticket.get(field))
+            if keys is not None:
+                keys.pop(ticket["key"], None)
+                if not keys:
+                    del index[ticket.get(field)]
+
+    def _index(self, ticket: Dict[str, Any]) -> None:
+        for field, index in self._indexes.items():
+            index.setdefault(ticket.get(field), {})[ticket["key"]] = None
+
+    def put(self, ticket: Dict[str, Any]) -> None:
+        """Adds a ticket, or replaces the ticket with the same key."""
+        self.bulk_load([ticket])
+
+    def bulk_load(self, tickets: Iterable[Dict[str, Any]]) -> int:
+        """
+        Adds many tickets at once, replacing existing tickets with the same key.
+
+        Args:
+            tickets: Ticket dictionaries, each with at least a "key"
+
+        Returns:
+            Number of tickets loaded
+        """
+        count = 0
+        with self._lock:
+            self._sorted.clear()
+            if self.text_index is not None:
+                tickets = list(tickets)
+                self.text_index.bulk_load(tickets)
+            for ticket in tickets:
+                previous = self._tickets.pop(ticket["key"], None)
+                if previous is not None:
+                    self._unindex(previous)
+                self._tickets[ticket["key"]] = ticket
+                self._index(ticket)
+                count += 1
+        return count
+
+    def remove(self, key: str) -> Optional[Dict[str, Any]]:
+        """Removes a ticket and returns it, or None if there is no such ticket."""
+        with self._lock:
+            ticket = self._tickets.pop(key, None)
+            if ticket is not None:
+                self._unindex(ticket)
+                self._sorted.clear()
+                if self.text_index is not None:
+                    self.text_index.remove(key)
+            return ticket
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the ticket with the given key, or None."""
+        return self._tickets.get(key)
+
+    def find(self, **filters: Any) -> List[Dict[str, Any]]:
+        """
+        Returns the tickets whose fields equal all the given values.
+
+        Indexed fields (status, priority, assignee) are answered from their indexes; any other
+        field is checked on the tickets that matched the indexed ones.
+
+        Example:
+            store.find(status="Open", priority="High")
+        """
+        indexed = {field: value for field, value in filters.items() if field in self._indexes}
+        other = {field: value for field, value in filters.items() if field not in self._indexes}
+        with self._lock:
+            if indexed:
+                buckets = sorted(
+                    (self._indexes[field].get(value, {}) for field, value in indexed.items()),
+                    key=len
+                )
+                keys: Iterable[str] = (key for key in buckets[0] if all(key in bucket for bucket in buckets[1:]))
+                tickets = [self._tickets[key] for key in keys]
+            else:
+                tickets = list(self._tickets.values())
+        return [ticket for ticket in tickets if all(ticket.get(field) == value for field, value in other.items())]
+
+    def count(self, field: str) -> Dict[Any, int]:
+        """Returns the number of tickets per value of an indexed field."""
+        with self._lock:
+            return {value: len(keys) for value, keys in self._indexes[field].items()}
+
+    def _sorted_keys(self, bucket: Any) -> List[Tuple[Tuple[str, int, str], str]]:
+        """Returns the keys of a bucket (or of all tickets) in key order."""
+        if bucket not in self._sorted:
+            keys = self._tickets if bucket is None else self._indexes[bucket[0]].get(bucket[1], {})
+            self._sorted[bucket] = sorted((key_order(key), key) for key in keys)
+        return self._sorted[bucket]
+
+    def page(self, after: Optional[str] = None, limit: int = 50,
+             where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+             **filters: Any) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Returns one page of the tickets matching the filters, in key order.
+
+        Args:
+            after: Key of the last ticket of the previous page (None for the first page)
+            limit: Maximum number of tickets in the page
+            where: Extra condition a ticket must meet (e.g. an updated-since check)
+            **filters: Field values the tickets must equal, as in find()
+
+        Returns:
+            The tickets of the page and the key to pass as `after` for the next page, or None
+            if this is the last page
+        """
+        with self._lock:
+            indexed = [(field, value) for field, value in filters.items() if field in self._indexes]
+            bucket = min(indexed, key=lambda item: len(self._indexes[item[0]].get(item[1], {}))) if indexed else None
+            keys = self._sorted_keys(bucket)
+            position = bisect.bisect_right(keys, (key_order(after), after)) if after else 0
+
+            tickets: List[Dict[str, Any]] = []
+            for index in range(position, len(keys)):
+                ticket = self._tickets[keys[index][1]]
+                if all(ticket.get(field) == value for field, value in filters.items()) and (where is None or where(ticket)):
+                    if len(tickets) == limit:
+                        return tickets, tickets[-1]["key"]
+                    tickets.append(ticket)
+            return tickets, None
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[Dict[str, Any], float]]:
+        """Returns the k tickets that best match a full-text query, with their BM25 scores."""
+        if self.text_index is None:
+            raise ValueError("This ticket store has no full-text index")
+        with self._lock:
+            return [(self._tickets[key], score) for key, score in self.text_index.search(query, k)]
@@ -1,20 +1,17 @@
-import os
 from google.adk.agents import Agent
-from dotenv import load_dotenv
 
 # Import tools
 from .tools.testing_tool import generate_tests_tool
 
 # Import prompts
 from .prompt import return_instructions_testing_agent
-
-load_dotenv()
+from ...model_router import routed_agent_kwargs
+from ..registry import AGENT_SPECS
 
 # Create the testing agent
 testing_agent = Agent(
-    model=os.environ.get("VERTEX_MODEL", "gemini-1.5-pro"),
-    name="testing_agent",
-    description="Agent that generates tests for code implementations",
+    **routed_agent_kwargs("testing_agent", tier="large", slo_seconds=60),
+    description=AGENT_SPECS["testing"].description,
     instruction=return_instructions_testing_agent(),
     tools=[
         generate_tests_tool,
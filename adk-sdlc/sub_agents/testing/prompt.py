@@ -32,6 +32,11 @@ When writing tests:
 - Ensure tests are independent
 - Make tests repeatable and reliable
 
+ARTIFACT HANDLES:
+When you are given an implementation artifact_id, pass it to the test generation tool as implementation_artifact_id
+instead of asking for or copying the file contents. The tool returns a test artifact_id with a short summary;
+return those to the caller and do NOT copy test file contents into your response.
+
 Always ensure your test suites:
 - Cover all requirements
 - Are well-documented
@@ -1,3 +1,4 @@
 from .test_generator import generate_tests
+from .testing_tool import generate_tests_from_stream
 
-__all__ = ['generate_tests']
\ No newline at end of file
+__all__ = ['generate_tests', 'generate_tests_from_stream']
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""
+Static checks of single generated files, cheap enough to run on each file as it is streamed.
+
+Python files must parse and may not define a function or class twice; JSON files must parse.
+Other languages are passed through unchecked.
+"""
+import ast
+import json
+from typing import Any, Dict, List
+from ...tools.file_stream import GeneratedFile
+
+def _python_errors(file: GeneratedFile) -> List[str]:
+    try:
+        tree = ast.parse(file.content, filename=file.path)
+    except SyntaxError as e:
+        return [f"line {e.lineno}: {e.msg}"]
+    errors = []
+    # Names bound more than once at module level usually mean two generated versions of a function
+    seen = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if node.name in seen:
+                errors.append(f"line {node.lineno}: {node.name} is defined more than once")
+            seen.add(node.name)
+    return errors
+
+def check_file(file: GeneratedFile) -> Dict[str, Any]:
+    """
+    Runs the static checks for one file.
+
+    Returns:
+        {"path", "language", "checked": whether any check applies, "ok", "errors": [...]}
+    """
+    checked, errors = True, []
+    if file.language == "python":
+        errors = _python_errors(file)
+    elif file.language == "json":
+        try:
+            json.loads(file.content)
+        except ValueError as e:
+            errors = [str(e)]
+    else:
+        checked = False
+    return {"path": file.path, "language": file.language, "checked": checked, "ok": not errors, "errors": errors}
@@ -1,7 +1,16 @@
 from google.adk.tools import FunctionTool
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from ..prompt import return_instructions_testing_agent
+from ....model_router import cache_model
+from ...tools.artifact_store import resolve_files, store_result_files
+from ...tools.result_cache import ResultCache, cached_call, content_hash, normalize_text, prompt_version
+from ...tools.tracing import traced
 
-def generate_tests_func(code_implementation: Dict[str, Any], requirements: str = "") -> Dict[str, Any]:
+# Cache of generated tests, keyed by implementation, requirements, model and prompt version
+test_cache = ResultCache("test_generator")
+PROMPT_VERSION = prompt_version(return_instructions_testing_agent())
+
+def _generate_tests(code_implementation: Dict[str, Any], requirements: str = "") -> Dict[str, Any]:
     """
     Generates unit tests for the provided code implementation.
     Returns a dictionary containing test file paths and their content.
@@ -124,5 +133,46 @@ pytest==7.3.1
 """
     }
 
+@traced("testing")
+def generate_tests_func(
+    code_implementation: Optional[Dict[str, Any]] = None,
+    requirements: str = "",
+    bypass_cache: bool = False,
+    implementation_artifact_id: str = ""
+) -> Dict[str, Any]:
+    """
+    Generates unit tests for the provided code implementation.
+    Identical inputs for the same model and prompt version are served from the result cache.
+    The implementation is read from the artifact store when an artifact ID is given, and the
+    generated test files are written there as well.
+    
+    Args:
+        code_implementation: The code implementation to test (inline files or an artifact handle)
+        requirements: The requirements that the code should meet
+        bypass_cache: Regenerate even if cached tests exist
+        implementation_artifact_id: Artifact ID returned by the implementation tools
+        
+    Returns:
+        A dictionary containing the test artifact ID, a summary of the test files and setup instructions
+    """
+    try:
+        files = resolve_files(code_implementation, implementation_artifact_id)
+    except LookupError as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Failed to load the implementation from the artifact store"
+        }
+    
+    key = content_hash(
+        files,
+        normalize_text(requirements),
+        cache_model("large"),
+        PROMPT_VERSION
+    )
+    implementation = {**(code_implementation or {}), "files": files}
+    result = cached_call(test_cache, key, lambda: _generate_tests(implementation, requirements), bypass_cache)
+    return store_result_files(result, "tests")
+
 # Create the FunctionTool by passing the function directly
 generate_tests = FunctionTool(generate_tests_func)
\ No newline at end of file
@@ -1,7 +1,31 @@
+import contextvars
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from google.adk.tools import FunctionTool
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from ..prompt import return_instructions_testing_agent
+from .static_checks import check_file
+from ....model_router import cache_model
+from ....settings import get_settings
+from ...tools.artifact_store import resolve_files, store_result_files
+from ...tools.file_stream import FileStream, GeneratedFile
+from ...tools.result_cache import ResultCache, cached_call, content_hash, normalize_text, prompt_version
+from ...tools.tracing import traced
+
+# Cache of generated tests, keyed by implementation, requirements, model and prompt version
+testing_cache = ResultCache("testing")
+PROMPT_VERSION = prompt_version(return_instructions_testing_agent())
+
+# Streamed test generations not yet picked up by generate_tests, by implementation artifact ID
+# and normalized requirements; the oldest are cancelled (if not yet running) and dropped
+HANDOFF_ENTRIES = 64
+_handoffs: "OrderedDict[Tuple[str, str], Future]" = OrderedDict()
+_handoff_lock = threading.Lock()
+_handoff_pool = None
 
-def generate_tests(code_implementation: Dict[str, Any], requirements: str = "") -> Dict[str, Any]:
+def _generate_tests(code_implementation: Dict[str, Any], requirements: str = "") -> Dict[str, Any]:
     """
     Generates unit tests for the provided code implementation.
     Returns a dictionary containing test file paths and their content.
@@ -124,5 +148,177 @@ pytest==7.3.1
 """
     }
 
+@traced("testing")
+def generate_tests(
+    code_implementation: Optional[Dict[str, Any]] = None,
+    requirements: str = "",
+    bypass_cache: bool = False,
+    implementation_artifact_id: str = ""
+) -> Dict[str, Any]:
+    """
+    Generates unit tests for the provided code implementation.
+    Identical inputs for the same model and prompt version are served from the result cache.
+    The implementation is read from the artifact store when an artifact ID is given, and the
+    generated test files are written there as well. Tests that were already generated for the
+    same requirements while the implementation was streamed (SPECULATIVE_TESTS) are returned
+    without generating them again.
+    
+    Args:
+        code_implementation: The code implementation to test (inline files or an artifact handle)
+        requirements: The requirements that the code should meet
+        bypass_cache: Regenerate even if cached tests exist
+        implementation_artifact_id: Artifact ID returned by the implementation tools
+        
+    Returns:
+        A dictionary containing the test artifact ID, a summary of the test files and setup instructions
+    """
+    artifact_id = implementation_artifact_id or (code_implementation or {}).get("artifact_id", "")
+    streamed = None if bypass_cache else _take_handoff(artifact_id, requirements)
+    if streamed is not None:
+        return streamed
+
+    try:
+        files = resolve_files(code_implementation, implementation_artifact_id)
+    except LookupError as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Failed to load the implementation from the artifact store"
+        }
+    
+    key = content_hash(
+        files,
+        normalize_text(requirements),
+        cache_model("large"),
+        PROMPT_VERSION
+    )
+    implementation = {**(code_implementation or {}), "files": files}
+    result = cached_call(testing_cache, key, lambda: _generate_tests(implementation, requirements), bypass_cache)
+    return store_result_files(result, "tests")
+
+def _is_source(file: GeneratedFile) -> bool:
+    """Whether tests are generated for a file: Python modules other than packages and tests."""
+    name = os.path.basename(file.path)
+    return (file.language == "python" and name != "__init__.py" and not name.startswith("test_")
+            and "tests" not in file.path.split("/")[:-1])
+
+def _tests_for_file(file: GeneratedFile, requirements: str, bypass_cache: bool) -> Dict[str, Any]:
+    key = content_hash(
+        {file.path: file.sha256},
+        normalize_text(requirements),
+        cache_model("large"),
+        PROMPT_VERSION
+    )
+    return cached_call(testing_cache, key, lambda: _generate_tests({"files": {file.path: file.content}}, requirements), bypass_cache)
+
+def _merge_tests(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merges per-file test results in stream order; the first version of a shared file wins."""
+    files: Dict[str, str] = {}
+    for result in results:
+        for path, content in (result.get("files") or {}).items():
+            files.setdefault(path, content)
+    return {
+        "files": files,
+        "setup_instructions": next((result["setup_instructions"] for result in results if result.get("setup_instructions")), ""),
+        "cache_hit": bool(results) and all(result.get("cache_hit") for result in results)
+    }
+
+def generate_tests_from_stream(stream: FileStream, requirements: str = "", bypass_cache: bool = False,
+                               max_workers: int = 0) -> Dict[str, Any]:
+    """
+    Runs static checks and test generation on a streamed implementation as its files arrive.
+
+    Every file is checked on its own (see static_checks) and tests are generated per Python
+    source module, both on a worker pool while later files are still being generated. If the
+    implementation has no Python modules, tests are generated for the whole implementation
+    once the stream ends.
+
+    Args:
+        stream: The FileStream returned by stream_implementation or stream_code_func
+        requirements: The requirements that the code should meet
+        bypass_cache: Regenerate tests even if cached ones exist
+        max_workers: Checks and test generations run at the same time (defaults to TEST_STREAM_WORKERS)
+
+    Returns:
+        A dictionary with the implementation handle, the static check results and the test
+        artifact handle
+    """
+    with ThreadPoolExecutor(max_workers=max(1, max_workers or get_settings().test_stream_workers)) as pool:
+        checks, tests = [], []
+        for file in stream:
+            checks.append(pool.submit(check_file, file))
+            if _is_source(file):
+                tests.append(pool.submit(_tests_for_file, file, requirements, bypass_cache))
+        implementation = stream.result()
+        check_results = [future.result() for future in checks]
+        test_results = [future.result() for future in tests]
+
+    if implementation.get("success") is False:
+        return {
+            "success": False,
+            "error": implementation.get("error", "Implementation generation failed"),
+            "implementation": implementation,
+            "message": "Failed to generate the implementation"
+        }
+    if test_results:
+        test_result = _merge_tests(test_results)
+    else:
+        files = {file.path: file.content for file in stream.files}
+        test_result = _generate_tests({"files": files}, requirements)
+    failed = [check for check in check_results if not check["ok"]]
+    return {
+        "success": not failed,
+        "implementation": implementation,
+        "static_checks": check_results,
+        "tests": store_result_files(test_result, "tests"),
+        "message": (f"Static checks failed for {len(failed)} of {len(check_results)} files" if failed
+                    else f"Checked {len(check_results)} files and generated tests for {len(test_results)} modules" if test_results
+                    else f"Checked {len(check_results)} files and generated tests for the whole implementation")
+    }
+
+def start_tests_from_stream(stream: FileStream, requirements: str = "") -> Future:
+    """
+    Runs generate_tests_from_stream on a background thread, so tests are generated while the
+    caller keeps consuming the same stream. Pass the future to hand_off_tests once the
+    implementation's artifact ID is known, or cancel it if no generate_tests call will follow.
+    """
+    global _handoff_pool
+    with _handoff_lock:
+        if _handoff_pool is None:
+            _handoff_pool = ThreadPoolExecutor(max_workers=max(1, get_settings().test_stream_workers),
+                                               thread_name_prefix="test-stream")
+    # The run deadline and trace context carry over to the background generation
+    return _handoff_pool.submit(contextvars.copy_context().run, generate_tests_from_stream, stream, requirements)
+
+def hand_off_tests(implementation_artifact_id: str, requirements: str, tests: Future) -> None:
+    """
+    Registers streamed tests, so generate_tests for this implementation and requirements
+    returns them instead of starting over.
+    """
+    key = (implementation_artifact_id, normalize_text(requirements))
+    with _handoff_lock:
+        replaced = _handoffs.pop(key, None)
+        _handoffs[key] = tests
+        evicted = [_handoffs.popitem(last=False)[1] for _ in range(len(_handoffs) - HANDOFF_ENTRIES)]
+    for future in evicted + ([replaced] if replaced is not None else []):
+        future.cancel()
+
+def _take_handoff(implementation_artifact_id: str, requirements: str) -> Optional[Dict[str, Any]]:
+    """Waits for the streamed tests of an implementation; None if there are none or they failed."""
+    if not implementation_artifact_id:
+        return None
+    with _handoff_lock:
+        tests = _handoffs.pop((implementation_artifact_id, normalize_text(requirements)), None)
+    if tests is None:
+        return None
+    try:
+        streamed = tests.result()
+    except Exception:
+        return None
+    if "tests" not in streamed:
+        return None
+    failed = [check for check in streamed["static_checks"] if not check["ok"]]
+    return {**streamed["tests"], "static_check_failures": failed, "message": streamed["message"]}
+
 # Create the FunctionTool
 generate_tests_tool = FunctionTool(generate_tests)
\ No newline at end of file
@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Any, Optional
+from ...settings import get_settings
+
+# Default location of the artifact store
+DEFAULT_ARTIFACT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    ".cache", "artifacts"
+)
+
+# File extensions mapped to the language reported in artifact summaries
+LANGUAGES = {
+    ".py": "python",
+    ".java": "java",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".go": "go",
+    ".md": "markdown",
+    ".txt": "text",
+    ".json": "json",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".toml": "toml",
+}
+
+# Artifact IDs and blob digests as save_files writes them; anything else is never a file name
+ARTIFACT_ID = re.compile(r"^art-[0-9a-f]{16}$")
+DIGEST = re.compile(r"^[0-9a-f]{64}$")
+
+def detect_language(path: str) -> str:
+    """Returns the language of a file based on its extension."""
+    return LANGUAGES.get(os.path.splitext(path)[1].lower(), "text")
+
+class ArtifactStore:
+    """
+    Local store for generated files, so stages can pass small handles instead of file contents.
+
+    File contents are stored once as content-addressed blobs (named by their SHA-256). An
+    artifact is a manifest mapping file paths to blob hashes; its ID is the hash of that
+    mapping, so identical file sets always get the same artifact ID.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or get_settings().artifact_store_dir or DEFAULT_ARTIFACT_DIR
+        self._blob_dir = os.path.join(self.root, "blobs")
+        self._manifest_dir = os.path.join(self.root, "manifests")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self._blob_dir, digest[:2], digest)
+
+    def _write(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def put_blob(self, data: bytes) -> str:
+        """Stores bytes (once) and returns their SHA-256 hex digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            self._write(path, data)
+        return digest
+
+    def get_blob(self, digest: str) -> bytes:
+        """Returns the bytes stored under a digest. Raises LookupError if there are none."""
+        if not DIGEST.match(digest or ""):
+            raise LookupError(f"Invalid blob digest {digest!r}")
+        try:
+            with open(self._blob_path(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise LookupError(f"Blob {digest} not found")
+
+    def save_files(self, files: Dict[str, str], kind: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Stores a set of files as an artifact.
+
+        Args:
+            files: Mapping of file path to file content
+            kind: What produced the files (e.g. "implementation", "tests")
+            metadata: Small extra information to keep with the artifact (e.g. setup instructions)
+
+        Returns:
+            The artifact manifest
+        """
+        entries = {}
+        for path, content in sorted(files.items()):
+            data = content.encode("utf-8")
+            entries[path] = {
+                "sha256": self.put_blob(data),
+                "bytes": len(data),
+                "lines": content.count("\n") + 1 if content else 0,
+                "language": detect_language(path)
+            }
+
+        digest = hashlib.sha256(
+            json.dumps({path: entry["sha256"] for path, entry in entries.items()}, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        manifest = {
+            "artifact_id": f"art-{digest[:16]}",
+            "kind": kind,
+            "files": entries,
+            "metadata": metadata or {},
+            "created_at": time.time()
+        }
+        self._write(
+            os.path.join(self._manifest_dir, f"{manifest['artifact_id']}.json"),
+            json.dumps(manifest, indent=2).encode("utf-8")
+        )
+        return manifest
+
+    def load_manifest(self, artifact_id: str) -> Dict[str, Any]:
+        """Returns the manifest of an artifact. Raises LookupError if it does not exist or the ID is malformed."""
+        if not isinstance(artifact_id, str) or not ARTIFACT_ID.match(artifact_id):
+            raise LookupError(f"Invalid artifact ID {artifact_id!r}")
+        try:
+            with open(os.path.join(self._manifest_dir, f"{artifact_id}.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise LookupError(f"Artifact {artifact_id} not found")
+
+    def load_files(self, artifact_id: str) -> Dict[str, str]:
+        """
+        Returns the files of an artifact as a mapping of path to content. Raises LookupError if
+        the artifact or one of its blobs does not exist.
+        """
+        manifest = self.load_manifest(artifact_id)
+        try:
+            return {
+                path: self.get_blob(entry["sha256"]).decode("utf-8")
+                for path, entry in manifest["files"].items()
+            }
+        except LookupError as e:
+            raise LookupError(f"Artifact {artifact_id} is incomplete: {e}")
+
+def summarize(manifest: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the small, model-facing description of an artifact."""
+    return {
+        "artifact_id": manifest["artifact_id"],
+        "kind": manifest["kind"],
+        "file_count": len(manifest["files"]),
+        "total_bytes": sum(entry["bytes"] for entry in manifest["files"].values()),
+        "files": [
+            {"path": path, "language": entry["language"], "lines": entry["lines"], "bytes": entry["bytes"]}
+            for path, entry in manifest["files"].items()
+        ]
+    }
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_artifact_store() -> ArtifactStore:
+    """Returns the process-wide artifact store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore()
+        return _store
+
+def store_result_files(result: Dict[str, Any], kind: str, files_key: str = "files") -> Dict[str, Any]:
+    """
+    Moves the files of a generator result into the artifact store.
+
+    Args:
+        result: Generator result containing a path -> content mapping under files_key
+        kind: What produced the files (e.g. "implementation", "tests")
+        files_key: Key of the files mapping in the result
+
+    Returns:
+        A copy of the result where the files are replaced by the artifact ID and a summary
+    """
+    files = result.get(files_key)
+    if not isinstance(files, dict):
+        return result
+    manifest = get_artifact_store().save_files(files, kind, {"setup_instructions": result.get("setup_instructions", "")})
+    handle = {key: value for key, value in result.items() if key != files_key}
+    handle["artifact_id"] = manifest["artifact_id"]
+    handle["artifact"] = summarize(manifest)
+    return handle
+
+def resolve_files(payload: Optional[Dict[str, Any]] = None, artifact_id: str = "", files_key: str = "files") -> Dict[str, str]:
+    """
+    Returns the files a stage should work on, reading them from the artifact store if needed.
+
+    Args:
+        payload: Stage output that either contains the files inline or an "artifact_id"
+        artifact_id: Explicit artifact ID; takes precedence over the payload
+        files_key: Key of the inline files mapping in the payload
+
+    Returns:
+        A mapping of file path to content (empty if nothing was given)
+    """
+    payload = payload or {}
+    artifact_id = artifact_id or payload.get("artifact_id", "")
+    if artifact_id:
+        return get_artifact_store().load_files(artifact_id)
+    files = payload.get(files_key)
+    return files if isinstance(files, dict) else {}
@@ -0,0 +1,163 @@
+"""
+Per-run deadlines and hedged reads.
+
+A deadline is an absolute time stored in a context variable. The batch tools set one per
+run and the orchestrator wrappers set a default one per call; it follows the call into
+sub-agents (ADK runs them in a copy of the caller's context) and bounds every HTTP request
+(request_timeout), model call and idempotent sub-agent call (call_with_deadline) on the way.
+Calls with side effects, such as the PR stage, are never abandoned; their HTTP and model
+calls fail at the deadline instead.
+
+Idempotent reads can be hedged (HEDGE_READS=true): if the first attempt has not answered
+by the p95 latency of earlier calls, a second one is sent and whichever answers first wins.
+"""
+import asyncio
+import contextlib
+import contextvars
+import queue
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+from ...settings import get_settings
+from .latency import LatencyHistory
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("deadline", default=None)
+
+# Latency of hedgeable reads, per call name
+read_latency = LatencyHistory()
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the deadline of the current run has passed."""
+
+def current_deadline() -> Optional[float]:
+    """Returns the deadline of the current run as a time.monotonic() value, or None."""
+    return _deadline.get()
+
+def remaining() -> Optional[float]:
+    """Returns the seconds left before the deadline, or None if there is no deadline."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+@contextlib.contextmanager
+def deadline_scope(seconds: Optional[float] = None, until: Optional[float] = None) -> Iterator[Optional[float]]:
+    """
+    Runs the block under a deadline. An enclosing deadline that is earlier still applies.
+
+    Args:
+        seconds: Deadline relative to now
+        until: Absolute deadline as a time.monotonic() value (e.g. shared by all tickets of a run)
+    """
+    candidates = [deadline for deadline in (
+        _deadline.get(),
+        until,
+        time.monotonic() + seconds if seconds else None
+    ) if deadline is not None]
+    token = _deadline.set(min(candidates) if candidates else None)
+    try:
+        yield _deadline.get()
+    finally:
+        _deadline.reset(token)
+
+def check_deadline(what: str = "call") -> None:
+    """Raises DeadlineExceeded if the deadline has already passed."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {what}")
+
+def request_timeout(cap: Optional[float] = None) -> float:
+    """Returns the timeout to pass to an HTTP request: the time left in the run, at most cap (HTTP_TIMEOUT_SECONDS)."""
+    check_deadline("HTTP request")
+    if cap is None:
+        cap = get_settings().http_timeout_seconds
+    left = remaining()
+    return cap if left is None else min(cap, left)
+
+async def next_before_deadline(iterator: AsyncIterator[Any], what: str = "call") -> Any:
+    """
+    Awaits the next item of an async iterator, but only until the deadline.
+
+    Raises StopAsyncIteration when the iterator is exhausted and DeadlineExceeded when the
+    deadline passes first.
+    """
+    check_deadline(what)
+    left = remaining()
+    if left is None:
+        return await iterator.__anext__()
+    try:
+        return await asyncio.wait_for(iterator.__anext__(), left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"Deadline exceeded while waiting for {what}")
+
+def _spawn(results: "queue.Queue", func: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+    """Runs func on a daemon thread in a copy of the current context and queues its outcome."""
+    context = contextvars.copy_context()
+
+    def attempt() -> None:
+        started = time.perf_counter()
+        try:
+            results.put((True, func(*args, **kwargs), time.perf_counter() - started))
+        except Exception as e:
+            results.put((False, e, time.perf_counter() - started))
+
+    threading.Thread(target=context.run, args=(attempt,), daemon=True).start()
+
+def call_with_deadline(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Calls func and waits for it only until the deadline.
+
+    A call that is still running at the deadline is abandoned on its daemon thread and
+    DeadlineExceeded is raised, so one hung call cannot hold up the whole run. The abandoned
+    call keeps running, so only use this for calls that are safe to repeat (no writes).
+    """
+    if remaining() is None:
+        return func(*args, **kwargs)
+    check_deadline(getattr(func, "__name__", "call"))
+    results: "queue.Queue" = queue.Queue()
+    _spawn(results, func, args, kwargs)
+    try:
+        ok, value, _ = results.get(timeout=max(0.0, remaining()))
+    except queue.Empty:
+        raise DeadlineExceeded(f"Deadline exceeded while waiting for {getattr(func, '__name__', 'call')}")
+    if not ok:
+        raise value
+    return value
+
+def hedged_call(name: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Performs an idempotent read, sending a second attempt if the first is slower than usual.
+
+    Args:
+        name: Name of the read; its p95 latency decides when the second attempt is sent
+        func: The read to perform; must be safe to run twice
+        *args, **kwargs: Arguments for func
+
+    Returns:
+        The result of whichever attempt succeeded first
+    """
+    if not get_settings().hedge_reads:
+        return func(*args, **kwargs)
+    check_deadline(name)
+    results: "queue.Queue" = queue.Queue()
+    _spawn(results, func, args, kwargs)
+    hedge_after = read_latency.p95(name) or None
+    attempts, failures, failure = 1, 0, None
+
+    while True:
+        left = remaining()
+        hedging = attempts == 1 and hedge_after is not None and (left is None or left > hedge_after)
+        timeout = hedge_after if hedging else left
+        try:
+            ok, value, seconds = results.get(timeout=None if timeout is None else max(0.0, timeout))
+        except queue.Empty:
+            if hedging:
+                _spawn(results, func, args, kwargs)
+                attempts += 1
+                continue
+            raise DeadlineExceeded(f"Deadline exceeded while waiting for {name}")
+        if ok:
+            read_latency.record(name, seconds)
+            return value
+        failures += 1
+        failure = failure or value
+        if failures == attempts:
+            raise failure
@@ -0,0 +1,104 @@
+"""
+Streams generated files from a generator to the stages that consume them.
+
+A generator that produces files one at a time (a model emitting one file block after another)
+is wrapped in a FileStream. Every file is written to the artifact store as soon as it arrives
+and handed on as a GeneratedFile with its path, content, language and SHA-256, so tests and
+static checks can start on the first file while later ones are still being generated. Once
+the stream is exhausted, result() saves the artifact manifest and returns the same handle as
+store_result_files.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple
+from .artifact_store import detect_language, get_artifact_store, store_result_files
+
+# A file source yields (path, content) pairs and may return extra result fields
+FileSource = Generator[Tuple[str, str], None, Optional[Dict[str, Any]]]
+
+@dataclass(frozen=True)
+class GeneratedFile:
+    """One generated file, already stored as an artifact blob under its sha256."""
+    path: str
+    content: str
+    language: str
+    sha256: str
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns the file's description without its content."""
+        return {
+            "path": self.path,
+            "language": self.language,
+            "sha256": self.sha256,
+            "bytes": len(self.content.encode("utf-8")),
+            "lines": self.content.count("\n") + 1 if self.content else 0
+        }
+
+class FileStream:
+    """
+    Single-pass stream of generated files.
+
+    Iterating yields each file as the source produces it; iterating again (or after result())
+    replays the files already produced. The value the source returns (e.g. setup_instructions,
+    success, cache_hit) becomes part of result().
+    """
+
+    def __init__(self, source: FileSource, kind: str, files_key: str = "files"):
+        self.kind = kind
+        self.files_key = files_key
+        self._source = source
+        self._files: List[GeneratedFile] = []
+        self._extra: Dict[str, Any] = {}
+        self._done = False
+        self._result: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[GeneratedFile]:
+        position = 0
+        while True:
+            with self._lock:
+                if position < len(self._files):
+                    file = self._files[position]
+                elif self._done:
+                    return
+                else:
+                    file = self._next()
+                    if file is None:
+                        return
+            position += 1
+            yield file
+
+    def _next(self) -> Optional[GeneratedFile]:
+        try:
+            path, content = next(self._source)
+        except StopIteration as stop:
+            self._extra = stop.value or {}
+            self._done = True
+            return None
+        file = GeneratedFile(path, content, detect_language(path), get_artifact_store().put_blob(content.encode("utf-8")))
+        self._files.append(file)
+        return file
+
+    @property
+    def files(self) -> List[GeneratedFile]:
+        """The files produced so far."""
+        with self._lock:
+            return list(self._files)
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Waits for the rest of the stream and stores the files as one artifact.
+
+        Returns:
+            The source's result fields with the artifact_id and artifact summary, as returned
+            by the non-streaming generators; a failed source without files is returned as is
+        """
+        for _ in self:
+            pass
+        with self._lock:
+            if self._result is None:
+                result = dict(self._extra)
+                if self._files or result.get("success", True):
+                    result[self.files_key] = {file.path: file.content for file in self._files}
+                self._result = store_result_files(result, self.kind, files_key=self.files_key)
+            return self._result
@@ -0,0 +1,201 @@
+"""
+Shared HTTP response cache for idempotent GitHub and JIRA reads.
+
+Responses that carry an ETag or Last-Modified validator are kept in two tiers: an in-memory
+LRU of the most recently used entries in front of a disk cache (see result_cache) that
+survives across runs. A cached response younger than the TTL floor (or the server's
+Cache-Control max-age, if longer) is served without any request. An older one is revalidated
+with If-None-Match / If-Modified-Since; a 304 Not Modified refreshes the entry and serves the
+cached body, and its rate-limit token is given back, since GitHub does not count 304s against
+the quota either.
+
+Entries are keyed by the URL, query parameters and credentials of the request, so callers
+with different access never share a response.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from ...settings import get_settings
+from .rate_limiter import refund
+from .result_cache import DEFAULT_CACHE_DIR, ResultCache, content_hash
+
+def _enabled() -> bool:
+    return not get_settings().http_cache_disabled
+
+def _max_age(cache_control: str) -> Optional[float]:
+    for directive in cache_control.split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() == "max-age":
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+class CachedResponse:
+    """The parts of a requests.Response the callers use, rebuilt from a cache entry."""
+
+    def __init__(self, entry: Dict[str, Any]):
+        self.status_code = entry["status"]
+        self.headers = entry["headers"]
+        self.text = entry["body"]
+        self.url = entry["url"]
+        self.from_cache = True
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+class HttpCache:
+    """
+    Two-tier (memory LRU and disk) cache of validated HTTP responses.
+
+    Arguments that are not given come from the settings (HTTP_CACHE_*) when the cache is created.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl_seconds: Optional[float] = None,
+                 memory_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        settings = get_settings()
+        self.ttl_seconds = settings.http_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.memory_entries = memory_entries or settings.http_cache_memory_entries
+        self.disk = ResultCache(
+            "http",
+            directory=directory or settings.http_cache_dir or os.path.dirname(DEFAULT_CACHE_DIR),
+            max_bytes=max_bytes or settings.http_cache_max_bytes
+        )
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # fresh: served without a request; revalidated: 304; misses: full responses
+        self.fresh = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+        entry = self.disk.get(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, endpoint: str, func: Callable[..., Any], url: str, params: Optional[Dict[str, Any]] = None,
+            headers: Optional[Dict[str, str]] = None, ttl_seconds: Optional[float] = None, **kwargs: Any) -> Any:
+        """
+        Performs a GET through the cache.
+
+        Args:
+            endpoint: Rate-limited endpoint the request counts against ("github", "jira")
+            func: The rate-limited GET to send on a miss (e.g. rate_limited("github", requests.get))
+            url: Request URL
+            params: Query parameters
+            headers: Request headers; the Authorization header is part of the cache key
+            ttl_seconds: Overrides the TTL floor for this request (0 always revalidates)
+            **kwargs: Further arguments for func (auth, timeout, ...)
+
+        Returns:
+            The response, or a CachedResponse with the same status, headers and body
+        """
+        headers = dict(headers or {})
+        if not _enabled():
+            return func(url, params=params, headers=headers, **kwargs)
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        key = content_hash(url, params, headers.get("Authorization"), kwargs.get("auth"))
+        entry = self._get(key)
+        now = time.time()
+        # An explicit ttl_seconds=0 revalidates even within the response's max-age
+        fresh_for = ttl if ttl_seconds == 0 else max(ttl, entry.get("max_age", 0) if entry else 0)
+        if entry is not None and now - entry["stored_at"] < fresh_for:
+            self._count("fresh")
+            return CachedResponse(entry)
+
+        if entry is not None:
+            if entry["headers"].get("ETag"):
+                headers["If-None-Match"] = entry["headers"]["ETag"]
+            if entry["headers"].get("Last-Modified"):
+                headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        response = func(url, params=params, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            # Not Modified costs no quota
+            refund(endpoint)
+            entry = {**entry, "stored_at": now}
+            # The disk copy keeps its old timestamp; a later run revalidates it once more
+            self._remember(key, entry)
+            self._count("revalidated")
+            return CachedResponse(entry)
+
+        self._count("misses")
+        cache_control = response.headers.get("Cache-Control", "")
+        validators = {name: response.headers.get(name) for name in ("ETag", "Last-Modified") if response.headers.get(name)}
+        if response.status_code == 200 and validators and "no-store" not in cache_control.lower():
+            entry = {
+                "url": url,
+                "status": 200,
+                "headers": {"Content-Type": response.headers.get("Content-Type", ""), **validators},
+                "body": response.text,
+                "stored_at": now,
+                "max_age": _max_age(cache_control) or 0
+            }
+            self._remember(key, entry)
+            self.disk.put(key, entry)
+        return response
+
+    def clear(self) -> None:
+        """Drops every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit counters; revalidated responses count as hits."""
+        with self._lock:
+            lookups = self.fresh + self.revalidated + self.misses
+            return {
+                "fresh": self.fresh,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "hit_rate": round((self.fresh + self.revalidated) / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_evictions": self.disk.evictions
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_http_cache() -> HttpCache:
+    """Returns the process-wide HTTP cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
+
+def cached(endpoint: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wraps a rate-limited GET (e.g. github_get) so it goes through the shared HTTP cache.
+
+    The wrapper takes the arguments of func plus ttl_seconds, which overrides the TTL floor
+    for one read (0 always revalidates).
+    """
+    def wrapper(url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+                ttl_seconds: Optional[float] = None, **kwargs: Any) -> Any:
+        return get_http_cache().get(endpoint, func, url, params=params, headers=headers, ttl_seconds=ttl_seconds, **kwargs)
+
+    wrapper.__name__ = getattr(func, "__name__", "request")
+    return wrapper
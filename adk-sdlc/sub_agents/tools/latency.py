@@ -0,0 +1,38 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+class LatencyHistory:
+    """
+    Rolling window of measured call latencies per key (a model, an endpoint, ...).
+
+    Only the last `window` samples younger than `max_age_seconds` count, so the percentiles
+    follow the current behavior of the key rather than its whole history.
+    """
+
+    def __init__(self, window: int = 50, max_age_seconds: float = 300.0, min_samples: int = 5):
+        self.window = window
+        self.max_age_seconds = max_age_seconds
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append((time.monotonic(), seconds))
+
+    def p95(self, key: str) -> float:
+        """Returns the nearest-rank p95 latency of a key, or 0.0 while it has too few recent samples."""
+        cutoff = time.monotonic() - self.max_age_seconds
+        with self._lock:
+            samples = sorted(seconds for recorded, seconds in self._samples.get(key, ()) if recorded >= cutoff)
+        if len(samples) < self.min_samples:
+            return 0.0
+        return samples[max(0, -(-95 * len(samples) // 100) - 1)]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the sample count and p95 of every key."""
+        with self._lock:
+            keys = list(self._samples)
+        return {key: {"samples": len(self._samples[key]), "p95_seconds": round(self.p95(key), 3)} for key in keys}
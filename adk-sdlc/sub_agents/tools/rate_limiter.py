@@ -0,0 +1,293 @@
+"""
+Shared rate limiting for GitHub, JIRA and model calls.
+
+Every endpoint has one token bucket for the whole process, so concurrent runs share its
+budget instead of each retrying on its own. Callers that find the bucket empty wait in a
+fair queue: waiters are grouped by run ID and served round-robin, so one large batch cannot
+starve a small one.
+
+Buckets adapt to what the server says. A 429 (or any Retry-After) pauses the bucket for the
+requested time and halves its rate; X-RateLimit-Remaining / X-RateLimit-Reset cap the rate
+so the remaining budget lasts until the reset. After that the rate climbs back to its
+configured maximum in small steps, so throughput stays steady instead of bursting into the
+next limit. Requests the server does not count, like the 304 revalidations of the HTTP cache,
+give their token back.
+"""
+import asyncio
+import email.utils
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional
+from ...settings import get_settings
+from .deadline import DeadlineExceeded, remaining
+from .tracing import current_run_id
+
+# Bucket capacity, in seconds of traffic at the configured rate
+BURST_SECONDS = 2.0
+
+# Pause after a 429 that did not say how long to wait
+DEFAULT_BACKOFF_SECONDS = 5.0
+
+# Lowest rate a bucket is slowed down to, in requests per second
+MIN_RATE = 0.1
+
+# Share of the configured rate regained per successful response
+RATE_INCREASE = 0.1
+
+def _enabled() -> bool:
+    return not get_settings().rate_limiting_disabled
+
+def rate_limits() -> Dict[str, float]:
+    """Returns the configured maximum requests per second per endpoint; 0 means unlimited."""
+    settings = get_settings()
+    return {
+        "github": settings.rate_limit_github_rps,
+        "jira": settings.rate_limit_jira_rps,
+        "model": settings.rate_limit_model_rps,
+    }
+
+def _header(headers: Mapping[str, Any], name: str) -> Optional[str]:
+    for key, value in headers.items():
+        if key.lower() == name.lower():
+            return str(value)
+    return None
+
+def _number_header(headers: Mapping[str, Any], name: str) -> Optional[float]:
+    """Returns a numeric header, or None if it is missing or not a finite number (e.g. an ISO-8601 date)."""
+    value = _header(headers, name)
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+def _retry_after(headers: Mapping[str, Any]) -> Optional[float]:
+    """Parses Retry-After, given either in seconds or as an HTTP date."""
+    value = _header(headers, "Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Token bucket with a fair queue of waiters and a rate that follows server feedback."""
+
+    def __init__(self, name: str, rate: float, burst: Optional[float] = None):
+        self.name = name
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst or max(1.0, rate * BURST_SECONDS)
+        self.tokens = self.burst
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        # Waiters per run, and the order in which runs take their turn
+        self._queues: Dict[str, Deque[object]] = {}
+        self._turns: Deque[str] = deque()
+        self._acquired = 0
+        self._throttled = 0
+        self._refunded = 0
+        self._waited_seconds = 0.0
+
+    def _wait_seconds(self, now: float) -> float:
+        """Refills the bucket and returns how long until the next token is available."""
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def try_acquire(self) -> bool:
+        """Takes a token if one is available and nobody is waiting."""
+        with self._cond:
+            if self._turns or self._wait_seconds(time.monotonic()) > 0:
+                return False
+            self.tokens -= 1
+            self._acquired += 1
+            return True
+
+    def acquire(self, run: str = "") -> float:
+        """
+        Waits for a token, taking turns with the waiters of other runs.
+
+        Args:
+            run: Run the caller belongs to; waiters of different runs are served round-robin
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            DeadlineExceeded: If the run's deadline would pass before a token is available
+        """
+        with self._cond:
+            waiter = object()
+            queue = self._queues.setdefault(run, deque())
+            if not queue:
+                self._turns.append(run)
+            queue.append(waiter)
+            started = time.monotonic()
+            acquired = False
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if self._turns[0] == run and queue[0] is waiter:
+                        wait = self._wait_seconds(now)
+                        if wait <= 0:
+                            self.tokens -= 1
+                            acquired = True
+                            break
+                    left = remaining()
+                    if left is not None:
+                        if left <= 0 or (wait is not None and wait > left):
+                            raise DeadlineExceeded(f"Deadline exceeded while waiting for the {self.name} rate limit")
+                        wait = left if wait is None else wait
+                    self._cond.wait(wait)
+            finally:
+                queue.remove(waiter)
+                if acquired or not queue:
+                    self._turns.remove(run)
+                if queue and acquired:
+                    self._turns.append(run)
+                if not queue:
+                    del self._queues[run]
+                self._cond.notify_all()
+            waited = time.monotonic() - started
+            self._acquired += 1
+            self._waited_seconds += waited
+            return waited
+
+    def refund(self) -> None:
+        """Gives back the token of a request the server did not count (e.g. a 304 Not Modified)."""
+        with self._cond:
+            self.tokens = min(self.burst, self.tokens + 1)
+            self._refunded += 1
+            self._cond.notify_all()
+
+    def observe(self, status: Optional[int] = None, headers: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Adapts the bucket to a response.
+
+        Args:
+            status: HTTP status of the response (429 for quota errors without HTTP)
+            headers: Response headers (Retry-After, X-RateLimit-Remaining, X-RateLimit-Reset)
+        """
+        headers = headers or {}
+        retry_after = _retry_after(headers)
+        budget_left = _number_header(headers, "X-RateLimit-Remaining")
+        reset = _number_header(headers, "X-RateLimit-Reset")
+        with self._cond:
+            now = time.monotonic()
+            if status == 429 or retry_after is not None or (status == 403 and budget_left == 0):
+                # Throttled: back off as told and slow down, so retries do not all land at once
+                pause = retry_after if retry_after is not None else DEFAULT_BACKOFF_SECONDS
+                if retry_after is None and budget_left == 0 and reset is not None:
+                    pause = max(0.0, reset - time.time())
+                if now >= self.paused_until:
+                    # Slow down once per episode, not once per request that was already in flight
+                    self.rate = max(MIN_RATE, self.rate / 2)
+                self.paused_until = max(self.paused_until, now + pause)
+                self.tokens = min(self.tokens, 0.0)
+                self._throttled += 1
+            else:
+                ceiling = self.max_rate
+                if budget_left is not None and reset is not None:
+                    # Spread what is left of the budget over the time until it resets
+                    window = max(1.0, reset - time.time())
+                    ceiling = min(ceiling, max(0.0, budget_left) / window)
+                    if budget_left <= 0:
+                        self.paused_until = max(self.paused_until, now + window)
+                self.rate = max(MIN_RATE, min(ceiling, self.rate + self.max_rate * RATE_INCREASE))
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the current rate and counters of the bucket."""
+        with self._cond:
+            return {
+                "endpoint": self.name,
+                "rate_per_second": round(self.rate, 3),
+                "max_rate_per_second": self.max_rate,
+                "acquired": self._acquired,
+                "throttled": self._throttled,
+                "refunded": self._refunded,
+                "waited_seconds": round(self._waited_seconds, 3),
+                "waiting": sum(len(queue) for queue in self._queues.values())
+            }
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(endpoint: str) -> Optional[TokenBucket]:
+    """
+    Returns the shared bucket of an endpoint, or None if it is not rate-limited.
+
+    Endpoints may carry a suffix after a colon (e.g. "model:gemini-2.0-flash"): each gets its
+    own bucket, configured by the rate of its prefix.
+    """
+    if not _enabled():
+        return None
+    with _limiters_lock:
+        if endpoint not in _limiters:
+            rate = rate_limits().get(endpoint.split(":", 1)[0], 0)
+            if rate <= 0:
+                return None
+            _limiters[endpoint] = TokenBucket(endpoint, rate)
+        return _limiters[endpoint]
+
+def throttle(endpoint: str) -> float:
+    """Waits for the endpoint's rate limit in the current run's turn; returns seconds waited."""
+    limiter = get_limiter(endpoint)
+    if limiter is None:
+        return 0.0
+    return limiter.acquire(current_run_id() or "")
+
+async def throttle_async(endpoint: str) -> float:
+    """Async variant of throttle that waits off the event loop."""
+    limiter = get_limiter(endpoint)
+    if limiter is None or limiter.try_acquire():
+        return 0.0
+    return await asyncio.to_thread(throttle, endpoint)
+
+def observe(endpoint: str, status: Optional[int] = None, headers: Optional[Mapping[str, Any]] = None) -> None:
+    """Adapts the endpoint's bucket to a response."""
+    limiter = get_limiter(endpoint)
+    if limiter is not None:
+        limiter.observe(status, headers)
+
+def refund(endpoint: str) -> None:
+    """Gives the endpoint's bucket back the token of a request that did not count against the quota."""
+    limiter = get_limiter(endpoint)
+    if limiter is not None:
+        limiter.refund()
+
+def rate_limited(endpoint: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wraps an HTTP call (e.g. requests.get) so it waits for the endpoint's rate limit and
+    feeds the status and headers of its response back to the bucket.
+    """
+    def wrapper(*args, **kwargs):
+        throttle(endpoint)
+        response = func(*args, **kwargs)
+        observe(endpoint, getattr(response, "status_code", None), getattr(response, "headers", None))
+        return response
+
+    wrapper.__name__ = getattr(func, "__name__", "request")
+    return wrapper
+
+def limiter_stats() -> List[Dict[str, Any]]:
+    """Returns the stats of every bucket used so far."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return [limiter.stats() for limiter in limiters]
@@ -0,0 +1,234 @@
+"""
+Record/replay of tool and model I/O.
+
+With RECORD_MODE=record every traced tool call (arguments and result), every model
+request/response and every user message sent to an orchestrator is written to a compact
+gzip JSONL log (RECORDING_FILE), which each recording process starts afresh. With RECORD_MODE=replay the same log is served back:
+model calls and external tools (JIRA, GitHub) return their recorded results without any
+network access or model latency, while the orchestration code in between runs for real.
+
+Calls are matched by content rather than by order, so concurrent batches replay correctly:
+tool calls by name, arguments and occurrence; model calls by agent, the session's first
+user message and the turn number within the session. Occurrences are counted from the start
+of each orchestrator session (every user message sent to an orchestrator), and every entry
+carries its session (the message and its occurrence), so a session replays the same way
+whether it was recorded alone or after others in the same process.
+"""
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from google.adk.models import LlmRequest, LlmResponse
+from ...settings import get_settings
+
+# Default location of the recording
+DEFAULT_RECORDING_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    ".cache", "recordings", "recording.jsonl.gz"
+)
+
+# Agents whose incoming user messages start a replayable session
+ROOT_AGENTS = {"adk_sdlc_orchestrator", "orchestrator_agent"}
+
+class ReplayMissError(LookupError):
+    """Raised in replay mode when a call has no recorded counterpart."""
+
+def _digest(value: Any) -> str:
+    data = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+class Recorder:
+    """Appends calls to a recording, or serves them back from one."""
+
+    def __init__(self, mode: str, path: str):
+        self.mode = mode
+        self.path = path
+        self._lock = threading.Lock()
+        self._seen: Dict[Tuple[str, str, str], int] = {}
+        self._entries: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+        self._pending: Dict[Tuple[str, str], str] = {}
+        self._session: Optional[str] = None
+        self._session_key = ""
+        self._inputs: Dict[str, int] = {}
+        self._file = None
+        if mode == "record":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            # A new recording replaces the old one; appending would leave the old entries under
+            # the same keys and indexes, and replay would serve those
+            self._file = gzip.open(path, "wt", encoding="utf-8")
+            atexit.register(self.close)
+        elif mode == "replay":
+            for entry in load_recording(path):
+                self._entries.setdefault((entry["kind"], entry["name"], entry["key"]), []).append(entry)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def start_session(self, invocation_id: str, text: str) -> int:
+        """
+        Restarts the occurrence counts for a new orchestrator session; repeated calls for one
+        invocation are ignored.
+
+        Returns:
+            How many sessions with the same user message started before this one
+        """
+        key = _digest(text)
+        with self._lock:
+            if invocation_id != self._session:
+                self._session = invocation_id
+                self._seen.clear()
+                occurrence = self._inputs.get(key, 0)
+                self._inputs[key] = occurrence + 1
+                self._session_key = f"{key}:{occurrence}"
+            return int(self._session_key.rsplit(":", 1)[1])
+
+    def _next(self, kind: str, name: str, key: str) -> int:
+        with self._lock:
+            index = self._seen.get((kind, name, key), 0)
+            self._seen[(kind, name, key)] = index + 1
+            return index
+
+    def write(self, kind: str, name: str, key: str, index: int, payload: Dict[str, Any]) -> None:
+        """Appends one entry to the recording."""
+        with self._lock:
+            line = json.dumps({"kind": kind, "name": name, "key": key, "index": index, "session": self._session_key,
+                               **payload}, default=str, separators=(",", ":"))
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def lookup(self, kind: str, name: str, key: str, index: int) -> Dict[str, Any]:
+        """Returns the recorded entry for the index-th call with this key, preferring the current session's."""
+        matches = [entry for entry in self._entries.get((kind, name, key), []) if entry["index"] == index]
+        for entry in matches:
+            if entry.get("session") == self._session_key:
+                return entry
+        if matches:
+            return matches[-1]
+        raise ReplayMissError(f"No recorded {kind} call {name} (key {key}, call #{index + 1}) in {self.path}")
+
+    def call_tool(self, name: str, arguments: Dict[str, Any], call: Callable[[], Any], external: bool) -> Any:
+        """
+        Runs a tool call through the recorder.
+
+        Args:
+            name: Tool name
+            arguments: Bound call arguments
+            call: Performs the real call
+            external: Whether the tool talks to an outside system and is served from the recording on replay
+
+        Returns:
+            The (live or recorded) tool result
+        """
+        key = _digest(arguments)
+        index = self._next("tool", name, key)
+        if self.replaying and external:
+            return self.lookup("tool", name, key, index)["result"]
+        result = call()
+        if self.recording:
+            self.write("tool", name, key, index, {"args": arguments, "result": result})
+        return result
+
+    async def call_tool_async(self, name: str, arguments: Dict[str, Any], call: Callable[[], Any], external: bool) -> Any:
+        """Async variant of call_tool; call returns an awaitable."""
+        key = _digest(arguments)
+        index = self._next("tool", name, key)
+        if self.replaying and external:
+            return self.lookup("tool", name, key, index)["result"]
+        result = await call()
+        if self.recording:
+            self.write("tool", name, key, index, {"args": arguments, "result": result})
+        return result
+
+    def close(self) -> None:
+        if self._file:
+            with self._lock:
+                self._file.close()
+                self._file = None
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    """Reads every entry of a recording, including one whose recording process was killed."""
+    entries = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(json.loads(line))
+        except (EOFError, json.JSONDecodeError):
+            # The last gzip member was not closed; everything flushed before it is usable
+            pass
+    return entries
+
+_recorder: Optional[Recorder] = None
+_recorder_lock = threading.Lock()
+
+def get_recorder() -> Optional[Recorder]:
+    """Returns the process-wide recorder, or None when RECORD_MODE is off."""
+    global _recorder
+    settings = get_settings()
+    mode = settings.record_mode
+    if mode not in ("record", "replay"):
+        return None
+    path = settings.recording_file or DEFAULT_RECORDING_FILE
+    with _recorder_lock:
+        if _recorder is None or _recorder.mode != mode or _recorder.path != path:
+            if _recorder is not None:
+                _recorder.close()
+            _recorder = Recorder(mode, path)
+        return _recorder
+
+def _model_key(callback_context: Any, llm_request: LlmRequest) -> str:
+    """Identifies a model call by the session's first user message and the turn number."""
+    contents = llm_request.contents or []
+    first_user = next((content for content in contents if content.role == "user"), None)
+    task = "".join(part.text or "" for part in (first_user.parts or [])) if first_user else ""
+    turn = sum(1 for content in contents if content.role == "model")
+    return _digest({"task": task, "turn": turn})
+
+def replay_model_response(callback_context: Any, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """before_model_callback: serves the recorded response in replay mode and remembers the call in record mode."""
+    recorder = get_recorder()
+    if recorder is None:
+        return None
+    name = callback_context.agent_name
+    key = _model_key(callback_context, llm_request)
+    index = recorder._next("model", name, key)
+    if recorder.replaying:
+        return LlmResponse.model_validate(recorder.lookup("model", name, key, index)["response"])
+    with recorder._lock:
+        recorder._pending[(callback_context.invocation_id, name)] = f"{key}:{index}"
+    return None
+
+def record_model_response(callback_context: Any, llm_response: LlmResponse) -> Optional[LlmResponse]:
+    """after_model_callback: appends the model response to the recording in record mode."""
+    recorder = get_recorder()
+    if recorder is None or not recorder.recording:
+        return None
+    name = callback_context.agent_name
+    with recorder._lock:
+        pending = recorder._pending.pop((callback_context.invocation_id, name), None)
+    if pending:
+        key, index = pending.rsplit(":", 1)
+        recorder.write("model", name, key, int(index),
+                       {"response": llm_response.model_dump(mode="json", exclude_none=True)})
+    return None
+
+def record_session_input(callback_context: Any) -> None:
+    """before_agent_callback: starts an orchestrator session and, in record mode, records its user message."""
+    recorder = get_recorder()
+    if recorder is None or callback_context.agent_name not in ROOT_AGENTS:
+        return None
+    content = callback_context.user_content
+    text = "".join(part.text or "" for part in (content.parts or [])) if content else ""
+    occurrence = recorder.start_session(callback_context.invocation_id, text)
+    if recorder.recording and recorder._next("input", callback_context.agent_name, _digest(text)) == 0:
+        recorder.write("input", callback_context.agent_name, _digest(text), occurrence, {"text": text})
+    return None
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Any, Generator, Optional, Tuple
+from ...settings import get_settings
+
+# Default location of the on-disk cache
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    ".cache", "results"
+)
+
+def normalize_text(text: str) -> str:
+    """Collapses whitespace so formatting-only differences map to the same cache key."""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+def content_hash(*parts: Any) -> str:
+    """Returns a stable SHA-256 hex digest of the given JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def prompt_version(instructions: str) -> str:
+    """Returns a short version tag for an agent prompt, so prompt edits invalidate cached results."""
+    return content_hash(instructions)[:12]
+
+class ResultCache:
+    """
+    Content-addressed, disk-backed cache for generation results.
+
+    Entries are JSON files named after the hash of their inputs. The cache is bounded by
+    total size on disk; when it grows past the budget the least recently used entries
+    (by file modification time, refreshed on every hit) are evicted first.
+
+    The caches are module-level objects, so a location, budget or switch that is not given
+    is read from the settings (RESULT_CACHE_*) on every use rather than when the module loads.
+    """
+
+    def __init__(self, namespace: str, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.namespace = namespace
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        return os.path.join(self._directory or get_settings().result_cache_dir or DEFAULT_CACHE_DIR, self.namespace)
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes or get_settings().result_cache_max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return not get_settings().result_cache_disabled
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached result for the key, or None on a miss."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            # Refresh the entry's position in the LRU order
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Stores a result under the key and evicts old entries if the cache is over budget."""
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Removes every entry of this cache namespace."""
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters for this process."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "namespace": self.namespace,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+def cached_call(cache: ResultCache, key: str, compute, bypass_cache: bool = False) -> Dict[str, Any]:
+    """
+    Returns the cached result for the key, or computes and caches it.
+
+    Args:
+        cache: The cache to read from and write to
+        key: Content hash of the call inputs
+        compute: Zero-argument callable that produces the result on a miss
+        bypass_cache: Skip the lookup and always recompute (the fresh result is still stored)
+
+    Returns:
+        The result dictionary, with "cache_hit" set to show where it came from
+    """
+    if not bypass_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            cached["cache_hit"] = True
+            return cached
+
+    started = time.perf_counter()
+    result = compute()
+    # Failed generations are not worth replaying
+    if result.get("success", True):
+        cache.put(key, {**result, "generation_seconds": round(time.perf_counter() - started, 3)})
+    return {**result, "cache_hit": False}
+
+def cached_stream(cache: ResultCache, key: str, produce, files_key: str = "files",
+                  bypass_cache: bool = False) -> Generator[Tuple[str, str], None, Dict[str, Any]]:
+    """
+    Streaming variant of cached_call for generators that produce files one at a time.
+
+    Yields the (path, content) pairs of the cached result, or of a fresh generation, which is
+    cached once it has produced its last file.
+
+    Args:
+        cache: The cache to read from and write to
+        key: Content hash of the call inputs
+        produce: Zero-argument callable returning a generator of (path, content) pairs that
+            returns the other result fields
+        files_key: Key of the files mapping in the cached result
+        bypass_cache: Skip the lookup and always regenerate (the fresh result is still stored)
+
+    Returns:
+        The other result fields, with "cache_hit" set to show where they came from
+    """
+    if not bypass_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            yield from (cached.get(files_key) or {}).items()
+            return {**{k: v for k, v in cached.items() if k != files_key}, "cache_hit": True}
+
+    started = time.perf_counter()
+    files: Dict[str, str] = {}
+    source = produce()
+    while True:
+        try:
+            path, content = next(source)
+        except StopIteration as stop:
+            extra = stop.value or {}
+            break
+        files[path] = content
+        yield path, content
+    if extra.get("success", True):
+        cache.put(key, {**extra, files_key: files, "generation_seconds": round(time.perf_counter() - started, 3)})
+    return {**extra, "cache_hit": False}
@@ -0,0 +1,360 @@
+"""
+Per-tool latency tracing.
+
+Every traced tool call produces one span, appended as a JSON line to a local file using the
+OTLP/JSON span fields (traceId, spanId, parentSpanId, name, start/end time in Unix nanoseconds,
+attributes, status). Spans carry the run and ticket they belong to and whether the call
+succeeded; with TRACE_PAYLOAD_SIZES=true also the request and response payload sizes, which
+cost a JSON encoding of the arguments and result per call. The file is kept open and rotated
+to <file>.1 once it reaches TRACE_MAX_BYTES.
+
+Summarize the collected spans with:
+    python adk-sdlc/sub_agents/tools/tracing.py [spans.jsonl] [--run RUN_ID]
+"""
+import argparse
+import atexit
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import math
+import os
+import secrets
+import sys
+import threading
+import time
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+# Default location of the span file
+DEFAULT_TRACE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    ".cache", "traces", "spans.jsonl"
+)
+
+_current_span: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("current_span", default=None)
+_run_context: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("run_context", default={})
+_write_lock = threading.Lock()
+
+def _get_recorder() -> Any:
+    # Imported on use so this module can also be run as a script (the summary CLI)
+    from .recorder import get_recorder
+    return get_recorder()
+
+def _settings() -> Any:
+    # Imported on use for the same reason
+    from ...settings import get_settings
+    return get_settings()
+
+def _enabled() -> bool:
+    return not _settings().tracing_disabled
+
+def trace_file() -> str:
+    """Returns the path spans are exported to."""
+    return _settings().trace_file or DEFAULT_TRACE_FILE
+
+def new_trace_id() -> str:
+    """Returns a random OTLP trace ID."""
+    return secrets.token_hex(16)
+
+@contextlib.contextmanager
+def trace_context(run_id: Optional[str] = None, ticket_id: Optional[str] = None,
+                  trace_id: Optional[str] = None) -> Iterator[None]:
+    """
+    Tags every span started inside the block with a run and ticket.
+
+    Each block starts a new trace unless a trace ID is given, so all tool calls of one ticket
+    pipeline share a trace ID even when its stages run on different threads.
+    """
+    context = {
+        "run_id": run_id,
+        "ticket_id": ticket_id,
+        "trace_id": trace_id or new_trace_id()
+    }
+    context_token = _run_context.set(context)
+    span_token = _current_span.set(None)
+    try:
+        yield
+    finally:
+        _current_span.reset(span_token)
+        _run_context.reset(context_token)
+
+def current_run_id() -> Optional[str]:
+    """Returns the run ID set by the enclosing trace_context, if any."""
+    return _run_context.get().get("run_id")
+
+def _payload_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(str(value).encode("utf-8"))
+
+def _succeeded(result: Any) -> bool:
+    if not isinstance(result, dict):
+        return True
+    if "success" in result:
+        return bool(result["success"])
+    if "status" in result:
+        return result["status"] == "success"
+    return True
+
+class _SpanWriter:
+    """Appends span lines to the trace file through one open handle, rotating it at TRACE_MAX_BYTES."""
+
+    def __init__(self):
+        self._path: Optional[str] = None
+        self._file = None
+        self._size = 0
+
+    def _open(self, path: str) -> None:
+        self.close()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "ab")
+        self._path = path
+        self._size = self._file.tell()
+
+    def write(self, data: bytes) -> None:
+        path = trace_file()
+        max_bytes = _settings().trace_max_bytes
+        with _write_lock:
+            if self._file is None or path != self._path:
+                self._open(path)
+            if self._size and self._size + len(data) > max_bytes:
+                self.close()
+                os.replace(path, path + ".1")
+                self._open(path)
+            self._file.write(data)
+            # Flushed per span, so the summary CLI sees spans of a running process
+            self._file.flush()
+            self._size += len(data)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+_writer = _SpanWriter()
+atexit.register(_writer.close)
+
+def _export(span: Dict[str, Any]) -> None:
+    _writer.write((json.dumps(span, separators=(",", ":")) + "\n").encode("utf-8"))
+
+def _start_span(name: str, stage: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    parent = _current_span.get()
+    context = _run_context.get()
+    return {
+        "traceId": parent["traceId"] if parent else context.get("trace_id") or secrets.token_hex(16),
+        "spanId": secrets.token_hex(8),
+        "parentSpanId": parent["spanId"] if parent else "",
+        "name": name,
+        "kind": "SPAN_KIND_INTERNAL",
+        "startTimeUnixNano": time.time_ns(),
+        "attributes": {
+            "tool.name": name,
+            "sdlc.stage": stage,
+            "sdlc.run_id": context.get("run_id") or "",
+            "sdlc.ticket_id": context.get("ticket_id") or arguments.get("ticket_id") or "",
+            **({"payload.request_bytes": _payload_size(arguments)} if _settings().trace_payload_sizes else {})
+        },
+        "_started": time.perf_counter()
+    }
+
+def _end_span(span: Dict[str, Any], result: Any = None, error: Optional[BaseException] = None) -> None:
+    duration = time.perf_counter() - span.pop("_started")
+    span["endTimeUnixNano"] = span["startTimeUnixNano"] + int(duration * 1e9)
+    attributes = span["attributes"]
+    attributes["duration_ms"] = round(duration * 1000, 3)
+    payload_sizes = "payload.request_bytes" in attributes
+    if error is not None:
+        span["status"] = {"code": "STATUS_CODE_ERROR", "message": str(error)}
+        if payload_sizes:
+            attributes["payload.response_bytes"] = 0
+    else:
+        ok = _succeeded(result)
+        span["status"] = {"code": "STATUS_CODE_OK" if ok else "STATUS_CODE_ERROR"}
+        if not ok and isinstance(result, dict):
+            span["status"]["message"] = str(result.get("error") or result.get("message", ""))
+        if payload_sizes:
+            attributes["payload.response_bytes"] = _payload_size(result)
+    # OTLP/JSON encodes attributes as a list of typed key/value pairs
+    span["attributes"] = [
+        {"key": key, "value": {"doubleValue": value} if isinstance(value, float)
+                     else {"intValue": value} if isinstance(value, int)
+                     else {"stringValue": str(value)}}
+        for key, value in attributes.items()
+    ]
+    _export(span)
+
+def traced(stage: str, external: bool = False) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator that records a span for every call of a tool function.
+
+    The wrapper keeps the function's name, docstring and signature, so it can be passed to
+    FunctionTool unchanged. Works for both sync and async functions. Calls also go through
+    the record/replay recorder when RECORD_MODE is set.
+
+    Args:
+        stage: SDLC stage the tool belongs to ("requirements", "implementation", "testing", "pr", "orchestrator")
+        external: Whether the tool talks to an outside system (JIRA, GitHub); such calls are
+            served from the recording in replay mode
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(func)
+
+        def bind(args: tuple, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                arguments = dict(signature.bind_partial(*args, **kwargs).arguments)
+            except TypeError:
+                arguments = {"args": list(args), **kwargs}
+            # The tool context ADK injects is not part of the call's input
+            arguments.pop("tool_context", None)
+            return arguments
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                recorder = _get_recorder()
+                if not _enabled() and recorder is None:
+                    return await func(*args, **kwargs)
+                arguments = bind(args, kwargs)
+
+                async def invoke():
+                    if recorder is None:
+                        return await func(*args, **kwargs)
+                    return await recorder.call_tool_async(func.__name__, arguments, lambda: func(*args, **kwargs), external)
+
+                if not _enabled():
+                    return await invoke()
+                span = _start_span(func.__name__, stage, arguments)
+                token = _current_span.set(span)
+                try:
+                    result = await invoke()
+                except BaseException as e:
+                    _end_span(span, error=e)
+                    raise
+                finally:
+                    _current_span.reset(token)
+                _end_span(span, result)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _get_recorder()
+            if not _enabled() and recorder is None:
+                return func(*args, **kwargs)
+            arguments = bind(args, kwargs)
+
+            def invoke():
+                if recorder is None:
+                    return func(*args, **kwargs)
+                return recorder.call_tool(func.__name__, arguments, lambda: func(*args, **kwargs), external)
+
+            if not _enabled():
+                return invoke()
+            span = _start_span(func.__name__, stage, arguments)
+            token = _current_span.set(span)
+            try:
+                result = invoke()
+            except BaseException as e:
+                _end_span(span, error=e)
+                raise
+            finally:
+                _current_span.reset(token)
+            _end_span(span, result)
+            return result
+        return wrapper
+    return decorator
+
+def _attributes(span: Dict[str, Any]) -> Dict[str, Any]:
+    return {item["key"]: next(iter(item["value"].values())) for item in span.get("attributes", [])}
+
+def percentile(values: List[float], pct: float) -> float:
+    """Returns the nearest-rank percentile of the values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def load_spans(path: str, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Reads spans from a JSONL file, optionally keeping only one run."""
+    spans = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            span = json.loads(line)
+            span["attrs"] = _attributes(span)
+            if run_id and span["attrs"].get("sdlc.run_id") != run_id:
+                continue
+            spans.append(span)
+    return spans
+
+def top_level(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Returns the spans without a parent span, e.g. the orchestrator's stage calls but not the tools they ran."""
+    return [span for span in spans if not span.get("parentSpanId")]
+
+def summarize_spans(spans: List[Dict[str, Any]], group_by: str) -> List[Dict[str, Any]]:
+    """
+    Aggregates span latencies.
+
+    Args:
+        spans: Spans as returned by load_spans; pass top_level(spans) when grouping by stage,
+            since nested spans overlap their parent's time
+        group_by: Attribute to group on ("tool.name" or "sdlc.stage")
+
+    Returns:
+        One row per group with call/error counts and p50/p95/p99/max latency in milliseconds
+    """
+    groups: Dict[str, Dict[str, Any]] = {}
+    for span in spans:
+        group = groups.setdefault(span["attrs"].get(group_by, ""), {"durations": [], "errors": 0, "bytes": 0})
+        group["durations"].append(float(span["attrs"].get("duration_ms", 0.0)))
+        group["bytes"] += int(span["attrs"].get("payload.request_bytes", 0)) + int(span["attrs"].get("payload.response_bytes", 0))
+        if span.get("status", {}).get("code") == "STATUS_CODE_ERROR":
+            group["errors"] += 1
+
+    rows = []
+    for name, group in groups.items():
+        durations = group["durations"]
+        rows.append({
+            "name": name,
+            "calls": len(durations),
+            "errors": group["errors"],
+            "p50_ms": round(percentile(durations, 50), 3),
+            "p95_ms": round(percentile(durations, 95), 3),
+            "p99_ms": round(percentile(durations, 99), 3),
+            "max_ms": round(max(durations), 3),
+            "total_ms": round(sum(durations), 3),
+            "payload_bytes": group["bytes"]
+        })
+    return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+def print_table(title: str, rows: List[Dict[str, Any]]) -> None:
+    print(f"\n{title}")
+    print(f"{'name':<32} {'calls':>6} {'errors':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10} {'bytes':>10}")
+    for row in rows:
+        print(f"{row['name']:<32} {row['calls']:>6} {row['errors']:>6} {row['p50_ms']:>10.1f} {row['p95_ms']:>10.1f} "
+              f"{row['p99_ms']:>10.1f} {row['max_ms']:>10.1f} {row['payload_bytes']:>10}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Summarize tool latency spans per tool and per stage")
+    # Run as a script, outside the package, so TRACE_FILE is read from the environment directly
+    default_path = os.environ.get("TRACE_FILE") or DEFAULT_TRACE_FILE
+    parser.add_argument("path", nargs="?", default=default_path, help="Span JSONL file (defaults to TRACE_FILE)")
+    parser.add_argument("--run", help="Only include spans of this run ID")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"No span file found at {args.path}")
+        return 1
+    spans = load_spans(args.path, args.run)
+    print(f"{len(spans)} spans from {args.path}")
+    print_table("Per tool", summarize_spans(spans, "tool.name"))
+    print_table("Per stage (top-level spans)", summarize_spans(top_level(spans), "sdlc.stage"))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
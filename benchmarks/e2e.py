@@ -0,0 +1,256 @@
+"""
+Offline end-to-end benchmark of the orchestrator.
+
+Drives `orchestrator_agent` through the full requirements -> implementation -> testing -> PR
+chain for 1, 10 and 100 tickets with VERTEX_MODEL pointed at the deterministic stub model
+(benchmarks/stub_model.py), so what is measured is orchestration overhead plus a fixed,
+configurable model latency. Every size runs in a fresh interpreter with its own cache,
+artifact and checkpoint directories, and outbound sockets are blocked.
+
+Reported per size: per-ticket wall time (p50/p95), throughput, peak RSS and the bytes moved
+between agents (request and response payloads of the sub-agent calls). Results are compared
+with benchmarks/baselines/e2e.json and the run fails if any metric regressed by more than
+its tolerance. Timing metrics get a wider tolerance than size metrics, and their limits are
+scaled by how much slower this machine runs a fixed CPU workload than the machine that
+recorded the baseline (measured in the same run), so a slower machine does not read as a
+regression. Refresh the baseline with --update-baseline whenever a change moves the metrics
+on purpose.
+
+Usage:
+    python benchmarks/e2e.py [--sizes 1 10 100] [--latency-ms 50] [--tolerance 0.3]
+                             [--latency-tolerance 0.5] [--update-baseline]
+"""
+import argparse
+import copy
+import hashlib
+import importlib
+import json
+import logging
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from typing import Dict, Any, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ROOT)
+PACKAGE = "adk-sdlc"
+BASELINE_FILE = os.path.join(ROOT, "baselines", "e2e.json")
+
+# Orchestrator tools whose payloads are the data handed from one agent to the next
+AGENT_CALLS = {"requirements_agent", "implementation_agent", "testing_agent", "pr_agent"}
+
+# Metrics checked against the baseline, and whether a higher value is better
+METRICS = {
+    "ticket_p50_seconds": False,
+    "ticket_p95_seconds": False,
+    "throughput_per_second": True,
+    "peak_rss_mb": False,
+    "bytes_moved": False,
+}
+
+# Metrics that depend on the speed of the machine; checked with the latency tolerance
+TIMING_METRICS = {"ticket_p50_seconds", "ticket_p95_seconds", "throughput_per_second"}
+
+def calibrate() -> float:
+    """
+    Returns the best of three timings of a fixed CPU workload (JSON round trips and hashing,
+    like the cache keys and payloads of a run), as a measure of this machine's speed.
+    """
+    payload = {"files": {f"module_{number}.py": "value = 1\n" * 200 for number in range(50)}}
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(300):
+            data = json.dumps(payload, sort_keys=True)
+            hashlib.sha256(data.encode("utf-8")).hexdigest()
+            json.loads(data)
+        best = min(best, time.perf_counter() - started)
+    return round(best, 4)
+
+def block_network() -> None:
+    """Makes any attempt to open a network connection fail loudly."""
+    def refuse(*args: Any, **kwargs: Any) -> None:
+        raise RuntimeError("Network access is disabled during the offline benchmark")
+    socket.socket.connect = refuse
+    socket.socket.connect_ex = refuse
+    socket.create_connection = refuse
+
+def _add_tickets(count: int) -> List[str]:
+    """Adds synthetic open tickets to the mock JIRA data and returns the keys to process."""
+    jira_tool = importlib.import_module(f"{PACKAGE}.sub_agents.requirements.tools.jira_tool")
+    template = jira_tool.MOCK_TICKETS[0]
+    tickets = []
+    for number in range(1, count + 1):
+        ticket = copy.deepcopy(template)
+        ticket["key"] = f"BENCH-{number}"
+        ticket["summary"] = f"{template['summary']} (variant {number})"
+        tickets.append(ticket)
+    jira_tool.ticket_store.bulk_load(tickets)
+    return [ticket["key"] for ticket in tickets]
+
+def run_size(count: int) -> Dict[str, Any]:
+    """Runs one batch of `count` tickets in this process and returns its metrics."""
+    sys.path.insert(0, REPO_ROOT)
+    sys.path.insert(0, ROOT)
+    import stub_model
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    block_network()
+    stub_model.register()
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+
+    orchestrator = importlib.import_module(f"{PACKAGE}.sub_agents.orchestrator.agent")
+    tracing = importlib.import_module(f"{PACKAGE}.sub_agents.tools.tracing")
+    ticket_ids = _add_tickets(count)
+
+    runner = InMemoryRunner(agent=orchestrator.orchestrator_agent, app_name="e2e-benchmark")
+    session = runner.session_service.create_session_sync(app_name="e2e-benchmark", user_id="benchmark")
+    message = types.Content(role="user", parts=[types.Part(text=f"Run the batch for {' '.join(ticket_ids)}")])
+
+    started = time.perf_counter()
+    report = None
+    for event in runner.run(user_id="benchmark", session_id=session.id, new_message=message):
+        for response in event.get_function_responses():
+            if response.name == "run_ticket_batch":
+                report = response.response
+    wall_time = time.perf_counter() - started
+
+    if not report or not report.get("success"):
+        raise RuntimeError(f"Batch run failed: {report}")
+    failed = [record["ticket_id"] for record in report["results"] if not record["success"]]
+    if failed:
+        raise RuntimeError(f"Tickets failed: {failed}")
+
+    durations = [record["duration_seconds"] for record in report["results"]]
+    spans = tracing.load_spans(tracing.trace_file())
+    bytes_moved = sum(
+        span["attrs"].get("payload.request_bytes", 0) + span["attrs"].get("payload.response_bytes", 0)
+        for span in spans if span["name"] in AGENT_CALLS
+    )
+    return {
+        "tickets": count,
+        "wall_seconds": round(wall_time, 3),
+        "ticket_p50_seconds": round(tracing.percentile(durations, 50), 3),
+        "ticket_p95_seconds": round(tracing.percentile(durations, 95), 3),
+        "throughput_per_second": round(count / wall_time, 3),
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "bytes_moved": bytes_moved,
+    }
+
+def measure(count: int, latency_ms: float) -> Dict[str, Any]:
+    """Runs one size in a fresh interpreter with isolated state directories."""
+    with tempfile.TemporaryDirectory(prefix="adk-sdlc-e2e-") as workdir:
+        env = dict(
+            os.environ,
+            VERTEX_MODEL="stub-model",
+            STUB_MODEL_LATENCY_MS=str(latency_ms),
+            RESULT_CACHE_DIR=os.path.join(workdir, "results"),
+            ARTIFACT_STORE_DIR=os.path.join(workdir, "artifacts"),
+            CHECKPOINT_DB=os.path.join(workdir, "checkpoints.sqlite3"),
+            TRACE_FILE=os.path.join(workdir, "spans.jsonl"),
+            TRACING_DISABLED="false",
+            # Bytes moved between agents are measured from the span payload sizes
+            TRACE_PAYLOAD_SIZES="true",
+            # The stub model and mock trackers have no quotas to protect
+            RATE_LIMITING_DISABLED="true",
+            # The synthetic tickets are variants of one ticket; every one must run the full chain
+            SKIP_DUPLICATE_TICKETS="false",
+        )
+        proc = subprocess.run(
+            [sys.executable, __file__, "--child", str(count)],
+            cwd=REPO_ROOT, env=env, capture_output=True, text=True
+        )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Benchmark with {count} tickets failed:\n{proc.stderr[-4000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float,
+            latency_tolerance: float, slowdown: float = 1.0) -> List[str]:
+    """
+    Returns a description of every metric that regressed beyond its tolerance.
+
+    Timing metrics use latency_tolerance, with their baseline scaled by slowdown (how many
+    times slower this machine is than the one that recorded the baseline).
+    """
+    failures = []
+    for result in results:
+        expected = baseline.get("sizes", {}).get(str(result["tickets"]))
+        if not expected:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            if metric not in expected or not expected[metric]:
+                continue
+            allowed, scale = (latency_tolerance, slowdown) if metric in TIMING_METRICS else (tolerance, 1.0)
+            if higher_is_better:
+                limit = expected[metric] / scale * (1 - allowed)
+            else:
+                limit = expected[metric] * scale * (1 + allowed)
+            value = result[metric]
+            if (value < limit) if higher_is_better else (value > limit):
+                failures.append(f"{result['tickets']} tickets: {metric} {value} vs baseline {expected[metric]}")
+    return failures
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline end-to-end orchestrator benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100], help="Ticket counts to run")
+    parser.add_argument("--latency-ms", type=float, default=float(os.environ.get("STUB_MODEL_LATENCY_MS", "50")),
+                        help="Simulated latency of every model call")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed relative regression of memory and bytes")
+    parser.add_argument("--latency-tolerance", type=float, default=0.5,
+                        help="Allowed relative regression of per-ticket latency and throughput")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_size(args.child)))
+        return 0
+
+    calibration = calibrate()
+    results = [measure(count, args.latency_ms) for count in args.sizes]
+    print(f"{'tickets':>8} {'wall s':>9} {'p50 s':>8} {'p95 s':>8} {'tickets/s':>10} {'peak MB':>9} {'bytes':>12}")
+    for result in results:
+        print(f"{result['tickets']:>8} {result['wall_seconds']:>9.2f} {result['ticket_p50_seconds']:>8.3f} "
+              f"{result['ticket_p95_seconds']:>8.3f} {result['throughput_per_second']:>10.2f} "
+              f"{result['peak_rss_mb']:>9.1f} {result['bytes_moved']:>12}")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(BASELINE_FILE), exist_ok=True)
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump({
+                "latency_ms": args.latency_ms,
+                "calibration_seconds": calibration,
+                "sizes": {str(result["tickets"]): result for result in results}
+            }, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {BASELINE_FILE}")
+        return 0
+
+    if not os.path.exists(BASELINE_FILE):
+        print(f"\nNo baseline at {BASELINE_FILE}; run with --update-baseline to create one")
+        return 0
+    with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("latency_ms") != args.latency_ms:
+        print(f"\nBaseline was recorded with {baseline.get('latency_ms')} ms model latency; not comparing")
+        return 0
+
+    # Only a slower machine relaxes the limits: the simulated model latency does not speed up
+    slowdown = max(1.0, calibration / baseline["calibration_seconds"]) if baseline.get("calibration_seconds") else 1.0
+    print(f"\nCalibration: {calibration} s (baseline {baseline.get('calibration_seconds')} s), "
+          f"timing limits scaled by {slowdown:.2f}")
+    failures = compare(results, baseline, args.tolerance, args.latency_tolerance, slowdown)
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
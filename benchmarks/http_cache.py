@@ -0,0 +1,138 @@
+"""
+Offline check of the conditional-request HTTP cache on JIRA issue reads.
+
+Runs jira_client.get_issue against the local JIRA stand-in (benchmarks/jira_server.py, which
+sends ETags and answers If-None-Match with 304) through the shared "jira" rate limit, and
+measures:
+
+- cold reads, which fetch every issue in full;
+- revalidated reads (max_age_seconds=0), which the server answers with 304 and which must
+  not use up the rate limit;
+- reads within the TTL floor, which make no request at all;
+- reads after an issue changed, which must return the new version;
+- reads from a fresh in-memory tier over the disk tier, as in a new run.
+
+Exits non-zero if any phase makes more requests than expected, serves stale data, or waits
+on the rate limiter for the revalidated reads.
+
+Usage:
+    python benchmarks/http_cache.py [--issues 40] [--reads 200] [--latency-ms 20] [--rps 10]
+"""
+import argparse
+import importlib
+import logging
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from typing import Any, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ROOT)
+PACKAGE = "adk-sdlc"
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the conditional-request HTTP cache")
+    parser.add_argument("--issues", type=int, default=40, help="Distinct issues read")
+    parser.add_argument("--reads", type=int, default=200, help="Reads per phase")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated JIRA latency per request")
+    parser.add_argument("--rps", type=float, default=10.0, help="JIRA rate limit in requests per second")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_ROOT)
+    sys.path.insert(0, ROOT)
+    from jira_server import JiraServer, make_issues
+    server = JiraServer(make_issues(args.issues), latency_ms=args.latency_ms).start()
+    workdir = tempfile.mkdtemp(prefix="adk-sdlc-http-cache-")
+    os.environ.update(
+        JIRA_BACKEND="rest",
+        JIRA_URL=server.url,
+        HTTP_CACHE_DIR=workdir,
+        HTTP_CACHE_TTL_SECONDS="3600",
+        RATE_LIMIT_JIRA_RPS=str(args.rps),
+        RATE_LIMITING_DISABLED="false",
+        TRACING_DISABLED="true",
+    )
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+    jira_client = importlib.import_module(f"{PACKAGE}.sub_agents.requirements.tools.jira_client")
+    http_cache = importlib.import_module(f"{PACKAGE}.sub_agents.tools.http_cache")
+    rate_limiter = importlib.import_module(f"{PACKAGE}.sub_agents.tools.rate_limiter")
+
+    rng = random.Random(3)
+    keys = [f"PROJ-{number}" for number in range(1, args.issues + 1)]
+    reads = [rng.choice(keys) for _ in range(args.reads)]
+    failures: List[str] = []
+    rows = []
+
+    def phase(name: str, call: Callable[[str], Any], phase_keys: List[str]) -> Dict[str, Any]:
+        limiter = rate_limiter.get_limiter("jira")
+        requests_before, not_modified_before = server.requests, server.not_modified
+        waited_before = limiter.stats()["waited_seconds"]
+        samples = []
+        for key in phase_keys:
+            started = time.perf_counter()
+            call(key)
+            samples.append((time.perf_counter() - started) * 1e6)
+        row = {
+            "phase": name,
+            "reads": len(phase_keys),
+            "requests": server.requests - requests_before,
+            "not_modified": server.not_modified - not_modified_before,
+            "p50_us": round(statistics.median(samples)),
+            "waited_s": round(limiter.stats()["waited_seconds"] - waited_before, 2),
+        }
+        rows.append(row)
+        return row
+
+    cold = phase("cold", jira_client.get_issue, keys)
+    if cold["requests"] != args.issues:
+        failures.append(f"cold reads made {cold['requests']} requests for {args.issues} issues")
+
+    revalidated = phase("revalidate", lambda key: jira_client.get_issue(key, max_age_seconds=0), reads)
+    if revalidated["not_modified"] != args.reads:
+        failures.append(f"{revalidated['not_modified']} of {args.reads} revalidations were answered with 304")
+    # Without refunds these reads would need reads / rps seconds of tokens
+    if revalidated["waited_s"] > 1.0:
+        failures.append(f"revalidated reads waited {revalidated['waited_s']} s for the rate limit")
+
+    fresh = phase("within TTL", jira_client.get_issue, reads)
+    if fresh["requests"]:
+        failures.append(f"reads within the TTL floor made {fresh['requests']} requests")
+
+    changed = keys[0]
+    issue = server.issues[changed]
+    server.put({**issue, "fields": {**issue["fields"], "summary": "Handle timezone offsets"}})
+    phase("changed", lambda key: jira_client.get_issue(key, max_age_seconds=0), [changed])
+    if jira_client.get_issue(changed)["summary"] != "Handle timezone offsets":
+        failures.append(f"{changed} was served stale after it changed")
+
+    # A new run starts with an empty memory tier over the same disk tier
+    http_cache._cache = http_cache.HttpCache(memory_entries=args.issues // 4)
+    disk = phase("new run", lambda key: jira_client.get_issue(key, max_age_seconds=0), reads)
+    if disk["not_modified"] != args.reads:
+        failures.append(f"{disk['reads'] - disk['not_modified']} reads of a new run were not revalidated from disk")
+    stats = http_cache.get_http_cache().stats()
+    if stats["memory_entries"] > args.issues // 4:
+        failures.append(f"memory tier holds {stats['memory_entries']} entries, over its {args.issues // 4} limit")
+
+    print(f"{'phase':>11} {'reads':>6} {'requests':>9} {'304s':>5} {'p50 us':>8} {'waited s':>9}")
+    for row in rows:
+        print(f"{row['phase']:>11} {row['reads']:>6} {row['requests']:>9} {row['not_modified']:>5} "
+              f"{row['p50_us']:>8} {row['waited_s']:>9}")
+    limiter = rate_limiter.get_limiter("jira").stats()
+    print(f"\njira bucket: {limiter['acquired']} acquired, {limiter['refunded']} refunded; "
+          f"new-run cache: {stats}")
+
+    server.stop()
+    shutil.rmtree(workdir, ignore_errors=True)
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Import-time benchmark for the adk-sdlc agent package.
+
+Runs `python -X importtime` on the package in a fresh interpreter (what `adk web` / `adk run`
+pay at startup), prints the slowest modules and fails if startup regressed:
+
+- the total import time of the package exceeds --max-ms, or
+- a module that must stay lazy (sub-agents, their tool modules, `requests`) was imported.
+
+Usage:
+    python benchmarks/import_time.py [--max-ms 2500] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "adk-sdlc"
+
+# Modules that must not be imported just by loading the root agent
+LAZY_MODULES = [
+    f"{PACKAGE}.sub_agents.requirements.agent",
+    f"{PACKAGE}.sub_agents.implementation.agent",
+    f"{PACKAGE}.sub_agents.testing.agent",
+    f"{PACKAGE}.sub_agents.pr.agent",
+    f"{PACKAGE}.sub_agents.pr.tools.github_pr",
+    "requests",
+]
+
+def measure() -> Tuple[float, List[Tuple[str, int, int]]]:
+    """
+    Imports the package in a subprocess.
+
+    Returns:
+        The total import time in milliseconds and the (module, self_us, cumulative_us) rows
+    """
+    code = (
+        f"import importlib, sys, time; sys.path.insert(0, {ROOT!r}); "
+        f"started = time.perf_counter(); importlib.import_module({PACKAGE!r}); "
+        f"print((time.perf_counter() - started) * 1000)"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {PACKAGE} failed:\n{proc.stderr}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        # Format: "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return float(proc.stdout.strip().splitlines()[-1]), rows
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure adk-sdlc startup import time")
+    parser.add_argument("--max-ms", type=float, default=float(os.environ.get("IMPORT_TIME_BUDGET_MS", "2500")),
+                        help="Fail if importing the package takes longer than this")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to print")
+    args = parser.parse_args()
+
+    total_ms, rows = measure()
+    by_name: Dict[str, Tuple[int, int]] = {name: (self_us, cumulative_us) for name, self_us, cumulative_us in rows}
+
+    print(f"{'module':<60} {'self ms':>10} {'cumul. ms':>10}")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"{name:<60} {self_us / 1000:>10.1f} {cumulative_us / 1000:>10.1f}")
+    print(f"\nTotal import time of {PACKAGE}: {total_ms:.1f} ms (budget {args.max_ms:.0f} ms)")
+
+    failures = []
+    eager = [name for name in LAZY_MODULES if name in by_name]
+    if eager:
+        failures.append(f"modules imported eagerly at startup: {', '.join(eager)}")
+    if total_ms > args.max_ms:
+        failures.append(f"import time {total_ms:.1f} ms exceeds budget of {args.max_ms:.0f} ms")
+
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
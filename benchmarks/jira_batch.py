@@ -0,0 +1,83 @@
+"""
+Checks get_ticket_details_batch against a local stand-in JIRA server.
+
+Runs the JIRA tools with JIRA_BACKEND=rest against benchmarks/jira_server.py, fetches the same
+tickets one get_ticket_details call at a time and with one get_ticket_details_batch call, and
+compares wall time and request counts. Exits non-zero if the batch results differ from the
+single fetches, are not in input order, do not report unknown and invalid keys per key, or
+took more than one search request.
+
+Usage:
+    python benchmarks/jira_batch.py [--tickets 10 50] [--latency-ms 20]
+"""
+import argparse
+import importlib
+import logging
+import os
+import sys
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ROOT)
+PACKAGE = "adk-sdlc"
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare single and batch JIRA ticket fetches")
+    parser.add_argument("--tickets", type=int, nargs="+", default=[10, 50], help="Tickets per fetch")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Latency of the stand-in server per request")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_ROOT)
+    sys.path.insert(0, ROOT)
+    from jira_server import JiraServer, make_issues
+    server = JiraServer(make_issues(max(args.tickets) * 2), latency_ms=args.latency_ms).start()
+    os.environ.update(
+        JIRA_BACKEND="rest",
+        JIRA_URL=server.url,
+        JIRA_MIRROR="false",
+        # Measures JIRA round trips, which the HTTP cache would absorb
+        HTTP_CACHE_DISABLED="true",
+        TRACING_DISABLED="true",
+        RATE_LIMITING_DISABLED="true",
+    )
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+    jira_tool = importlib.import_module(f"{PACKAGE}.sub_agents.requirements.tools.jira_tool")
+
+    failures = []
+    print(f"{'tickets':>8} {'single s':>9} {'requests':>9} {'batch s':>8} {'requests':>9}")
+    for count in args.tickets:
+        # Existing keys in reverse order, plus one unknown and one invalid key
+        keys = [f"PROJ-{number}" for number in range(count, 0, -1)] + ["PROJ-999999", "not a key"]
+
+        before = server.requests
+        started = time.perf_counter()
+        singles = [jira_tool.get_ticket_details(key) for key in keys]
+        single_seconds, single_requests = time.perf_counter() - started, server.requests - before
+
+        before = server.requests
+        started = time.perf_counter()
+        batch = jira_tool.get_ticket_details_batch(keys)
+        batch_seconds, batch_requests = time.perf_counter() - started, server.requests - before
+
+        print(f"{count:>8} {single_seconds:>9.3f} {single_requests:>9} {batch_seconds:>8.3f} {batch_requests:>9}")
+        results = batch["results"]
+        if [result["ticket_id"] for result in results] != keys:
+            failures.append(f"{count} tickets: batch results are not in input order")
+        for single, result in zip(singles[:count], results[:count]):
+            if result.get("formatted_details") != single.get("formatted_details"):
+                failures.append(f"{count} tickets: batch result for {result['ticket_id']} differs from get_ticket_details")
+                break
+        if batch["missing"] != keys[-2:] or any(result["status"] != "error" for result in results[-2:]):
+            failures.append(f"{count} tickets: unknown and invalid keys were not reported per key")
+        if batch_requests != 1:
+            failures.append(f"{count} tickets: batch fetch took {batch_requests} requests")
+
+    server.stop()
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Checks the local JIRA mirror and its delta sync against a local stand-in JIRA server.
+
+Runs the JIRA tools with JIRA_BACKEND=rest and JIRA_MIRROR=true against
+benchmarks/jira_server.py and checks that:
+
+- the first read fills the mirror with a full sync, and later reads within the freshness
+  bound make no JIRA requests;
+- after issues are changed and created in JIRA, a delta sync fetches only those (plus the
+  few issues inside the sync overlap) and the mirror serves the new versions;
+- max_age_seconds=0 syncs before reading, and a ticket created after the last sync is
+  fetched from JIRA on demand;
+- the open-ticket listing from the mirror matches the open issues in JIRA, and search_tickets
+  finds tickets by their text as of the last sync;
+- issues deleted in JIRA are kept by a delta sync and dropped by a full resync;
+- with JIRA unreachable, reads serve the mirrored rows marked stale instead of failing.
+
+Prints the cost of reads from the mirror next to direct JIRA requests, and exits non-zero
+on any failed check.
+
+Usage:
+    python benchmarks/jira_mirror.py [--issues 5000] [--changes 20] [--latency-ms 20]
+"""
+import argparse
+import datetime
+import importlib
+import logging
+import math
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from typing import Any, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ROOT)
+PACKAGE = "adk-sdlc"
+
+# Synthetic issues are updated one minute apart, starting here
+EPOCH = datetime.datetime(2024, 1, 1)
+
+def timestamp(minutes: float) -> str:
+    return (EPOCH + datetime.timedelta(minutes=minutes)).strftime("%Y-%m-%dT%H:%M:00.000+0000")
+
+def timed_us(call: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples)
+
+def open_keys(jira_tool: Any) -> List[str]:
+    keys, cursor = [], ""
+    while True:
+        page = jira_tool.list_open_tickets(cursor=cursor, page_size=jira_tool.MAX_PAGE_SIZE)
+        keys.extend(ticket["key"] for ticket in page["tickets"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return keys
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check the local JIRA mirror and its delta sync")
+    parser.add_argument("--issues", type=int, default=5000, help="Issues in the stand-in JIRA project")
+    parser.add_argument("--changes", type=int, default=20, help="Issues changed in JIRA between syncs")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Latency of the stand-in server per request")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_ROOT)
+    sys.path.insert(0, ROOT)
+    from jira_server import JiraServer, make_issues
+    issues = make_issues(args.issues)
+    for number, issue in enumerate(issues):
+        issue["fields"]["updated"] = timestamp(number)
+    server = JiraServer(issues, latency_ms=args.latency_ms).start()
+    workdir = tempfile.mkdtemp(prefix="jira_mirror_")
+    os.environ.update(
+        JIRA_BACKEND="rest",
+        JIRA_URL=server.url,
+        JIRA_PROJECT_KEY="PROJ",
+        JIRA_MIRROR="true",
+        JIRA_MIRROR_DB=os.path.join(workdir, "jira_mirror.sqlite3"),
+        JIRA_MIRROR_MAX_AGE_SECONDS="3600",
+        # Measures JIRA round trips, which the HTTP cache would absorb
+        HTTP_CACHE_DISABLED="true",
+        TRACING_DISABLED="true",
+        RATE_LIMITING_DISABLED="true",
+    )
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+    jira_tool = importlib.import_module(f"{PACKAGE}.sub_agents.requirements.tools.jira_tool")
+    jira_client = importlib.import_module(f"{PACKAGE}.sub_agents.requirements.tools.jira_client")
+    jira_mirror = importlib.import_module(f"{PACKAGE}.sub_agents.requirements.tools.jira_mirror")
+    settings = importlib.import_module(f"{PACKAGE}.settings").get_settings()
+    mirror = jira_mirror.get_jira_mirror()
+    rng = random.Random(3)
+    failures: List[str] = []
+
+    def requests_for(call: Callable[[], Any]) -> int:
+        before = server.requests
+        call()
+        return server.requests - before
+
+    def check(condition: bool, failure: str) -> None:
+        if not condition:
+            failures.append(failure)
+
+    # The first read fills the mirror
+    started = time.perf_counter()
+    first = requests_for(lambda: jira_tool.list_open_tickets())
+    full_seconds = time.perf_counter() - started
+    print(f"full sync: {mirror.count()} issues in {first} requests, {full_seconds:.2f} s")
+    check(mirror.count() == args.issues, f"full sync mirrored {mirror.count()} of {args.issues} issues")
+    check(first == math.ceil(args.issues / jira_client.MAX_RESULTS), f"full sync took {first} requests")
+
+    # Reads within the freshness bound stay local
+    keys = [f"PROJ-{rng.randint(1, args.issues)}" for _ in range(200)]
+    mirror_us = timed_us(lambda: jira_tool.get_ticket_details(rng.choice(keys)), 200)
+    remote_us = timed_us(lambda: jira_client.get_issue(rng.choice(keys)), 20)
+    warm = requests_for(lambda: (
+        [jira_tool.get_ticket_details(key) for key in keys[:50]],
+        jira_tool.get_ticket_details_batch(keys[50:]),
+        jira_tool.list_open_tickets(priority="High")
+    ))
+    print(f"get_ticket_details: {mirror_us:.0f} us from the mirror, {remote_us:.0f} us from JIRA")
+    check(warm == 0, f"reads from a fresh mirror made {warm} JIRA requests")
+
+    # Build the search index, so the delta sync below must update it
+    check(jira_tool.search_tickets("feature 7")["tickets"][0]["key"] == "PROJ-7", "search_tickets did not find PROJ-7")
+
+    # Change and create issues in JIRA, then sync the delta
+    changed = rng.sample(range(1, args.issues + 1), args.changes)
+    change_minutes = args.issues + 24 * 60
+    for number in changed:
+        issue = server.issues[f"PROJ-{number}"]
+        issue["fields"] = {**issue["fields"], "status": {"name": "Done"}, "updated": timestamp(change_minutes)}
+        server.put(issue)
+    renamed = f"PROJ-{changed[0]}"
+    server.issues[renamed]["fields"]["summary"] = "Handle timezone offsets"
+    created = make_issues(args.issues + 5)[args.issues:]
+    for issue in created:
+        issue["fields"]["updated"] = timestamp(change_minutes)
+        server.put(issue)
+    result = jira_tool.sync_jira_mirror()
+    print(f"delta sync: {result['fetched']} issues in {result['requests']} requests, {result['seconds']:.2f} s")
+    # The overlap re-reads at most one base issue per minute before the old watermark
+    expected = args.changes + len(created)
+    check(result["mode"] == "delta", f"second sync was a {result['mode']} sync")
+    check(expected <= result["fetched"] <= expected + settings.jira_sync_overlap_minutes + 1,
+          f"delta sync fetched {result['fetched']} issues for {expected} changes")
+    check(all(mirror.get(f"PROJ-{number}")["status"] == "Done" for number in changed),
+          "changed issues were not updated in the mirror")
+    check(all(mirror.get(issue["key"]) is not None for issue in created), "created issues are missing from the mirror")
+    found = jira_tool.search_tickets("timezone offsets")["tickets"]
+    check(bool(found) and found[0]["key"] == renamed, f"search_tickets did not find {renamed} after the delta sync")
+
+    # The freshness bound and on-demand fetches
+    check(requests_for(lambda: jira_tool.get_ticket_details("PROJ-1", max_age_seconds=0)) >= 1,
+          "max_age_seconds=0 did not sync first")
+    late = make_issues(args.issues + 6)[-1]
+    late["fields"]["updated"] = timestamp(change_minutes + 60)
+    server.put(late)
+    details = jira_tool.get_ticket_details(late["key"])
+    check(details["status"] == "success", f"{late['key']} created after the last sync was not found")
+    check(requests_for(lambda: jira_tool.get_ticket_details(late["key"])) == 0,
+          f"{late['key']} was not kept in the mirror after the on-demand fetch")
+
+    # The listing matches JIRA
+    expected_keys = sorted((key for key, issue in server.issues.items() if issue["fields"]["status"]["name"] == "Open"),
+                           key=lambda key: int(key.rpartition("-")[2]))
+    check(open_keys(jira_tool) == expected_keys, "open-ticket listing from the mirror differs from JIRA")
+
+    # Deletions are picked up by a full resync only
+    deleted = [f"PROJ-{number}" for number in rng.sample(range(1, args.issues + 1), 3)]
+    for key in deleted:
+        server.delete(key)
+    delta = jira_tool.sync_jira_mirror()
+    check(delta["deleted"] == 0 and all(mirror.get(key) for key in deleted), "delta sync dropped deleted issues")
+    full = jira_tool.sync_jira_mirror(full=True)
+    print(f"full resync: {full['fetched']} issues in {full['requests']} requests, {full['deleted']} deleted")
+    check(full["deleted"] == len(deleted) and not any(mirror.get(key) for key in deleted),
+          f"full resync deleted {full['deleted']} of {len(deleted)} deleted issues")
+    check(mirror.count() == len(server.issues), f"mirror has {mirror.count()} issues, JIRA has {len(server.issues)}")
+
+    # With JIRA unreachable, reads serve the mirrored rows, marked stale
+    server.stop()
+    stale = jira_tool.get_ticket_details("PROJ-1", max_age_seconds=0)
+    check(stale["status"] == "success" and stale.get("stale") is True and stale["age_seconds"] >= 0,
+          f"a failed sync did not serve stale rows: {stale}")
+    listing = jira_tool.list_open_tickets(max_age_seconds=0)
+    check(listing["status"] == "success" and listing.get("stale") is True, "a failed sync failed the listing")
+    print(f"unreachable JIRA: served rows synced {stale['age_seconds']} s ago")
+    mirror.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Local stand-in for the JIRA REST API, used by the benchmarks that run the JIRA tools with
+JIRA_BACKEND=rest.
+
+Serves synthetic issues from memory with a configurable per-request latency and counts the
+requests it receives:
+
+- POST /rest/api/2/search: JQL made of clauses joined by AND (`key in (...)`, `field = value`,
+  `field != value`, `updated >= "..."`, `project = X`, `text ~ "words"`) with an optional ORDER BY; unknown keys in `key in`
+  are reported as warningMessages, like JIRA does with validateQuery=warn;
+- GET /rest/api/2/issue/{key}: one issue, or 404; with an ETag, and 304 Not Modified when
+  If-None-Match names the current one.
+
+Usage from a benchmark:
+    server = JiraServer(make_issues(1000), latency_ms=20).start()
+    os.environ["JIRA_URL"] = server.url
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+STATUSES = ["Open", "In Progress", "In Review", "Done"]
+PRIORITIES = ["Highest", "High", "Medium", "Low", "Lowest"]
+
+_ORDER_BY = re.compile(r"\s+ORDER\s+BY\s+(\w+)(?:\s+(ASC|DESC))?\s*$", re.IGNORECASE)
+_IN = re.compile(r"^\s*(\w+)\s+in\s+\((.*)\)\s*$", re.IGNORECASE)
+_COMPARE = re.compile(r"^\s*(\w+)\s*(!=|>=|<=|=|>|<|~)\s*(.+?)\s*$")
+_VALUE = re.compile(r'"((?:[^"\\]|\\.)*)"|([^\s,]+)')
+
+def make_issues(count: int, project: str = "PROJ", seed: int = 7) -> List[Dict[str, Any]]:
+    """Returns synthetic issues in JIRA REST form."""
+    rng = random.Random(seed)
+    issues = []
+    for number in range(1, count + 1):
+        issues.append({
+            "key": f"{project}-{number}",
+            "fields": {
+                "summary": f"Implement feature {number}",
+                "status": {"name": rng.choice(STATUSES)},
+                "description": (
+                    f"As a developer, I want feature {number}.\n\n"
+                    "Requirements:\n- Implement the feature\n- Write unit tests\n\n"
+                    "Acceptance Criteria:\n1. The feature works\n2. Tests pass\n"
+                ),
+                "issuetype": {"name": "Story"},
+                "priority": {"name": rng.choice(PRIORITIES)},
+                "assignee": {"displayName": f"user-{rng.randrange(50)}"},
+                "reporter": {"displayName": "Jane Smith"},
+                "created": "2024-05-07T10:00:00.000+0000",
+                "updated": f"2024-05-{1 + number % 28:02d}T10:00:00.000+0000"
+            }
+        })
+    return issues
+
+def _values(text: str) -> List[str]:
+    return [quoted.replace('\\"', '"').replace("\\\\", "\\") if quoted is not None else bare
+            for quoted, bare in _VALUE.findall(text)]
+
+def _key_order(key: str) -> tuple:
+    project, _, number = key.rpartition("-")
+    return (project, int(number)) if number.isdigit() else (key, -1)
+
+def _field(issue: Dict[str, Any], name: str) -> Any:
+    if name == "key":
+        return issue["key"]
+    if name == "project":
+        return issue["key"].rpartition("-")[0]
+    if name == "text":
+        return f"{issue['fields'].get('summary') or ''}\n{issue['fields'].get('description') or ''}"
+    value = issue["fields"].get("issuetype" if name == "type" else name)
+    if name in ("created", "updated") and value:
+        # JQL compares dates as "yyyy-MM-dd HH:mm"
+        return value[:16].replace("T", " ")
+    if isinstance(value, dict):
+        return value.get("name", value.get("displayName"))
+    return value
+
+def compile_jql(jql: str) -> Dict[str, Any]:
+    """Compiles the supported JQL subset into a predicate, the keys it names and an ordering."""
+    order = None
+    match = _ORDER_BY.search(jql)
+    if match:
+        order = (match.group(1), (match.group(2) or "ASC").upper() == "DESC")
+        jql = jql[:match.start()]
+    predicates: List[Callable[[Dict[str, Any]], bool]] = []
+    keys: Optional[List[str]] = None
+    for clause in re.split(r"\s+AND\s+", jql.strip(), flags=re.IGNORECASE) if jql.strip() else []:
+        match = _IN.match(clause)
+        if match:
+            field, values = match.group(1), set(_values(match.group(2)))
+            if field.lower() == "key":
+                keys = _values(match.group(2))
+            predicates.append(lambda issue, field=field, values=values: _field(issue, field) in values)
+            continue
+        match = _COMPARE.match(clause)
+        if not match:
+            raise ValueError(f"Unsupported JQL clause: {clause}")
+        field, operator, value = match.group(1), match.group(2), _values(match.group(3))[0]
+        compare = {
+            "=": lambda a, b: a == b, "!=": lambda a, b: a != b,
+            ">=": lambda a, b: a is not None and a >= b, "<=": lambda a, b: a is not None and a <= b,
+            ">": lambda a, b: a is not None and a > b, "<": lambda a, b: a is not None and a < b,
+            # Every word of the value, case-insensitively
+            "~": lambda a, b: a is not None and all(word in a.lower() for word in b.lower().split()),
+        }[operator]
+        predicates.append(lambda issue, field=field, value=value, compare=compare: compare(_field(issue, field), value))
+    return {
+        "predicate": lambda issue: all(predicate(issue) for predicate in predicates),
+        "keys": keys,
+        "order": order
+    }
+
+class JiraServer:
+    """Threaded HTTP server serving the given issues."""
+
+    def __init__(self, issues: List[Dict[str, Any]], latency_ms: float = 0.0):
+        self.issues = {issue["key"]: issue for issue in issues}
+        self.latency = latency_ms / 1000
+        self.requests = 0
+        self.not_modified = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self) -> "JiraServer":
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        # Close the listening socket too, so later requests are refused instead of hanging
+        self.httpd.server_close()
+
+    def put(self, issue: Dict[str, Any]) -> None:
+        """Adds or replaces an issue."""
+        with self.lock:
+            self.issues[issue["key"]] = issue
+
+    def delete(self, key: str) -> None:
+        """Removes an issue."""
+        with self.lock:
+            self.issues.pop(key, None)
+
+    def search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        query = compile_jql(body.get("jql", ""))
+        with self.lock:
+            matches = [issue for issue in self.issues.values() if query["predicate"](issue)]
+        if query["order"]:
+            field, descending = query["order"]
+            # Keys sort numerically within a project, like JIRA does
+            value = (lambda issue: _key_order(issue["key"])) if field.lower() == "key" else (lambda issue: _field(issue, field))
+            matches.sort(key=lambda issue: (value(issue) is None, value(issue)), reverse=descending)
+        start_at, max_results = int(body.get("startAt", 0)), int(body.get("maxResults", 50))
+        warnings = [f"An issue with key '{key}' does not exist for field 'key'."
+                    for key in query["keys"] or [] if key not in self.issues]
+        return {
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(matches),
+            "issues": matches[start_at:start_at + max_results],
+            "warningMessages": warnings
+        }
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _reply(self, status: int, body: Dict[str, Any], etag: Optional[str] = None) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _enter(self) -> None:
+                with server.lock:
+                    server.requests += 1
+                time.sleep(server.latency)
+
+            def do_POST(self) -> None:
+                self._enter()
+                if urlparse(self.path).path != "/rest/api/2/search":
+                    return self._reply(404, {"errorMessages": ["Not found"]})
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                try:
+                    return self._reply(200, server.search(body))
+                except ValueError as e:
+                    return self._reply(400, {"errorMessages": [str(e)]})
+
+            def do_GET(self) -> None:
+                self._enter()
+                path = urlparse(self.path).path
+                if not path.startswith("/rest/api/2/issue/"):
+                    return self._reply(404, {"errorMessages": ["Not found"]})
+                issue = server.issues.get(path.rsplit("/", 1)[-1])
+                if issue is None:
+                    return self._reply(404, {"errorMessages": ["Issue does not exist"]})
+                etag = '"' + hashlib.sha1(json.dumps(issue, sort_keys=True).encode()).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    with server.lock:
+                        server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                return self._reply(200, issue, etag)
+
+        return Handler
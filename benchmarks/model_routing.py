@@ -0,0 +1,95 @@
+"""
+Offline check of the adaptive model router against stub models.
+
+Routes calls of one agent over a "large" stub model that starts out slower than the SLO
+and a fast stub model, then makes the large model fast again:
+
+1. degraded: once the large model has MIN_SAMPLES calls over the SLO, calls fall back to
+   the fast model, except for periodic probes of the large model;
+2. recovered: after the slow samples age out, the probes bring the route back to the
+   large model.
+
+Prints the route of every call and exits non-zero if either transition did not happen.
+
+Usage:
+    python benchmarks/model_routing.py [--calls 30] [--slo-ms 150]
+"""
+import argparse
+import asyncio
+import importlib
+import logging
+import os
+import sys
+import time
+import warnings
+from typing import List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ROOT)
+PACKAGE = "adk-sdlc"
+
+LARGE_MODEL = "stub-large"
+FAST_MODEL = "stub-10ms"
+
+# Seconds of history the router keeps in this check, so recovery does not take minutes
+HISTORY_MAX_AGE = 3.0
+
+async def drive(routed, calls: int) -> List[str]:
+    """Sends calls through a routed model and returns the model each one went to."""
+    from google.adk.models import LlmRequest
+    from google.genai import types
+
+    chosen = []
+    for _ in range(calls):
+        before = dict(routed.route_stats()["routes"])
+        request = LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text="ping")])])
+        async for _ in routed.generate_content_async(request):
+            pass
+        after = routed.route_stats()["routes"]
+        chosen.append(next(model for model in after if after[model] != before.get(model, 0)))
+    return chosen
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check model fallback and recovery with stub models")
+    parser.add_argument("--calls", type=int, default=30, help="Calls per phase")
+    parser.add_argument("--slo-ms", type=float, default=150, help="Latency SLO of the routed agent")
+    args = parser.parse_args()
+
+    os.environ.update(
+        ROUTER_MODEL_LARGE=LARGE_MODEL,
+        ROUTER_MODEL_FAST=FAST_MODEL,
+        ROUTER_HISTORY_MAX_AGE=str(HISTORY_MAX_AGE),
+        ROUTER_MIN_SAMPLES="5",
+        ROUTER_PROBE_EVERY="5",
+        STUB_MODEL_LATENCY_MS=str(args.slo_ms * 2),
+    )
+    sys.path.insert(0, REPO_ROOT)
+    sys.path.insert(0, ROOT)
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+    import stub_model
+    stub_model.register()
+    router = importlib.import_module(f"{PACKAGE}.model_router")
+    routed = router.routed_model("routing_benchmark", tier="large", slo_seconds=args.slo_ms / 1000)
+
+    failures = []
+    degraded = asyncio.run(drive(routed, args.calls))
+    print("degraded: ", " ".join("L" if model == LARGE_MODEL else "f" for model in degraded))
+    if degraded[-5:].count(FAST_MODEL) < 4:
+        failures.append("router did not fall back to the fast model while the large model breached the SLO")
+
+    # The large model is fast again; wait for its slow samples to age out
+    os.environ["STUB_MODEL_LATENCY_MS"] = str(args.slo_ms / 5)
+    time.sleep(HISTORY_MAX_AGE)
+    recovered = asyncio.run(drive(routed, args.calls))
+    print("recovered:", " ".join("L" if model == LARGE_MODEL else "f" for model in recovered))
+    if recovered[-5:] != [LARGE_MODEL] * 5:
+        failures.append("router did not return to the large model after it met the SLO again")
+
+    print(routed.route_stats())
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Offline check of parallel per-module implementation generation.
+
+Plans a requirements document with modules of different sizes and generates it with a
+simulated model latency proportional to each module's size, plus random jitter so units
+finish in a different order on every run:
+
+- sequential: one worker, which costs the sum of all modules like a monolithic call;
+- parallel: one worker per module, which should cost about the largest module.
+
+The simulated units write one function per requirement item into their module, and also
+produce what the merge has to reconcile: imports of a name from the wrong sibling module,
+overlapping requirements.txt fragments and their own __init__.py. Finally, a requirements
+document of that size must take the parallel path through generate_implementation.
+
+Exits non-zero if the parallel run takes more than --max-ratio times the largest module, if
+runs with different completion orders produce different artifacts, or if the merged package
+has unresolved imports, missing exports or duplicated requirements.
+
+Usage:
+    python benchmarks/parallel_generation.py [--modules 8] [--item-ms 40] [--runs 3]
+"""
+import argparse
+import ast
+import importlib
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ROOT)
+PACKAGE = "adk-sdlc"
+
+TOPICS = ["image loader", "grayscale filter", "pixel mapper", "charset table", "output writer",
+          "command parser", "width scaler", "color palette", "frame buffer", "font metrics"]
+
+def requirements_document(modules: int) -> str:
+    items = []
+    for number in range(modules):
+        # Module n implements n + 1 requirement items, so sizes differ
+        items.extend(f"- {TOPICS[number % len(TOPICS)]} part {part}" for part in range(1, number + 2))
+    return (
+        "# BENCH-1: Benchmark converter\n\nAs a developer, I want a converter.\n\n"
+        "Requirements:\n" + "\n".join(items) + "\n\nAcceptance Criteria:\n1. It works\n"
+    )
+
+def module_files(package: str, unit: Dict[str, Any]) -> Dict[str, str]:
+    """Files a unit's generation call would return: one function per requirement item."""
+    functions = "".join(f"\n\ndef {unit['module']}_{number}(value):\n    return value\n"
+                        for number in range(1, len(unit["requirements"]) + 1))
+    return {f"{package}/{unit['module']}.py": f'"""{unit["module"]} module."""\n' + functions}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark parallel per-module generation")
+    parser.add_argument("--modules", type=int, default=8, help="Planned modules (at most 10)")
+    parser.add_argument("--item-ms", type=float, default=40.0, help="Simulated generation time per requirement item")
+    parser.add_argument("--runs", type=int, default=3, help="Parallel runs with different completion orders")
+    parser.add_argument("--max-ratio", type=float, default=1.5,
+                        help="Allowed parallel wall time as a multiple of the largest module")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory(prefix="adk-sdlc-parallel-")
+    os.environ.update(
+        RESULT_CACHE_DIR=os.path.join(workdir.name, "results"),
+        ARTIFACT_STORE_DIR=os.path.join(workdir.name, "artifacts"),
+        TRACING_DISABLED="true",
+    )
+    sys.path.insert(0, REPO_ROOT)
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+    generator = importlib.import_module(f"{PACKAGE}.sub_agents.implementation.tools.parallel_generator")
+    artifact_store = importlib.import_module(f"{PACKAGE}.sub_agents.tools.artifact_store")
+
+    requirements = requirements_document(args.modules)
+    plan = generator.plan_modules(requirements)
+    modules = [unit["module"] for unit in plan["units"]]
+    jitter = random.Random()
+
+    def simulated(package: str, unit: Dict[str, Any], plan_modules: List[str], project_context: str = "") -> Dict[str, Any]:
+        time.sleep(len(unit["requirements"]) * args.item_ms / 1000 + jitter.uniform(0, args.item_ms / 1000))
+        result = {"success": True, "files": module_files(package, unit)}
+        index = plan_modules.index(unit["module"])
+        path = f"{package}/{unit['module']}.py"
+        if index > 0:
+            # Import the previous module's first function, but from the first module
+            name = f"{plan_modules[index - 1]}_1"
+            result["files"][path] = f"from .{plan_modules[0]} import {name}\n" + result["files"][path]
+        result["files"][f"{package}/requirements.txt"] = f"Pillow>=9.0.0\nnumpy>=1.21.0\nrich=={index}.0\n"
+        result["files"][f"{package}/__init__.py"] = f"from .{unit['module']} import *\n"
+        return result
+
+    generator._generate_module = simulated
+    largest = max(len(unit["requirements"]) for unit in plan["units"]) * args.item_ms / 1000
+
+    def run(workers: int, seed: int) -> Dict[str, Any]:
+        jitter.seed(seed)
+        started = time.perf_counter()
+        # A fresh project context per run misses the cache without overwriting earlier entries
+        result = generator.generate_implementation_parallel(requirements, project_context=f"run {seed}", max_workers=workers)
+        return {**result, "wall_seconds": time.perf_counter() - started}
+
+    sequential = run(1, 0)
+    parallel = [run(len(modules), seed) for seed in range(1, args.runs + 1)]
+    print(f"{len(modules)} modules, largest {largest:.2f} s of generation")
+    print(f"{'mode':>11} {'workers':>8} {'wall s':>7} {'artifact':>22}")
+    for name, result, workers in [("sequential", sequential, 1)] + [(f"parallel {n}", r, len(modules)) for n, r in enumerate(parallel, 1)]:
+        print(f"{name:>11} {workers:>8} {result['wall_seconds']:>7.2f} {result['artifact_id']:>22}")
+
+    failures = []
+    best = min(result["wall_seconds"] for result in parallel)
+    if best > largest * args.max_ratio:
+        failures.append(f"parallel run took {best:.2f} s, over {args.max_ratio} x the largest module ({largest:.2f} s)")
+    if len({result["artifact_id"] for result in parallel + [sequential]}) != 1:
+        failures.append("runs with different completion orders produced different artifacts")
+
+    files = artifact_store.get_artifact_store().load_files(sequential["artifact_id"])
+    package = plan["package"]
+    init = ast.parse(files[f"{package}/__init__.py"])
+    exported = next(ast.literal_eval(node.value) for node in init.body if isinstance(node, ast.Assign))
+    defined = [name for path, content in files.items() if path.endswith(".py") and not path.endswith("__init__.py")
+               for name in generator._public_names(content)]
+    if sorted(exported) != sorted(defined):
+        failures.append(f"__init__.py exports {len(exported)} of {len(defined)} public names")
+    if sequential["unresolved_imports"]:
+        failures.append(f"unresolved imports: {sequential['unresolved_imports']}")
+    for path, content in files.items():
+        if path.endswith(".py") and not path.endswith("__init__.py"):
+            for node in ast.parse(content).body:
+                if isinstance(node, ast.ImportFrom) and node.level == 1:
+                    source = generator._public_names(files[f"{package}/{node.module}.py"])
+                    missing = [alias.name for alias in node.names if alias.name not in source]
+                    if missing:
+                        failures.append(f"{path} still imports {missing} from .{node.module}")
+    requirement_lines = files[f"{package}/requirements.txt"].splitlines()
+    if len(requirement_lines) != 3:
+        failures.append(f"requirements.txt has {len(requirement_lines)} lines: {requirement_lines}")
+    print(f"merge: {len(exported)} exports, requirements {requirement_lines}, {len(sequential['conflicts'])} conflicts reported")
+
+    implementation_tool = importlib.import_module(f"{PACKAGE}.sub_agents.implementation.tools.implementation_tool")
+    routed = implementation_tool.generate_implementation(requirements)
+    min_modules = importlib.import_module(f"{PACKAGE}.settings").get_settings().implementation_parallel_min_modules
+    if len(modules) >= min_modules > 0 and routed.get("modules") != modules:
+        failures.append("generate_implementation did not generate the planned modules in parallel")
+
+    workdir.cleanup()
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
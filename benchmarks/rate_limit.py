@@ -0,0 +1,148 @@
+"""
+Offline check of the shared rate limiter against a simulated GitHub secondary rate limit.
+
+The simulated server accepts up to --server-rps requests in any one-second window. Past
+that it blocks for a second and answers every request in the meantime with 429 and the
+Retry-After of the block, like a secondary limit. Three runs
+(one large, two small) send requests concurrently, retrying each 429:
+
+- naive: every client sleeps for Retry-After and retries on its own, so the retries land
+  together and trip the limit again;
+- shared: all requests go through the rate limiter (configured above the server limit, so
+  it has to adapt from the 429s and X-RateLimit headers).
+
+Prints wall time, goodput, 429 count and when each run finished, and exits non-zero if the
+shared limiter did not cut the 429s or finish the small runs before the large one.
+
+Usage:
+    python benchmarks/rate_limit.py [--server-rps 20] [--requests 120 20 20] [--workers 4]
+"""
+import argparse
+import importlib
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ROOT)
+PACKAGE = "adk-sdlc"
+
+# How long the server blocks once its limit is exceeded, in seconds
+BLOCK_SECONDS = 1.0
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: Dict[str, str]):
+        self.status_code = status_code
+        self.headers = headers
+
+class SimulatedServer:
+    """Sliding one-second window limit with Retry-After blocks."""
+
+    def __init__(self, rps: int):
+        self.rps = rps
+        self.window: deque = deque()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+        self.rejected = 0
+
+    def get(self, *args: Any, **kwargs: Any) -> FakeResponse:
+        with self.lock:
+            now = time.monotonic()
+            while self.window and self.window[0] <= now - 1.0:
+                self.window.popleft()
+            if now < self.blocked_until or len(self.window) >= self.rps:
+                if now >= self.blocked_until:
+                    self.blocked_until = now + BLOCK_SECONDS
+                self.rejected += 1
+                return FakeResponse(429, {"Retry-After": str(round(self.blocked_until - now, 2))})
+            self.window.append(now)
+            # The primary (hourly) budget is ample, so the secondary limit is the one that binds
+            return FakeResponse(200, {
+                "X-RateLimit-Remaining": str(1_000_000 - len(self.window)),
+                "X-RateLimit-Reset": str(int(time.time()) + 3600)
+            })
+
+def run_mode(mode: str, server_rps: int, sizes: List[int], workers: int) -> Dict[str, Any]:
+    limiter = importlib.import_module(f"{PACKAGE}.sub_agents.tools.rate_limiter")
+    tracing = importlib.import_module(f"{PACKAGE}.sub_agents.tools.tracing")
+    limiter._limiters.clear()
+    server = SimulatedServer(server_rps)
+    get = limiter.rate_limited("github", server.get) if mode == "shared" else server.get
+
+    started = time.monotonic()
+    finished: Dict[str, float] = {}
+    threads = []
+    for index, size in enumerate(sizes):
+        run_id = f"run-{index + 1}"
+        pending = deque(range(size))
+        lock = threading.Lock()
+        done = [0]
+
+        def work(run_id=run_id, pending=pending, lock=lock, done=done, size=size):
+            with tracing.trace_context(run_id=run_id):
+                while True:
+                    with lock:
+                        if not pending:
+                            return
+                        pending.popleft()
+                    while True:
+                        response = get("https://api.github.com/repos/example/example/git/ref/heads/main")
+                        if response.status_code != 429:
+                            break
+                        if mode == "naive":
+                            time.sleep(float(response.headers["Retry-After"]))
+                    with lock:
+                        done[0] += 1
+                        if done[0] == size:
+                            finished[run_id] = time.monotonic() - started
+
+        threads.extend(threading.Thread(target=work) for _ in range(workers))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    wall = time.monotonic() - started
+    return {
+        "mode": mode,
+        "wall_seconds": round(wall, 2),
+        "goodput_per_second": round(sum(sizes) / wall, 1),
+        "rejected": server.rejected,
+        "finished": {run: round(seconds, 2) for run, seconds in sorted(finished.items())},
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare naive retries with the shared rate limiter")
+    parser.add_argument("--server-rps", type=int, default=20, help="Requests per second the server accepts")
+    parser.add_argument("--requests", type=int, nargs="+", default=[120, 20, 20], help="Requests per run")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent clients per run")
+    args = parser.parse_args()
+
+    # Configure the limiter above the server limit so it has to adapt to the 429s
+    os.environ["RATE_LIMIT_GITHUB_RPS"] = str(args.server_rps * 2)
+    os.environ.pop("RATE_LIMITING_DISABLED", None)
+    sys.path.insert(0, REPO_ROOT)
+
+    results = [run_mode(mode, args.server_rps, args.requests, args.workers) for mode in ("naive", "shared")]
+    print(f"{'mode':<8} {'wall s':>8} {'req/s':>7} {'429s':>6}  finished (s)")
+    for result in results:
+        finished = " ".join(f"{run}={seconds}" for run, seconds in result["finished"].items())
+        print(f"{result['mode']:<8} {result['wall_seconds']:>8} {result['goodput_per_second']:>7} "
+              f"{result['rejected']:>6}  {finished}")
+
+    naive, shared = results
+    failures = []
+    if shared["rejected"] >= naive["rejected"]:
+        failures.append("the shared limiter did not reduce the number of 429s")
+    small_runs = [seconds for run, seconds in shared["finished"].items() if run != "run-1"]
+    if small_runs and max(small_runs) >= shared["finished"]["run-1"]:
+        failures.append("the small runs did not finish before the large one under the fair queue")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
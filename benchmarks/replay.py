@@ -0,0 +1,96 @@
+"""
+Replays a recorded run of the orchestrator.
+
+Record a run by setting RECORD_MODE=record (and optionally RECORDING_FILE) for `adk web`,
+`adk run` or benchmarks/e2e.py. This script then feeds every recorded user message back to
+the orchestrator that received it, with RECORD_MODE=replay: model responses and JIRA/GitHub
+results come from the recording, outbound sockets are blocked, and only the orchestration
+code runs for real, at full CPU speed. The per-tool latency of the replay is printed from
+its tracing spans, so two code versions can be compared on the same recorded traffic.
+
+Usage:
+    python benchmarks/replay.py [recording.jsonl.gz]
+"""
+import argparse
+import importlib
+import logging
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ROOT)
+PACKAGE = "adk-sdlc"
+
+# Module holding each agent that can start a recorded session
+ROOT_AGENT_MODULES = {
+    "adk_sdlc_orchestrator": (f"{PACKAGE}.agent", "orchestrator_agent"),
+    "orchestrator_agent": (f"{PACKAGE}.sub_agents.orchestrator.agent", "orchestrator_agent"),
+}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded orchestrator run without network access")
+    parser.add_argument("path", nargs="?", help="Recording file (defaults to RECORDING_FILE)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_ROOT)
+    sys.path.insert(0, ROOT)
+    from e2e import block_network
+    recorder = importlib.import_module(f"{PACKAGE}.sub_agents.tools.recorder")
+    path = args.path or os.environ.get("RECORDING_FILE", recorder.DEFAULT_RECORDING_FILE)
+    if not os.path.exists(path):
+        print(f"No recording found at {path}")
+        return 1
+
+    workdir = tempfile.mkdtemp(prefix="adk-sdlc-replay-")
+    os.environ.update(
+        RECORD_MODE="replay",
+        RECORDING_FILE=path,
+        RESULT_CACHE_DIR=os.path.join(workdir, "results"),
+        ARTIFACT_STORE_DIR=os.path.join(workdir, "artifacts"),
+        CHECKPOINT_DB=os.path.join(workdir, "checkpoints.sqlite3"),
+        TRACE_FILE=os.path.join(workdir, "spans.jsonl"),
+        TRACING_DISABLED="false",
+    )
+    # The package read its settings on import
+    importlib.import_module(f"{PACKAGE}.settings").reload_settings()
+    block_network()
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    inputs = [entry for entry in recorder.load_recording(path) if entry["kind"] == "input"]
+    if not inputs:
+        print(f"{path} contains no recorded orchestrator sessions")
+        return 1
+
+    total = 0.0
+    for entry in inputs:
+        module_name, attribute = ROOT_AGENT_MODULES[entry["name"]]
+        agent = getattr(importlib.import_module(module_name), attribute)
+        runner = InMemoryRunner(agent=agent, app_name="replay")
+        session = runner.session_service.create_session_sync(app_name="replay", user_id="replay")
+        message = types.Content(role="user", parts=[types.Part(text=entry["text"])])
+
+        started = time.perf_counter()
+        final = ""
+        for event in runner.run(user_id="replay", session_id=session.id, new_message=message):
+            if event.is_final_response() and event.content and event.content.parts:
+                final = "".join(part.text or "" for part in event.content.parts)
+        elapsed = time.perf_counter() - started
+        total += elapsed
+        print(f"[{entry['name']}] {entry['text'][:60]!r} replayed in {elapsed:.3f} s")
+        print(f"    -> {final[:200]}")
+
+    print(f"\nReplayed {len(inputs)} session(s) in {total:.3f} s")
+    tracing = importlib.import_module(f"{PACKAGE}.sub_agents.tools.tracing")
+    spans = tracing.load_spans(tracing.trace_file())
+    tracing.print_table("Per tool", tracing.summarize_spans(spans, "tool.name"))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Offline check of streamed implementation generation.
+
+Generates a multi-module implementation with a simulated per-file model latency and runs the
+testing stage (static checks plus per-module test generation, with a simulated per-call
+latency) two ways:
+
+- batch: the testing stage starts once the whole implementation exists;
+- streamed: stream_code_func hands each file to generate_tests_from_stream as soon as it is
+  generated, so checks and tests overlap with the remaining generation.
+
+It then runs the implementation -> testing handoff the agents use, generate_implementation
+followed by generate_tests with the implementation's artifact ID and the same requirements,
+with SPECULATIVE_TESTS off and on; with it, generate_implementation starts the tests while it
+streams. A generate_tests call with other requirements must not get the streamed tests.
+
+Reports wall time and when the first static check result was available, and exits non-zero
+if streaming is not faster, the two ways produce different tests, checks or artifacts, or the
+streamed handoff is not faster than the unstreamed one.
+
+Usage:
+    python benchmarks/streaming.py [--modules 8] [--generate-ms 40] [--test-ms 120] [--workers 4]
+"""
+import argparse
+import importlib
+import logging
+import os
+import sys
+import tempfile
+import time
+import warnings
+from typing import Any, Dict
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ROOT)
+PACKAGE = "adk-sdlc"
+
+def module_source(number: int) -> str:
+    return (
+        f'"""Module {number} of the generated package."""\n\n'
+        f"def handler_{number}(value):\n"
+        f"    return value * {number}\n"
+    )
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark streamed implementation generation")
+    parser.add_argument("--modules", type=int, default=8, help="Generated Python modules")
+    parser.add_argument("--generate-ms", type=float, default=40.0, help="Simulated generation time per file")
+    parser.add_argument("--test-ms", type=float, default=120.0, help="Simulated test generation time per module")
+    parser.add_argument("--workers", type=int, default=4, help="Testing stage workers")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory(prefix="adk-sdlc-streaming-")
+    os.environ.update(
+        RESULT_CACHE_DIR=os.path.join(workdir.name, "results"),
+        ARTIFACT_STORE_DIR=os.path.join(workdir.name, "artifacts"),
+        TRACING_DISABLED="true",
+    )
+    sys.path.insert(0, REPO_ROOT)
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+    code_generator = importlib.import_module(f"{PACKAGE}.sub_agents.implementation.tools.code_generator")
+    implementation_tool = importlib.import_module(f"{PACKAGE}.sub_agents.implementation.tools.implementation_tool")
+    testing_tool = importlib.import_module(f"{PACKAGE}.sub_agents.testing.tools.testing_tool")
+    static_checks = importlib.import_module(f"{PACKAGE}.sub_agents.testing.tools.static_checks")
+    settings = importlib.import_module(f"{PACKAGE}.settings")
+
+    files = {f"generated/module_{number}.py": module_source(number) for number in range(1, args.modules + 1)}
+    files["generated/__init__.py"] = "".join(f"from .module_{n} import handler_{n}\n" for n in range(1, args.modules + 1))
+    files["generated/requirements.txt"] = "Pillow>=9.0.0\n"
+
+    def slow_stream(requirements: str, project_context: str = ""):
+        for path, content in files.items():
+            time.sleep(args.generate_ms / 1000)
+            yield path, content
+        return {"setup_instructions": "pip install -r generated/requirements.txt"}
+
+    generate_tests = testing_tool._generate_tests
+
+    def slow_tests(implementation: Dict[str, Any], requirements: str = "") -> Dict[str, Any]:
+        time.sleep(args.test_ms / 1000)
+        result = generate_tests(implementation, requirements)
+        # One test module per source module, so merged results differ if a module is missed
+        for path in implementation["files"]:
+            result["files"][f"tests/test_{os.path.basename(path)}"] = f"# tests for {path}\n"
+        return result
+
+    def slow_implementation(requirements: str) -> Dict[str, Any]:
+        time.sleep(len(files) * args.generate_ms / 1000)
+        return {"success": True, "code": dict(files)}
+
+    def slow_implementation_stream(requirements: str):
+        yield from slow_stream(requirements)
+        return {"success": True}
+
+    # Simulated model latency for both generators
+    code_generator._stream_code = slow_stream
+    implementation_tool._generate_implementation = slow_implementation
+    implementation_tool._stream_implementation = slow_implementation_stream
+    testing_tool._generate_tests = slow_tests
+    first_check = {}
+    check_file = static_checks.check_file
+
+    def timed_check(file: Any) -> Dict[str, Any]:
+        result = check_file(file)
+        first_check.setdefault("seconds", time.perf_counter() - started)
+        return result
+
+    testing_tool.check_file = timed_check
+
+    results = {}
+    for mode in ("batch", "streamed"):
+        first_check.clear()
+        started = time.perf_counter()
+        stream = code_generator.stream_code_func(f"benchmark requirements ({mode})", bypass_cache=True)
+        if mode == "batch":
+            # Wait for the whole implementation before the testing stage starts
+            stream.result()
+        result = testing_tool.generate_tests_from_stream(stream, "benchmark requirements", bypass_cache=True,
+                                                         max_workers=args.workers)
+        results[mode] = {**result, "wall_seconds": time.perf_counter() - started, "first_check_seconds": first_check["seconds"]}
+
+    print(f"{'mode':>9} {'wall s':>7} {'first check s':>14} {'files':>6} {'test files':>11}")
+    for mode, result in results.items():
+        print(f"{mode:>9} {result['wall_seconds']:>7.2f} {result['first_check_seconds']:>14.3f} "
+              f"{result['implementation']['artifact']['file_count']:>6} {result['tests']['artifact']['file_count']:>11}")
+
+    handoff = {}
+    for mode in ("unstreamed", "streamed"):
+        os.environ["SPECULATIVE_TESTS"] = str(mode == "streamed").lower()
+        settings.reload_settings()
+        requirements = f"benchmark requirements ({mode})"
+        started = time.perf_counter()
+        implementation = implementation_tool.generate_implementation(requirements, bypass_cache=True)
+        tests = testing_tool.generate_tests(requirements=requirements, implementation_artifact_id=implementation["artifact_id"])
+        handoff[mode] = {"wall_seconds": time.perf_counter() - started, "handed_off": "static_check_failures" in tests}
+    print(f"\n{'handoff':>11} {'wall s':>7} {'handed off':>11}")
+    for mode, result in handoff.items():
+        print(f"{mode:>11} {result['wall_seconds']:>7.2f} {str(result['handed_off']):>11}")
+
+    # Streamed tests for other requirements are never handed off
+    implementation = implementation_tool.generate_implementation("benchmark requirements (mismatch)", bypass_cache=True)
+    mismatched = testing_tool.generate_tests(requirements="other requirements", implementation_artifact_id=implementation["artifact_id"])
+
+    failures = []
+    if "static_check_failures" in mismatched:
+        failures.append("generate_tests returned tests streamed for different requirements")
+    if not handoff["streamed"]["handed_off"]:
+        failures.append("generate_tests did not pick up the tests started by generate_implementation")
+    if handoff["streamed"]["wall_seconds"] >= handoff["unstreamed"]["wall_seconds"]:
+        failures.append(f"streamed handoff took {handoff['streamed']['wall_seconds']:.2f} s, "
+                        f"unstreamed {handoff['unstreamed']['wall_seconds']:.2f} s")
+    batch, streamed = results["batch"], results["streamed"]
+    for mode, result in results.items():
+        if not result["success"]:
+            failures.append(f"{mode}: {result['message']}")
+    if streamed["wall_seconds"] >= batch["wall_seconds"]:
+        failures.append(f"streamed run took {streamed['wall_seconds']:.2f} s, batch {batch['wall_seconds']:.2f} s")
+    if streamed["tests"]["artifact_id"] != batch["tests"]["artifact_id"]:
+        failures.append("streamed and batch runs generated different tests")
+    if streamed["implementation"]["artifact_id"] != batch["implementation"]["artifact_id"]:
+        failures.append("streamed and batch runs stored different implementations")
+    if streamed["static_checks"] != batch["static_checks"]:
+        failures.append("streamed and batch runs reported different static checks")
+    workdir.cleanup()
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
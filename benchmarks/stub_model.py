@@ -0,0 +1,82 @@
+"""
+Deterministic local stand-in for the Vertex model, used by the offline benchmarks.
+
+Any agent whose model name starts with "stub" (e.g. VERTEX_MODEL=stub-model) is served by
+StubLlm once register() has been called. The stub never touches the network: for a user
+message it calls the first tool of its script that the agent offers, and once the tool
+result is in it answers with that result as JSON text. Every call sleeps for a configurable
+latency so benchmarks can separate model time from orchestration time: a name like
+"stub-250ms" sets it per model, otherwise STUB_MODEL_LATENCY_MS applies.
+"""
+import asyncio
+import json
+import os
+import re
+from typing import Any, AsyncGenerator, Callable, Dict, List, Tuple
+from google.adk.models import BaseLlm, LLMRegistry, LlmRequest, LlmResponse
+from google.genai import types
+
+# Repository the stub opens pull requests against (known to the mock GitHub tool)
+STUB_REPOSITORY_URL = "https://github.com/vmatviichuk-epam/ascii-art-generator"
+
+_TICKET_ID = re.compile(r"\b[A-Z][A-Z0-9]+-\d+\b")
+_ARTIFACT_ID = re.compile(r"\bart-[0-9a-f]{16}\b")
+_LATENCY = re.compile(r"-(\d+(?:\.\d+)?)ms$")
+
+def _ticket_ids(text: str) -> List[str]:
+    return list(dict.fromkeys(_TICKET_ID.findall(text)))
+
+def _artifact_ids(text: str) -> List[str]:
+    return list(dict.fromkeys(_ARTIFACT_ID.findall(text)))
+
+# Tool to call for a user message, in order of preference, with a builder for its arguments
+SCRIPT: List[Tuple[str, Callable[[str], Dict[str, Any]]]] = [
+    ("run_ticket_batch", lambda text: {"ticket_ids": _ticket_ids(text)}),
+    ("get_ticket_details", lambda text: {"ticket_id": (_ticket_ids(text) or [""])[0]}),
+    ("generate_implementation", lambda text: {"requirements": text}),
+    ("generate_tests", lambda text: {"implementation_artifact_id": (_artifact_ids(text) or [""])[0]}),
+    ("create_github_pr_func", lambda text: {
+        "title": "Stub pull request",
+        "body": " ".join(_artifact_ids(text)) or "Stub pull request",
+        "head": "feature/stub",
+        "repo_url": STUB_REPOSITORY_URL,
+        # The implementation's artifact ID comes first in the PR agent's input, the tests' second
+        "implementation_artifact_id": (_artifact_ids(text) + [""])[0],
+        "tests_artifact_id": (_artifact_ids(text) + ["", ""])[1]
+    }),
+]
+
+def latency_seconds(model: str = "") -> float:
+    """Returns the simulated latency of one call to a stub model."""
+    match = _LATENCY.search(model)
+    return float(match.group(1) if match else os.environ.get("STUB_MODEL_LATENCY_MS", "50")) / 1000
+
+class StubLlm(BaseLlm):
+    """Scripted model that calls one tool per user message and echoes its result."""
+
+    @classmethod
+    def supported_models(cls) -> List[str]:
+        return [r"stub.*"]
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(latency_seconds(llm_request.model or self.model))
+        last = llm_request.contents[-1] if llm_request.contents else None
+        parts = (last.parts or []) if last else []
+
+        responses = [part.function_response for part in parts if part.function_response]
+        if responses:
+            text = json.dumps(responses[-1].response, default=str)
+            yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+            return
+
+        text = "".join(part.text or "" for part in parts)
+        for tool_name, build_args in SCRIPT:
+            if tool_name in llm_request.tools_dict:
+                call = types.FunctionCall(name=tool_name, args=build_args(text))
+                yield LlmResponse(content=types.Content(role="model", parts=[types.Part(function_call=call)]))
+                return
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+def register() -> None:
+    """Makes model names starting with "stub" resolve to StubLlm."""
+    LLMRegistry.register(StubLlm)
@@ -0,0 +1,116 @@
+"""
+Benchmark of the MinHash/LSH near-duplicate index used to skip duplicate tickets in batches.
+
+Registers synthetic tickets (the Zipf-distributed tickets of benchmarks/ticket_search.py) as
+processed and, per index size, looks up:
+
+- near-duplicates of registered tickets (a suffix on the summary and one description word
+  replaced), which must be found;
+- unrelated new tickets, which must not match anything.
+
+Reports the registration cost, the lookup time through the LSH buckets next to comparing the
+query with every registered signature, recall and false-positive rate. Exits non-zero if
+recall is under --min-recall, any unrelated ticket matched, or the lookup time at the largest
+size is more than --max-growth times the smallest.
+
+Usage:
+    python benchmarks/ticket_duplicates.py [--sizes 1000 5000 20000] [--max-growth 3]
+"""
+import argparse
+import importlib
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ROOT)
+PACKAGE = "adk-sdlc"
+
+def near_duplicate(ticket: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    words = ticket["description"].split(" ")
+    position = rng.randrange(len(words))
+    words[position] = words[(position + 7) % len(words)]
+    return {**ticket, "key": f"DUP-{ticket['key']}", "summary": ticket["summary"] + " (copy)", "description": " ".join(words)}
+
+def lookup_us(index: Any, queries: List[Dict[str, Any]]) -> float:
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        index.find(query)
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples)
+
+def measure(similarity: Any, make_tickets: Any, count: int, probes: int) -> Dict[str, Any]:
+    tickets = make_tickets(count, seed=11)
+    index = similarity.DuplicateIndex()
+    started = time.perf_counter()
+    for ticket in tickets:
+        index.add(ticket, state="processed")
+    add_us = (time.perf_counter() - started) / count * 1e6
+
+    rng = random.Random(count)
+    originals = rng.sample(tickets, probes)
+    duplicates = [near_duplicate(ticket, rng) for ticket in originals]
+    unrelated = [{**ticket, "key": f"NEW-{number}"} for number, ticket in enumerate(make_tickets(probes, seed=97))]
+
+    found = sum(1 for original, duplicate in zip(originals, duplicates)
+                if any(match["ticket_id"] == original["key"] for match in index.find(duplicate)))
+    false_positives = sum(1 for ticket in unrelated if index.find(ticket))
+
+    # Comparing with every registered signature, as an index without LSH buckets would
+    signatures = [entry["signature"] for entry in index._entries.values()]
+    scan_samples = []
+    for query in duplicates[:20]:
+        started = time.perf_counter()
+        signature = similarity.minhash(similarity.shingles(query))
+        [other for other in signatures if similarity.similarity(signature, other) >= index.threshold]
+        scan_samples.append((time.perf_counter() - started) * 1e6)
+
+    return {
+        "tickets": count,
+        "add_us": round(add_us),
+        "lookup_us": round(lookup_us(index, duplicates + unrelated)),
+        "scan_us": round(statistics.median(scan_samples)),
+        "recall": found / probes,
+        "false_positive_rate": false_positives / probes,
+        "buckets": index.stats()["buckets"],
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the near-duplicate ticket index")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000], help="Registered tickets")
+    parser.add_argument("--probes", type=int, default=200, help="Near-duplicate and unrelated lookups per size")
+    parser.add_argument("--min-recall", type=float, default=0.95, help="Share of near-duplicates that must be found")
+    parser.add_argument("--max-growth", type=float, default=3.0,
+                        help="Allowed growth of the lookup time from the smallest to the largest index")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_ROOT)
+    sys.path.insert(0, ROOT)
+    from ticket_search import make_tickets
+    similarity = importlib.import_module(f"{PACKAGE}.sub_agents.requirements.tools.ticket_similarity")
+
+    rows = [measure(similarity, make_tickets, count, args.probes) for count in sorted(args.sizes)]
+    print(f"{'tickets':>8} {'add us':>7} {'lookup us':>10} {'scan us':>9} {'recall':>7} {'false pos':>10} {'buckets':>8}")
+    for row in rows:
+        print(f"{row['tickets']:>8} {row['add_us']:>7} {row['lookup_us']:>10} {row['scan_us']:>9} "
+              f"{row['recall']:>7.1%} {row['false_positive_rate']:>10.1%} {row['buckets']:>8}")
+
+    failures = []
+    for row in rows:
+        if row["recall"] < args.min_recall:
+            failures.append(f"{row['tickets']} tickets: recall {row['recall']:.1%} is under {args.min_recall:.0%}")
+        if row["false_positive_rate"] > 0:
+            failures.append(f"{row['tickets']} tickets: {row['false_positive_rate']:.1%} of unrelated tickets matched")
+    smallest, largest = rows[0], rows[-1]
+    if largest["lookup_us"] > smallest["lookup_us"] * args.max_growth:
+        failures.append(f"lookup time grew from {smallest['lookup_us']} to {largest['lookup_us']} us")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Benchmark of the paginated list_open_tickets tool.
+
+Loads backlogs of synthetic tickets into the JIRA tool's ticket store and measures, per size,
+the time and response size of the first page, of a page deep in the listing (reached with
+its cursor), and of a filtered page, next to the size of rendering the whole open backlog
+in one response as the tool used to.
+
+Exits non-zero if a page at the largest size costs more than --max-growth times a page at
+the smallest size, or if pages grow with the backlog.
+
+Usage:
+    python benchmarks/ticket_listing.py [--sizes 1000 10000 100000] [--page-size 50] [--max-growth 3]
+"""
+import argparse
+import importlib
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import warnings
+from typing import Any, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ROOT)
+PACKAGE = "adk-sdlc"
+
+def timed_us(call: Callable[[], Dict[str, Any]], repeat: int = 20) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples)
+
+def measure(jira_tool: Any, tickets: List[Dict[str, Any]], page_size: int) -> Dict[str, Any]:
+    jira_tool.ticket_store = type(jira_tool.ticket_store)(tickets)
+    open_count = len(jira_tool.ticket_store.find(status="Open"))
+
+    started = time.perf_counter()
+    first = jira_tool.list_open_tickets(page_size=page_size)
+    cold_ms = (time.perf_counter() - started) * 1000
+
+    # Cursor of a page about 90% of the way through the listing
+    deep_after = None
+    skip = max(0, int(open_count * 0.9) - page_size)
+    if skip:
+        page, _ = jira_tool.ticket_store.page(limit=skip, status="Open")
+        deep_after = page[-1]["key"]
+    deep_cursor = jira_tool._encode_cursor({"query": {"filters": {}, "updated_since": ""}, "after": deep_after}) if deep_after else ""
+
+    whole_table = "".join([jira_tool.TABLE_HEADER] + [jira_tool._table_row(ticket) for ticket in jira_tool.ticket_store.find(status="Open")])
+    return {
+        "tickets": len(jira_tool.ticket_store),
+        "open": open_count,
+        "cold_first_ms": round(cold_ms, 1),
+        "first_us": round(timed_us(lambda: jira_tool.list_open_tickets(page_size=page_size))),
+        "deep_us": round(timed_us(lambda: jira_tool.list_open_tickets(cursor=deep_cursor, page_size=page_size))),
+        "filtered_us": round(timed_us(lambda: jira_tool.list_open_tickets(priority="High", assignee="user-7", page_size=page_size))),
+        "page_bytes": len(json.dumps(first)),
+        "unpaged_bytes": len(whole_table),
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the paginated open-ticket listing")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Backlog sizes")
+    parser.add_argument("--page-size", type=int, default=50, help="Tickets per page")
+    parser.add_argument("--max-growth", type=float, default=3.0,
+                        help="Allowed growth of the page time from the smallest to the largest backlog")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_ROOT)
+    sys.path.insert(0, ROOT)
+    os.environ.update(TRACING_DISABLED="true", RATE_LIMITING_DISABLED="true", JIRA_BACKEND="mock")
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+    from ticket_store import make_tickets
+    jira_tool = importlib.import_module(f"{PACKAGE}.sub_agents.requirements.tools.jira_tool")
+
+    rows = [measure(jira_tool, make_tickets(count), args.page_size) for count in sorted(args.sizes)]
+    print(f"{'tickets':>8} {'open':>7} {'cold ms':>8} {'first us':>9} {'deep us':>8} {'filter us':>10} "
+          f"{'page B':>7} {'unpaged B':>10}")
+    for row in rows:
+        print(f"{row['tickets']:>8} {row['open']:>7} {row['cold_first_ms']:>8} {row['first_us']:>9} {row['deep_us']:>8} "
+              f"{row['filtered_us']:>10} {row['page_bytes']:>7} {row['unpaged_bytes']:>10}")
+
+    failures = []
+    smallest, largest = rows[0], rows[-1]
+    for metric in ("first_us", "deep_us"):
+        if largest[metric] > smallest[metric] * args.max_growth:
+            failures.append(f"{metric} grew from {smallest[metric]} to {largest[metric]}")
+    if largest["page_bytes"] > smallest["page_bytes"] * 1.5:
+        failures.append(f"page size grew from {smallest['page_bytes']} to {largest['page_bytes']} bytes")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Benchmark of the BM25 full-text index behind the search_tickets tool.
+
+Indexes synthetic tickets (up to 100k by default) whose words follow a Zipf distribution over
+a 20k-word vocabulary, and measures per corpus size:
+
+- index build time;
+- query latency (p50/p95) over queries of rare, mid-frequency and common words;
+- the cost of re-indexing changed tickets one at a time.
+
+A few tickets with known topics are planted in every corpus. Exits non-zero if a search for a
+planted topic does not rank its ticket first, if a changed ticket is still found under its
+old text, or if the p95 query latency at the largest size exceeds --max-query-ms.
+
+Usage:
+    python benchmarks/ticket_search.py [--sizes 1000 10000 100000] [--max-query-ms 50]
+"""
+import argparse
+import importlib
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ROOT)
+PACKAGE = "adk-sdlc"
+
+VOCABULARY_SIZE = 20000
+
+# Planted topics and the summary of the ticket each should find
+PLANTED = {
+    "timezone handling": "Display the current time in the user's timezone with daylight saving handling",
+    "reverse unicode string": "Reverse a unicode string without splitting combining characters",
+    "javadoc multiply": "Document the multiply helper with javadoc examples",
+}
+
+def vocabulary() -> List[str]:
+    rng = random.Random(1)
+    syllables = ["ba", "ce", "di", "fo", "gu", "ka", "le", "mi", "no", "pu", "ra", "se", "ti", "vo", "zu", "xe"]
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+def make_tickets(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Returns synthetic tickets with mock-ticket structure and Zipf-distributed words."""
+    rng = random.Random(seed)
+    words = vocabulary()
+    cumulative = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+
+    def text(length: int) -> str:
+        return " ".join(rng.choices(words, cum_weights=cumulative, k=length))
+
+    tickets = []
+    for number in range(1, count + 1):
+        requirements = "".join(f"- {text(6)}\n" for _ in range(4))
+        criteria = "".join(f"{i}. {text(6)}\n" for i in range(1, 5))
+        tickets.append({
+            "key": f"PROJ-{number}",
+            "summary": text(6),
+            "status": "Open",
+            "description": f"As a developer, I want {text(12)}.\n\nRequirements:\n{requirements}\nAcceptance Criteria:\n{criteria}",
+            "type": "Story",
+            "priority": "Medium",
+            "updated": "2024-05-07T10:30:00.000Z"
+        })
+    # Planted tickets spread through the corpus
+    for offset, summary in enumerate(PLANTED.values()):
+        tickets[(offset + 1) * count // (len(PLANTED) + 1)]["summary"] = summary
+    return tickets
+
+def queries(count: int) -> List[str]:
+    """Queries mixing rare, mid-frequency and common words."""
+    rng = random.Random(5)
+    words = vocabulary()
+    return [" ".join([rng.choice(words[:20]), rng.choice(words[200:2000]), rng.choice(words[5000:])]) for _ in range(count)]
+
+def measure(ticket_search: Any, count: int) -> Dict[str, Any]:
+    tickets = make_tickets(count)
+    started = time.perf_counter()
+    index = ticket_search.TicketIndex(tickets)
+    build_seconds = time.perf_counter() - started
+
+    samples = []
+    for query in queries(200):
+        started = time.perf_counter()
+        index.search(query, 10)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+
+    failures = []
+    planted_keys = {summary: ticket["key"] for ticket in tickets for summary in PLANTED.values() if ticket["summary"] == summary}
+    for query, summary in PLANTED.items():
+        ranked = index.search(query, 3)
+        if not ranked or ranked[0][0] != planted_keys[summary]:
+            failures.append(f"{count} tickets: {query!r} ranked {ranked[:1]} first, expected {planted_keys[summary]}")
+
+    # Re-index changed tickets one at a time; the first planted ticket changes topic
+    changed = random.Random(9).sample(tickets, 200)
+    started = time.perf_counter()
+    for ticket in changed:
+        index.put({**ticket, "summary": ticket["summary"] + " updated"})
+    update_us = (time.perf_counter() - started) / len(changed) * 1e6
+    first_key = planted_keys[PLANTED["timezone handling"]]
+    index.put({**next(ticket for ticket in tickets if ticket["key"] == first_key), "summary": "Rename the settings page"})
+    if any(key == first_key for key, _ in index.search("timezone handling", 10)):
+        failures.append(f"{count} tickets: {first_key} is still found under its old summary")
+
+    return {
+        "tickets": count,
+        "build_s": round(build_seconds, 2),
+        "terms": index.stats()["terms"],
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2),
+        "update_us": round(update_us),
+        "failures": failures,
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the BM25 ticket search index")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Corpus sizes")
+    parser.add_argument("--max-query-ms", type=float, default=50.0, help="Allowed p95 query latency at the largest size")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_ROOT)
+    ticket_search = importlib.import_module(f"{PACKAGE}.sub_agents.requirements.tools.ticket_search")
+
+    rows = [measure(ticket_search, count) for count in sorted(args.sizes)]
+    print(f"{'tickets':>8} {'build s':>8} {'terms':>7} {'p50 ms':>7} {'p95 ms':>7} {'update us':>10}")
+    for row in rows:
+        print(f"{row['tickets']:>8} {row['build_s']:>8} {row['terms']:>7} {row['p50_ms']:>7} {row['p95_ms']:>7} {row['update_us']:>10}")
+
+    failures = [failure for row in rows for failure in row["failures"]]
+    if rows[-1]["p95_ms"] > args.max_query_ms:
+        failures.append(f"p95 query latency {rows[-1]['p95_ms']} ms at {rows[-1]['tickets']} tickets is over {args.max_query_ms} ms")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Benchmark of the indexed ticket store behind the JIRA tools.
+
+Bulk-loads synthetic tickets (up to 100k by default) and measures, per store size:
+
+- bulk load throughput;
+- key lookups through the hash index, next to the linear scan jira_tool used to do;
+- filtering by status + assignee through the secondary indexes, next to a full scan.
+
+Exits non-zero if key lookups do not stay flat as the store grows (the p50 lookup time at the
+largest size must be within --max-growth times the smallest) or if indexed filtering is not
+faster than scanning at the largest size.
+
+Usage:
+    python benchmarks/ticket_store.py [--sizes 1000 10000 100000] [--max-growth 3]
+"""
+import argparse
+import importlib
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ROOT)
+PACKAGE = "adk-sdlc"
+
+STATUSES = ["Open"] + ["In Progress", "In Review", "Done", "Closed"] * 2
+PRIORITIES = ["Highest", "High", "Medium", "Low", "Lowest"]
+ASSIGNEES = [f"user-{number}" for number in range(200)]
+
+def make_tickets(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Returns synthetic tickets shaped like the mock JIRA tickets."""
+    rng = random.Random(seed)
+    return [{
+        "key": f"PROJ-{number}",
+        "summary": f"Synthetic ticket {number}",
+        "status": rng.choice(STATUSES),
+        "description": "As a developer, I want a synthetic ticket.",
+        "type": "Story",
+        "priority": rng.choice(PRIORITIES),
+        "assignee": rng.choice(ASSIGNEES),
+        "reporter": "Jane Smith",
+        "created": "2024-05-07T10:00:00.000Z",
+        "updated": "2024-05-07T10:30:00.000Z"
+    } for number in range(1, count + 1)]
+
+def per_call_us(func: Callable[[Any], Any], arguments: List[Any], repeat: int = 5) -> float:
+    """Returns the median over repeats of the mean time per call, in microseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for argument in arguments:
+            func(argument)
+        samples.append((time.perf_counter() - started) / len(arguments) * 1e6)
+    return statistics.median(samples)
+
+def measure(store_class: type, count: int) -> Dict[str, Any]:
+    tickets = make_tickets(count)
+    started = time.perf_counter()
+    store = store_class(tickets)
+    load_seconds = time.perf_counter() - started
+
+    rng = random.Random(count)
+    keys = [f"PROJ-{rng.randint(1, count)}" for _ in range(2000)]
+    scan_keys = keys[:max(10, 2_000_000 // count)]
+    filters = [{"status": "Open", "assignee": rng.choice(ASSIGNEES)} for _ in range(50)]
+
+    def scan_lookup(key: str) -> Any:
+        for ticket in tickets:
+            if ticket["key"] == key:
+                return ticket
+        return None
+
+    def scan_filter(query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [ticket for ticket in tickets if all(ticket[field] == value for field, value in query.items())]
+
+    return {
+        "tickets": count,
+        "load_per_second": round(count / load_seconds),
+        "get_us": round(per_call_us(store.get, keys), 3),
+        "scan_get_us": round(per_call_us(scan_lookup, scan_keys, repeat=1), 1),
+        "find_us": round(per_call_us(lambda query: store.find(**query), filters), 1),
+        "scan_find_us": round(per_call_us(scan_filter, filters[:10], repeat=1), 1),
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the indexed ticket store")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Store sizes")
+    parser.add_argument("--max-growth", type=float, default=3.0,
+                        help="Allowed growth of the key lookup time from the smallest to the largest size")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_ROOT)
+    store_class = importlib.import_module(f"{PACKAGE}.sub_agents.requirements.tools.ticket_store").TicketStore
+
+    rows = [measure(store_class, count) for count in sorted(args.sizes)]
+    print(f"{'tickets':>8} {'load/s':>10} {'get us':>8} {'scan get us':>12} {'find us':>9} {'scan find us':>13}")
+    for row in rows:
+        print(f"{row['tickets']:>8} {row['load_per_second']:>10} {row['get_us']:>8} {row['scan_get_us']:>12} "
+              f"{row['find_us']:>9} {row['scan_find_us']:>13}")
+
+    failures = []
+    smallest, largest = rows[0], rows[-1]
+    if largest["get_us"] > smallest["get_us"] * args.max_growth:
+        failures.append(f"key lookup grew from {smallest['get_us']} us to {largest['get_us']} us")
+    if largest["find_us"] >= largest["scan_find_us"]:
+        failures.append("indexed filtering was not faster than a full scan")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())